@@ -0,0 +1,82 @@
+import argparse
+import multiprocessing
+from datetime import datetime
+
+from src.infrastructure.database.sqlite_posture_repository import SQLitePostureRepository
+from src.infrastructure.video.video_batch_analyzer import VideoBatchAnalyzer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Reprocessa vídeos gravados sem interface gráfica e registra a análise de postura."
+    )
+    parser.add_argument('videos', nargs='+', help="Arquivos de vídeo a analisar")
+    parser.add_argument('--camera-type', choices=['frontal', 'lateral'], default='frontal')
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Número de processos de análise (padrão: número de núcleos)")
+    parser.add_argument('--segment-seconds', type=float, default=300.0,
+                        help="Duração de cada trecho distribuído entre os processos")
+    parser.add_argument('--frame-stride', type=int, default=1,
+                        help="Analisa apenas um a cada N frames")
+    parser.add_argument('--sample-interval', type=float, default=5.0,
+                        help="Intervalo mínimo em segundos entre registros gravados (0 grava todos)")
+    parser.add_argument('--start-time', action='append', default=None,
+                        help="Início da gravação (YYYY-MM-DD HH:MM:SS), um por vídeo. "
+                             "Padrão: data de modificação do arquivo menos a duração")
+    parser.add_argument('--db', default='posture_data.db', help="Banco SQLite de destino")
+    parser.add_argument('--output', default=None,
+                        help="Grava os resultados em um arquivo colunar .npz em vez do banco")
+    parser.add_argument('--use-saved-calibration', action='store_true',
+                        help="Usa a calibração salva no banco em vez de calibrar pelo início do vídeo")
+    parser.add_argument('--inference-gating', action='store_true')
+    parser.add_argument('--roi-tracking', action='store_true')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    repository = SQLitePostureRepository(args.db)
+
+    calibration = repository.get_calibration(args.camera_type) if args.use_saved_calibration else None
+    if args.use_saved_calibration and calibration is None:
+        print(f"Nenhuma calibração salva para a câmera {args.camera_type}; calibrando pelo vídeo")
+
+    start_times = None
+    if args.start_time:
+        start_times = [datetime.strptime(value, "%Y-%m-%d %H:%M:%S") for value in args.start_time]
+        start_times += [None] * (len(args.videos) - len(start_times))
+
+    analyzer = VideoBatchAnalyzer(
+        camera_type=args.camera_type,
+        workers=args.workers,
+        segment_seconds=args.segment_seconds,
+        frame_stride=args.frame_stride,
+        sample_interval=args.sample_interval,
+        calibration=calibration,
+        inference_gating=args.inference_gating,
+        roi_tracking=args.roi_tracking
+    )
+    reports = analyzer.analyze(args.videos, start_times)
+
+    for report in reports:
+        print(f"{report.path}: {report.frames_decoded} frames ({report.frames_analyzed} analisados) "
+              f"em {report.elapsed:.1f}s - {report.fps:.1f} fps, {report.realtime_factor:.1f}x tempo real, "
+              f"{report.rows} registros")
+
+    if args.output:
+        VideoBatchAnalyzer.save_columnar(reports, args.output, args.camera_type)
+        print(f"Resultados salvos em {args.output}")
+    else:
+        for report in reports:
+            repository.save_posture_data_batch(analyzer.to_posture_data(report))
+        print(f"Resultados salvos em {args.db}")
+
+    total_frames = sum(report.frames_decoded for report in reports)
+    total_elapsed = max((report.elapsed for report in reports), default=0.0)
+    if total_elapsed > 0:
+        print(f"Total: {total_frames} frames em {total_elapsed:.1f}s ({total_frames / total_elapsed:.1f} fps)")
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
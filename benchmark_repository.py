@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.domain.entities.posture_data import PostureData
+from src.infrastructure.database.in_memory_posture_repository import InMemoryPostureRepository
+from src.infrastructure.database.sqlite_posture_repository import SQLitePostureRepository
+from src.infrastructure.ui.excel_exporter import ExcelExporter
+
+MIN_ROWS = 10_000
+MAX_ROWS = 50_000_000
+CAMERA_TYPES = ('frontal', 'lateral')
+RANGE_WINDOWS = (('range_day', timedelta(days=1)), ('range_week', timedelta(days=7)))
+EXPORT_WINDOW = timedelta(days=30)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Mede gravação, consultas por período, estatísticas e exportação dos repositórios de postura."
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help=f"Quantidades de registros do histórico sintético ({MIN_ROWS} a {MAX_ROWS})")
+    parser.add_argument('--backends', nargs='+', choices=['sqlite', 'memory'], default=['sqlite', 'memory'])
+    parser.add_argument('--batch-size', type=int, default=256,
+                        help="Registros por chamada a save_posture_data_batch (o gravador do monitoramento usa 256)")
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help="Segundos entre registros consecutivos do histórico sintético")
+    parser.add_argument('--repeat', type=int, default=20, help="Repetições de cada consulta")
+    parser.add_argument('--excel-max-rows', type=int, default=50_000,
+                        help="Gera o .xlsx na medição de exportação apenas até esta quantidade de registros (0 desativa)")
+    parser.add_argument('--workdir', default=None, help="Diretório dos bancos temporários (padrão: diretório temporário do sistema)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmark_results.json', help="Arquivo JSON com os resultados")
+    args = parser.parse_args()
+    for size in args.sizes:
+        if not MIN_ROWS <= size <= MAX_ROWS:
+            parser.error(f"--sizes deve estar entre {MIN_ROWS} e {MAX_ROWS}: {size}")
+    return args
+
+
+def synthetic_batches(rows: int, batch_size: int, interval: float, end: datetime, seed: int):
+    """Histórico sintético terminando em `end`, um registro a cada `interval` segundos com pequena variação"""
+    generator = np.random.default_rng(seed)
+    start = end - timedelta(seconds=rows * interval)
+    for first in range(0, rows, batch_size):
+        count = min(batch_size, rows - first)
+        offsets = (np.arange(first, first + count) + generator.uniform(0, 0.9, count)) * interval
+        neck = generator.normal(80.0, 8.0, count)
+        shoulder = generator.normal(3.0, 2.0, count)
+        cameras = generator.integers(0, len(CAMERA_TYPES), count)
+        yield [PostureData(
+            shoulder_angle=shoulder_angle,
+            neck_angle=neck_angle,
+            camera_type=CAMERA_TYPES[camera],
+            timestamp=start + timedelta(seconds=offset),
+            is_poor_posture=neck_angle < 72.0
+        ) for offset, shoulder_angle, neck_angle, camera in zip(
+            offsets.tolist(), shoulder.tolist(), neck.tolist(), cameras.tolist())]
+
+
+def summarize(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        'runs': len(ordered),
+        'min_ms': ordered[0] * 1000,
+        'median_ms': statistics.median(ordered) * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000,
+        'mean_ms': statistics.fmean(ordered) * 1000,
+    }
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+
+def create_repository(backend: str, workdir: str):
+    if backend == 'memory':
+        return InMemoryPostureRepository()
+    return SQLitePostureRepository(os.path.join(workdir, 'benchmark.db'))
+
+
+def measure_insert(repository, args, rows: int, end: datetime) -> dict:
+    elapsed = 0.0
+    for batch in synthetic_batches(rows, args.batch_size, args.interval, end, args.seed):
+        started = time.perf_counter()
+        repository.save_posture_data_batch(batch)
+        elapsed += time.perf_counter() - started
+    return {'seconds': elapsed, 'rows_per_second': rows / elapsed if elapsed else None, 'batch_size': args.batch_size}
+
+
+def measure_ranges(repository, args, rows: int, end: datetime) -> dict:
+    history_start = end - timedelta(seconds=rows * args.interval)
+    chooser = random.Random(args.seed)
+    results = {}
+    for name, window in RANGE_WINDOWS:
+        latest_start = max(end - window, history_start)
+        samples, returned = [], []
+        for _ in range(args.repeat):
+            start = history_start + (latest_start - history_start) * chooser.random()
+            elapsed, records = timed(repository.get_posture_data_by_date_range, start, start + window)
+            samples.append(elapsed)
+            returned.append(len(records))
+        results[name] = dict(summarize(samples), rows_returned=statistics.fmean(returned))
+
+    samples = []
+    for _ in range(args.repeat):
+        elapsed, columns = timed(repository.get_posture_columns, end - EXPORT_WINDOW, end)
+        samples.append(elapsed)
+    results['columns_month'] = dict(summarize(samples), rows_returned=len(columns))
+    return results
+
+
+def measure_statistics(repository, args) -> dict:
+    first, _ = timed(repository.get_statistics)
+    samples = [timed(repository.get_statistics)[0] for _ in range(args.repeat)]
+    return dict(summarize(samples), first_call_ms=first * 1000)
+
+
+def measure_export(repository, args, end: datetime, workdir: str) -> dict:
+    start = end - EXPORT_WINDOW
+    started = time.perf_counter()
+    data = ExcelExporter.posture_columns_to_dataframe(repository.get_posture_columns(start, end))
+    result = {'rows': len(data), 'dataframe_seconds': time.perf_counter() - started, 'excel_seconds': None}
+
+    if 0 < len(data) <= args.excel_max_rows:
+        filename = os.path.join(workdir, 'benchmark_export.xlsx')
+        started = time.perf_counter()
+        ExcelExporter.export_posture_data_to_excel(data, filename, start, end)
+        result['excel_seconds'] = time.perf_counter() - started
+        os.remove(filename)
+    return result
+
+
+def run_case(backend: str, rows: int, args) -> dict:
+    workdir = tempfile.mkdtemp(prefix='cervicalia_benchmark_', dir=args.workdir)
+    end = datetime.now().replace(microsecond=0)
+    repository = create_repository(backend, workdir)
+    try:
+        result = {'backend': backend, 'rows': rows}
+        result['insert'] = measure_insert(repository, args, rows, end)
+        result['statistics'] = measure_statistics(repository, args)
+        result.update(measure_ranges(repository, args, rows, end))
+        result['export'] = measure_export(repository, args, end, workdir)
+        if backend == 'sqlite':
+            result['database_bytes'] = os.path.getsize(repository.db_path)
+        return result
+    finally:
+        repository.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    args = parse_args()
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'numpy': np.__version__,
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'results': [],
+    }
+
+    for rows in args.sizes:
+        for backend in args.backends:
+            print(f"{backend}: {rows} registros...")
+            result = run_case(backend, rows, args)
+            report['results'].append(result)
+            print(f"  gravação {result['insert']['rows_per_second']:.0f} registros/s, "
+                  f"estatísticas {result['statistics']['median_ms']:.2f} ms, "
+                  f"dia {result['range_day']['median_ms']:.2f} ms, semana {result['range_week']['median_ms']:.2f} ms, "
+                  f"exportação {result['export']['dataframe_seconds']:.2f}s ({result['export']['rows']} registros)")
+
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+    print(f"Resultados salvos em {args.output}")
+
+
+if __name__ == '__main__':
+    main()
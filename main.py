@@ -1,7 +1,11 @@
+import multiprocessing
+
 from kivymd.app import MDApp
+from kivy.clock import Clock
 from kivy.uix.screenmanager import ScreenManager
 from kivy.lang import Builder
 
+from src.infrastructure.database.posture_retention import PostureRetention
 from src.infrastructure.database.sqlite_posture_repository import SQLitePostureRepository
 from src.presentation.screens.welcome_screen import WelcomeScreen
 from src.presentation.screens.posture_monitor_screen import PostureMonitorScreen
@@ -59,53 +63,10 @@ KV = '''
         spacing: '10dp'
         
         BoxLayout:
+            id: cameras_box
             orientation: 'horizontal'
             spacing: '10dp'
             size_hint_y: 0.8
-            
-            BoxLayout:
-                orientation: 'vertical'
-                spacing: '5dp'
-                
-                Image:
-                    id: frontal_cam
-                    keep_ratio: True
-                    allow_stretch: True
-                
-                MDLabel:
-                    id: frontal_angle
-                    text: "FRONTAL: Ângulos"
-                    halign: 'center'
-                    font_style: 'Caption'
-                
-                MDLabel:
-                    id: frontal_status
-                    text: "STATUS"
-                    halign: 'center'
-                    theme_text_color: "Custom"
-                    text_color: 0, 1, 0, 1
-            
-            BoxLayout:
-                orientation: 'vertical'
-                spacing: '5dp'
-                
-                Image:
-                    id: lateral_cam
-                    keep_ratio: True
-                    allow_stretch: True
-                
-                MDLabel:
-                    id: lateral_angle
-                    text: "LATERAL: Ângulos"
-                    halign: 'center'
-                    font_style: 'Caption'
-                
-                MDLabel:
-                    id: lateral_status
-                    text: "STATUS"
-                    halign: 'center'
-                    theme_text_color: "Custom"
-                    text_color: 0, 1, 0, 1
         
         BoxLayout:
             orientation: 'horizontal'
@@ -143,6 +104,21 @@ KV = '''
             size_hint_y: None
             height: self.texture_size[1] + 20
         
+        MDLabel:
+            id: statistics_status
+            text: ""
+            halign: 'center'
+            font_style: 'Caption'
+            size_hint_y: None
+            height: self.texture_size[1]
+        
+        MDProgressBar:
+            id: statistics_progress
+            value: 0
+            size_hint_y: None
+            height: '4dp'
+            opacity: 0
+        
         ScrollView:
             BoxLayout:
                 orientation: 'vertical'
@@ -291,12 +267,17 @@ class CervicaliaApp(MDApp):
         self.sm.add_widget(WelcomeScreen(self.repository, name='welcome'))
         self.sm.add_widget(PostureMonitorScreen(self.repository, name='main'))
         self.sm.add_widget(StatisticsScreen(self.repository, name='statistics'))
-        
+
+        PostureRetention.run_daily(self.repository)
+        Clock.schedule_interval(lambda dt: PostureRetention.run_daily(self.repository), 3600)
         return self.sm
 
     def on_stop(self):
         self.sm.get_screen('main').on_stop()
+        self.sm.get_screen('statistics').on_stop()
+        self.repository.close()
         return True
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     CervicaliaApp().run()
\ No newline at end of file
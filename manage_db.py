@@ -0,0 +1,70 @@
+import argparse
+import time
+
+from src.infrastructure.database.posture_bulk_importer import PostureBulkImporter
+from src.infrastructure.database.posture_retention import PostureRetention
+from src.infrastructure.database.sqlite_posture_repository import SQLitePostureRepository
+
+
+def rebuild_rollups(repository: SQLitePostureRepository, args) -> None:
+    repository.rebuild_statistics_rollups()
+    print("Tabelas de contagens e agregados recalculadas")
+
+
+def import_records(repository: SQLitePostureRepository, args) -> None:
+    started = time.perf_counter()
+    imported = PostureBulkImporter(repository, default_camera_type=args.camera_type).import_files(args.paths)
+    for path, count in imported.items():
+        print(f"{path}: {count} registros importados")
+    print(f"Total: {sum(imported.values())} registros em {time.perf_counter() - started:.1f}s")
+
+
+def apply_retention(repository: SQLitePostureRepository, args) -> None:
+    retention = PostureRetention.from_settings(repository)
+    if args.hot_months is not None or args.raw_months is not None:
+        retention = PostureRetention(
+            repository,
+            hot_months=args.hot_months if args.hot_months is not None else retention.hot_months,
+            raw_months=args.raw_months if args.raw_months is not None else retention.raw_months
+        )
+    report = retention.apply(vacuum=not args.no_vacuum)
+    for table in report.archived:
+        print(f"{table}: registros movidos para a partição mensal")
+    for table in report.dropped:
+        print(f"{table}: registros brutos descartados (agregados por hora e dia mantidos)")
+    print(f"{report.freed_pages} páginas livres devolvidas ao sistema")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ferramentas de manutenção do banco de dados de postura.")
+    parser.add_argument('--db', default='posture_data.db', help="Banco SQLite a ser mantido")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = subparsers.add_parser('rebuild-rollups', help="Recalcula as contagens diárias, semanais e por câmera e os agregados de ângulos")
+    rebuild.set_defaults(handler=rebuild_rollups)
+
+    importer = subparsers.add_parser('import', help="Importa registros de arquivos CSV ou de outros bancos de postura")
+    importer.add_argument('paths', nargs='+', help="Arquivos CSV, bancos antigos do Cervicalia ou posture_data.db de outras estações")
+    importer.add_argument('--camera-type', default='frontal', help="Câmera usada para linhas de CSV sem a coluna camera_type")
+    importer.set_defaults(handler=import_records)
+
+    retention = subparsers.add_parser('retention', help="Move meses antigos para partições mensais e descarta registros brutos expirados")
+    retention.add_argument('--hot-months', type=int, help="Meses mantidos em posture_records (padrão: configuração retention_hot_months)")
+    retention.add_argument('--raw-months', type=int, help="Meses de registros brutos mantidos; 0 mantém tudo (padrão: configuração retention_raw_months)")
+    retention.add_argument('--no-vacuum', action='store_true', help="Não devolve ao sistema o espaço liberado")
+    retention.set_defaults(handler=apply_retention)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    repository = SQLitePostureRepository(args.db)
+    try:
+        args.handler(repository, args)
+    finally:
+        repository.close()
+
+
+if __name__ == '__main__':
+    main()
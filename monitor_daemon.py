@@ -0,0 +1,31 @@
+import argparse
+import multiprocessing
+import signal
+
+from src.infrastructure.database.sqlite_posture_repository import SQLitePostureRepository
+from src.presentation.daemon.monitoring_daemon import PostureMonitoringDaemon
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Monitora a postura sem interface gráfica, gravando dados e emitindo alertas sonoros."
+    )
+    parser.add_argument('--db', default='posture_data.db', help="Banco SQLite com as configurações e os registros")
+    parser.add_argument('--recalibrate', action='store_true',
+                        help="Ignora a calibração salva e calibra novamente ao iniciar")
+    args = parser.parse_args()
+
+    repository = SQLitePostureRepository(args.db)
+    daemon = PostureMonitoringDaemon(repository, recalibrate=args.recalibrate)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    print("Monitoramento iniciado. Pressione Ctrl+C para encerrar.")
+    try:
+        daemon.run()
+    finally:
+        repository.close()
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
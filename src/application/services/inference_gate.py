@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+class InferenceGate:
+    """Decide quando o frame precisa passar pelo MediaPipe.
+
+    A inferência roda quando a diferença média entre uma miniatura em tons de cinza do frame
+    atual e a do último frame inferido ultrapassa motion_threshold, ou quando o passo (stride)
+    atual é atingido, o que ocorrer primeiro. Enquanto a cena fica parada o passo dobra até
+    max_stride; qualquer movimento o devolve a min_stride.
+    """
+
+    def __init__(self, motion_threshold: float = 3.0, min_stride: int = 1, max_stride: int = 15,
+                 thumbnail_size: Tuple[int, int] = (32, 24)):
+        self.motion_threshold = motion_threshold
+        self.min_stride = max(1, min_stride)
+        self.max_stride = max(self.min_stride, max_stride)
+        self.thumbnail_size = thumbnail_size
+        self.reset()
+
+    def reset(self) -> None:
+        self.reference: Optional[np.ndarray] = None
+        self.stride = self.min_stride
+        self.frames_since_inference = 0
+        self.last_motion = 0.0
+        self.skipped_frames = 0
+
+    def should_infer(self, frame: np.ndarray, force: bool = False) -> bool:
+        thumbnail = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), self.thumbnail_size,
+                               interpolation=cv2.INTER_AREA)
+        self.frames_since_inference += 1
+
+        if self.reference is None or force:
+            self._mark_inferred(thumbnail)
+            return True
+
+        self.last_motion = float(cv2.absdiff(thumbnail, self.reference).mean())
+        moved = self.last_motion >= self.motion_threshold
+
+        if not moved and self.frames_since_inference < self.stride:
+            self.skipped_frames += 1
+            return False
+
+        if moved:
+            self.stride = self.min_stride
+        elif self.last_motion < self.motion_threshold / 2:
+            self.stride = min(self.stride * 2, self.max_stride)
+        self._mark_inferred(thumbnail)
+        return True
+
+    def _mark_inferred(self, thumbnail: np.ndarray) -> None:
+        self.reference = thumbnail
+        self.frames_since_inference = 0
@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+UPPER_BODY_LANDMARKS = list(range(0, 15))
+
+Region = Tuple[int, int, int, int]
+
+
+class PoseRoiTracker:
+    """Recorta e reduz a região do tronco superior antes da inferência.
+
+    A região vem dos landmarks do frame anterior (cabeça, ombros e cotovelos) com uma margem
+    e só é recalculada quando os pontos saem da região atual, para não deslocar o recorte a
+    cada frame. Sem landmarks confiáveis o rastreamento é perdido e volta-se ao frame inteiro.
+    """
+
+    def __init__(self, max_side: int = 256, margin: float = 0.6, min_side: int = 96,
+                 min_visibility: float = 0.5):
+        self.max_side = max_side
+        self.margin = margin
+        self.min_side = min_side
+        self.min_visibility = min_visibility
+        self.region: Optional[Region] = None
+
+    def reset(self) -> None:
+        self.region = None
+
+    def select_input(self, frame: np.ndarray) -> Tuple[np.ndarray, Region]:
+        height, width = frame.shape[:2]
+        if self.region is None:
+            return frame, (0, 0, width, height)
+
+        x0, y0, x1, y1 = self.region
+        crop = frame[y0:y1, x0:x1]
+        crop_width, crop_height = x1 - x0, y1 - y0
+        scale = self.max_side / max(crop_width, crop_height)
+        if scale < 1.0:
+            crop = cv2.resize(crop, (max(1, int(crop_width * scale)), max(1, int(crop_height * scale))),
+                              interpolation=cv2.INTER_AREA)
+        return crop, self.region
+
+    def map_to_frame(self, landmarks: np.ndarray, region: Region, frame_shape: Tuple[int, ...]) -> np.ndarray:
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = region
+        if (x0, y0, x1, y1) == (0, 0, width, height):
+            return landmarks
+
+        mapped = landmarks.copy()
+        mapped[:, 0] = (landmarks[:, 0] * (x1 - x0) + x0) / width
+        mapped[:, 1] = (landmarks[:, 1] * (y1 - y0) + y0) / height
+        mapped[:, 2] = landmarks[:, 2] * (x1 - x0) / width
+        return mapped
+
+    def update(self, landmarks: Optional[np.ndarray], frame_shape: Tuple[int, ...]) -> None:
+        if landmarks is None:
+            self.region = None
+            return
+
+        upper_body = landmarks[UPPER_BODY_LANDMARKS]
+        visible = upper_body[upper_body[:, 3] >= self.min_visibility]
+        if len(visible) < 4:
+            self.region = None
+            return
+
+        height, width = frame_shape[:2]
+        xs = visible[:, 0] * width
+        ys = visible[:, 1] * height
+        left, right, top, bottom = xs.min(), xs.max(), ys.min(), ys.max()
+
+        if self.region is not None:
+            x0, y0, x1, y1 = self.region
+            if left >= x0 and right <= x1 and top >= y0 and bottom <= y1:
+                return
+
+        box_width = max(right - left, self.min_side)
+        box_height = max(bottom - top, self.min_side)
+        center_x = (left + right) / 2
+        x0 = int(max(0, center_x - box_width * (0.5 + self.margin)))
+        x1 = int(min(width, center_x + box_width * (0.5 + self.margin)))
+        y0 = int(max(0, top - box_height * self.margin))
+        y1 = int(min(height, bottom + box_height * self.margin))
+
+        if (x1 - x0) * (y1 - y0) >= 0.9 * width * height:
+            self.region = None
+        else:
+            self.region = (x0, y0, x1, y1)
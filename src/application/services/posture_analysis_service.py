@@ -5,6 +5,13 @@ from typing import Optional, Tuple, Dict, Any
 from dataclasses import dataclass
 
 from ...domain.entities.posture_calibration import PostureCalibration
+from .inference_gate import InferenceGate
+from .pose_roi_tracker import PoseRoiTracker
+from .posture_geometry import (LEFT_EAR, LEFT_SHOULDER, NECK_ANGLE, RIGHT_EAR, RIGHT_SHOULDER,
+                               SHOULDER_ANGLE, classify_poor_posture, landmarks_to_pixels, posture_angles)
+
+LANDMARK_COUNT = 33
+KEYPOINTS = [LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_EAR, RIGHT_EAR]
 
 
 @dataclass
@@ -15,18 +22,19 @@ class PostureAnalysisResult:
     calibration_frames: int
     is_poor_posture: bool
     calibration_data: Optional[PostureCalibration] = None
+    landmarks: Optional[np.ndarray] = None
 
 
 class PostureAnalysisService:
     
-    def __init__(self, camera_type: str = "frontal"):
+    def __init__(self, camera_type: str = "frontal", inference_gating: bool = False,
+                 roi_tracking: bool = False, view: Optional[str] = None):
         self.camera_type = camera_type
+        self.view = view or camera_type
         
-        self.pose = mp.solutions.pose.Pose(
-            static_image_mode=False,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        self._pose = None
+        self.inference_gate = InferenceGate() if inference_gating else None
+        self.roi_tracker = PoseRoiTracker() if roi_tracking else None
         
         self.is_calibrated = False
         self.calibration_frames = 0
@@ -43,6 +51,16 @@ class PostureAnalysisService:
         self.poor_posture_start_time = None
         self.last_analysis_result = None
     
+    @property
+    def pose(self):
+        if self._pose is None:
+            self._pose = mp.solutions.pose.Pose(
+                static_image_mode=False,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+        return self._pose
+    
     def calculate_angle(self, point1: Tuple[int, int], 
                        point2: Tuple[int, int], 
                        point3: Tuple[int, int]) -> float:
@@ -60,113 +78,144 @@ class PostureAnalysisService:
     
     def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, Optional[PostureAnalysisResult]]:
         try:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.pose.process(frame_rgb)
-            annotated_frame = frame.copy()
+            result = self.analyze_frame(frame)
+            if result is None:
+                return frame, None
             
-            if results.pose_landmarks:
-                landmarks = results.pose_landmarks.landmark
-                
-                left_shoulder = (int(landmarks[mp.solutions.pose.PoseLandmark.LEFT_SHOULDER.value].x * frame.shape[1]),
-                               int(landmarks[mp.solutions.pose.PoseLandmark.LEFT_SHOULDER.value].y * frame.shape[0]))
-                right_shoulder = (int(landmarks[mp.solutions.pose.PoseLandmark.RIGHT_SHOULDER.value].x * frame.shape[1]),
-                                int(landmarks[mp.solutions.pose.PoseLandmark.RIGHT_SHOULDER.value].y * frame.shape[0]))
-                left_ear = (int(landmarks[mp.solutions.pose.PoseLandmark.LEFT_EAR.value].x * frame.shape[1]),
-                           int(landmarks[mp.solutions.pose.PoseLandmark.LEFT_EAR.value].y * frame.shape[0]))
-                right_ear = (int(landmarks[mp.solutions.pose.PoseLandmark.RIGHT_EAR.value].x * frame.shape[1]),
-                            int(landmarks[mp.solutions.pose.PoseLandmark.RIGHT_EAR.value].y * frame.shape[0]))
-                
-                shoulder_angle = self.calculate_angle(left_shoulder, right_shoulder, (right_shoulder[0], 0))
-                neck_angle = self.calculate_angle(left_ear, left_shoulder, (left_shoulder[0], 0))
-                
-                mp.solutions.drawing_utils.draw_landmarks(
-                    annotated_frame, results.pose_landmarks, mp.solutions.pose.POSE_CONNECTIONS
-                )
-                
-                if not self.is_calibrated and self.calibration_frames < 30:
-                    self.calibration_shoulder_angles.append(shoulder_angle)
-                    self.calibration_neck_angles.append(neck_angle)
-                    self.calibration_frames += 1
-                    
-                    cv2.putText(annotated_frame, f"Calibrating... {self.calibration_frames}/30",
-                              (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2, cv2.LINE_AA)
-                    
-                    result = PostureAnalysisResult(
-                        shoulder_angle=shoulder_angle,
-                        neck_angle=neck_angle,
-                        is_calibrating=True,
-                        calibration_frames=self.calibration_frames,
-                        is_poor_posture=False
-                    )
-                    self.last_analysis_result = result
-                    return annotated_frame, result
-                
-                elif not self.is_calibrated:
-                    self.shoulder_angle_min = np.mean(self.calibration_shoulder_angles) - self.margin
-                    self.shoulder_angle_max = np.mean(self.calibration_shoulder_angles) + self.margin
-                    self.neck_angle_min = np.mean(self.calibration_neck_angles) - self.margin
-                    self.neck_angle_max = np.mean(self.calibration_neck_angles) + self.margin
-                    self.is_calibrated = True
-                    
-                    print(f"Calibração {self.camera_type} concluída.")
-                    print(f"Limites do ombro: {self.shoulder_angle_min:.1f}-{self.shoulder_angle_max:.1f}")
-                    print(f"Limites do pescoço: {self.neck_angle_min:.1f}-{self.neck_angle_max:.1f}")
-                
-                shoulder_center = ((left_shoulder[0] + right_shoulder[0]) // 2,
-                                 (left_shoulder[1] + right_shoulder[1]) // 2)
-                
-                if self.camera_type == "frontal":
-                    self.draw_angle(annotated_frame, left_shoulder, shoulder_center, 
-                                  (shoulder_center[0], 0), shoulder_angle, (255, 0, 0))
-                    self.draw_angle(annotated_frame, left_ear, left_shoulder,
-                                  (left_shoulder[0], 0), neck_angle, (0, 255, 0))
-                else:
-                    self.draw_angle(annotated_frame, left_ear, left_shoulder,
-                                  (left_shoulder[0], 0), neck_angle, (0, 255, 0))
-                
-                is_poor_posture = False
-                if self.is_calibrated:
-                    if self.camera_type == "frontal":
-                        is_poor_posture = (shoulder_angle < self.shoulder_angle_min or 
-                                         shoulder_angle > self.shoulder_angle_max or
-                                         neck_angle < self.neck_angle_min or 
-                                         neck_angle > self.neck_angle_max)
-                    else:
-                        is_poor_posture = (neck_angle < self.neck_angle_min or 
-                                         neck_angle > self.neck_angle_max)
-                    
-                    self.draw_feedback(annotated_frame, shoulder_angle, neck_angle, is_poor_posture)
-                
-                calibration_data = None
-                if self.is_calibrated:
-                    calibration_data = PostureCalibration(
-                        camera_type=self.camera_type,
-                        shoulder_angle_min=self.shoulder_angle_min,
-                        shoulder_angle_max=self.shoulder_angle_max,
-                        neck_angle_min=self.neck_angle_min,
-                        neck_angle_max=self.neck_angle_max,
-                        margin=self.margin
-                    )
-                
-                result = PostureAnalysisResult(
-                    shoulder_angle=shoulder_angle,
-                    neck_angle=neck_angle,
-                    is_calibrating=False,
-                    calibration_frames=self.calibration_frames,
-                    is_poor_posture=is_poor_posture,
-                    calibration_data=calibration_data
-                )
-                self.last_analysis_result = result
-                return annotated_frame, result
-            
-            self.last_analysis_result = None
-            return frame, None
+            annotated_frame = frame.copy()
+            self.draw_analysis(annotated_frame, result)
+            return annotated_frame, result
             
         except Exception as e:
             print(f"Erro ao processar frame {self.camera_type}: {e}")
             self.last_analysis_result = None
             return frame, None
     
+    def analyze_frame(self, frame: np.ndarray) -> Optional[PostureAnalysisResult]:
+        if self.inference_gate is not None:
+            if not self.inference_gate.should_infer(frame, force=not self.is_calibrated):
+                return self.last_analysis_result
+        
+        landmarks = self.detect_landmarks(frame)
+        if landmarks is None:
+            self.last_analysis_result = None
+            return None
+        
+        angles = posture_angles(landmarks, frame.shape[1], frame.shape[0])
+        shoulder_angle = float(angles[SHOULDER_ANGLE])
+        neck_angle = float(angles[NECK_ANGLE])
+        
+        if not self.is_calibrated and self.calibration_frames < 30:
+            self.calibration_shoulder_angles.append(shoulder_angle)
+            self.calibration_neck_angles.append(neck_angle)
+            self.calibration_frames += 1
+            
+            result = PostureAnalysisResult(
+                shoulder_angle=shoulder_angle,
+                neck_angle=neck_angle,
+                is_calibrating=True,
+                calibration_frames=self.calibration_frames,
+                is_poor_posture=False,
+                landmarks=landmarks
+            )
+            self.last_analysis_result = result
+            return result
+        
+        elif not self.is_calibrated:
+            self.shoulder_angle_min = np.mean(self.calibration_shoulder_angles) - self.margin
+            self.shoulder_angle_max = np.mean(self.calibration_shoulder_angles) + self.margin
+            self.neck_angle_min = np.mean(self.calibration_neck_angles) - self.margin
+            self.neck_angle_max = np.mean(self.calibration_neck_angles) + self.margin
+            self.is_calibrated = True
+            
+            print(f"Calibração {self.camera_type} concluída.")
+            print(f"Limites do ombro: {self.shoulder_angle_min:.1f}-{self.shoulder_angle_max:.1f}")
+            print(f"Limites do pescoço: {self.neck_angle_min:.1f}-{self.neck_angle_max:.1f}")
+        
+        calibration_data = self.get_calibration()
+        is_poor_posture = bool(classify_poor_posture(angles, calibration_data, self.view))
+        
+        result = PostureAnalysisResult(
+            shoulder_angle=shoulder_angle,
+            neck_angle=neck_angle,
+            is_calibrating=False,
+            calibration_frames=self.calibration_frames,
+            is_poor_posture=is_poor_posture,
+            calibration_data=calibration_data,
+            landmarks=landmarks
+        )
+        self.last_analysis_result = result
+        return result
+    
+    def detect_landmarks(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        if self.roi_tracker is not None:
+            pose_input, region = self.roi_tracker.select_input(frame)
+        else:
+            pose_input, region = frame, None
+        
+        frame_rgb = cv2.cvtColor(pose_input, cv2.COLOR_BGR2RGB)
+        results = self.pose.process(frame_rgb)
+        
+        if not results.pose_landmarks:
+            if self.roi_tracker is not None:
+                self.roi_tracker.reset()
+            return None
+        
+        landmarks = np.fromiter(
+            (value for lm in results.pose_landmarks.landmark for value in (lm.x, lm.y, lm.z, lm.visibility)),
+            dtype=np.float32, count=LANDMARK_COUNT * 4
+        ).reshape(LANDMARK_COUNT, 4)
+        if self.roi_tracker is not None:
+            landmarks = self.roi_tracker.map_to_frame(landmarks, region, frame.shape)
+            self.roi_tracker.update(landmarks, frame.shape)
+        return landmarks
+    
+    def get_keypoints(self, landmarks: np.ndarray, frame_shape: Tuple[int, ...]) -> Tuple[Tuple[int, int], ...]:
+        height, width = frame_shape[:2]
+        pixels = landmarks_to_pixels(landmarks[KEYPOINTS], width, height).astype(int)
+        return tuple((int(x), int(y)) for x, y in pixels)
+    
+    def draw_analysis(self, frame: np.ndarray, result: PostureAnalysisResult) -> None:
+        if result.landmarks is None:
+            return
+        
+        self.draw_landmarks(frame, result.landmarks)
+        
+        if result.is_calibrating:
+            cv2.putText(frame, f"Calibrating... {result.calibration_frames}/30",
+                      (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2, cv2.LINE_AA)
+            return
+        
+        left_shoulder, right_shoulder, left_ear, right_ear = self.get_keypoints(result.landmarks, frame.shape)
+        shoulder_center = ((left_shoulder[0] + right_shoulder[0]) // 2,
+                         (left_shoulder[1] + right_shoulder[1]) // 2)
+        
+        if self.view == "frontal":
+            self.draw_angle(frame, left_shoulder, shoulder_center, 
+                          (shoulder_center[0], 0), result.shoulder_angle, (255, 0, 0))
+            self.draw_angle(frame, left_ear, left_shoulder,
+                          (left_shoulder[0], 0), result.neck_angle, (0, 255, 0))
+        else:
+            self.draw_angle(frame, left_ear, left_shoulder,
+                          (left_shoulder[0], 0), result.neck_angle, (0, 255, 0))
+        
+        if result.calibration_data is not None:
+            self.draw_feedback(frame, result.shoulder_angle, result.neck_angle, result.is_poor_posture)
+    
+    def draw_landmarks(self, frame: np.ndarray, landmarks: np.ndarray) -> None:
+        height, width = frame.shape[:2]
+        points = {}
+        for idx, (x, y, _, visibility) in enumerate(landmarks):
+            if visibility < 0.5:
+                continue
+            points[idx] = (int(x * width), int(y * height))
+        
+        for start, end in mp.solutions.pose.POSE_CONNECTIONS:
+            if start in points and end in points:
+                cv2.line(frame, points[start], points[end], (224, 224, 224), 2)
+        for point in points.values():
+            cv2.circle(frame, point, 2, (0, 0, 255), 2)
+    
     def draw_feedback(self, frame: np.ndarray, shoulder_angle: float, 
                      neck_angle: float, is_poor_posture: bool) -> None:
         try:
@@ -179,7 +228,7 @@ class PostureAnalysisService:
             
             cv2.putText(frame, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2, cv2.LINE_AA)
             
-            if self.camera_type == "frontal":
+            if self.view == "frontal":
                 cv2.putText(frame, f"Ombro: {shoulder_angle:.1f}°", (10, 70), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
                 cv2.putText(frame, f"Pescoço: {neck_angle:.1f}°", (10, 100), 
@@ -201,10 +250,35 @@ class PostureAnalysisService:
         self.neck_angle_min = 0
         self.neck_angle_max = 0
         self.last_analysis_result = None
+        if self.inference_gate is not None:
+            self.inference_gate.reset()
+        if self.roi_tracker is not None:
+            self.roi_tracker.reset()
+    
+    def apply_calibration(self, calibration: PostureCalibration) -> None:
+        self.shoulder_angle_min = calibration.shoulder_angle_min
+        self.shoulder_angle_max = calibration.shoulder_angle_max
+        self.neck_angle_min = calibration.neck_angle_min
+        self.neck_angle_max = calibration.neck_angle_max
+        self.margin = calibration.margin
+        self.calibration_frames = 30
+        self.is_calibrated = True
+    
+    def get_calibration(self) -> Optional[PostureCalibration]:
+        if not self.is_calibrated:
+            return None
+        return PostureCalibration(
+            camera_type=self.camera_type,
+            shoulder_angle_min=self.shoulder_angle_min,
+            shoulder_angle_max=self.shoulder_angle_max,
+            neck_angle_min=self.neck_angle_min,
+            neck_angle_max=self.neck_angle_max,
+            margin=self.margin
+        )
     
     def get_last_result(self) -> Optional[PostureAnalysisResult]:
         return self.last_analysis_result
     
     def __del__(self):
-        if hasattr(self, 'pose'):
-            self.pose.close() 
\ No newline at end of file
+        if getattr(self, '_pose', None) is not None:
+            self._pose.close() 
\ No newline at end of file
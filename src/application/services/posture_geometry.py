@@ -0,0 +1,43 @@
+import numpy as np
+
+from ...domain.entities.posture_calibration import PostureCalibration
+
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_EAR = 7
+RIGHT_EAR = 8
+
+# Cada ângulo é medido no vértice (segunda coluna) entre o primeiro ponto e a vertical que sobe do vértice
+ANGLE_POINTS = np.array([
+    [LEFT_SHOULDER, RIGHT_SHOULDER],
+    [LEFT_EAR, LEFT_SHOULDER],
+])
+
+SHOULDER_ANGLE = 0
+NECK_ANGLE = 1
+
+
+def landmarks_to_pixels(landmarks: np.ndarray, width: int, height: int) -> np.ndarray:
+    return np.trunc(landmarks[..., :2] * np.array([width, height], dtype=np.float64))
+
+
+def posture_angles(landmarks: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Ângulos de ombro e pescoço em graus para landmarks (33, 4) ou lotes (N, 33, 4); retorna (..., 2)"""
+    points = landmarks_to_pixels(landmarks[..., ANGLE_POINTS.ravel(), :], width, height)
+    points = points.reshape(points.shape[:-2] + ANGLE_POINTS.shape + (2,))
+    first = points[..., 0, :]
+    vertex = points[..., 1, :]
+
+    vertical = np.arctan2(-vertex[..., 1], 0.0)
+    towards_first = np.arctan2(first[..., 1] - vertex[..., 1], first[..., 0] - vertex[..., 0])
+    return np.abs(np.degrees(vertical - towards_first))
+
+
+def classify_poor_posture(angles: np.ndarray, calibration: PostureCalibration, view: str) -> np.ndarray:
+    shoulder = angles[..., SHOULDER_ANGLE]
+    neck = angles[..., NECK_ANGLE]
+    poor_neck = (neck < calibration.neck_angle_min) | (neck > calibration.neck_angle_max)
+    if view != "frontal":
+        return poor_neck
+    poor_shoulder = (shoulder < calibration.shoulder_angle_min) | (shoulder > calibration.shoulder_angle_max)
+    return poor_shoulder | poor_neck
@@ -0,0 +1,100 @@
+import queue
+import time
+from threading import Event, Thread
+from typing import List
+
+from ...domain.entities.posture_data import PostureData
+from ...domain.repositories.posture_repository import PostureRepository
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = Event()
+
+
+_STOP = object()
+
+
+class PostureRecordWriter(Thread):
+    """Grava os registros de postura em segundo plano, agrupando vários registros em uma única transação"""
+
+    def __init__(self, repository: PostureRepository, max_queue: int = 10000, batch_size: int = 256,
+                 flush_interval: float = 1.0):
+        super().__init__(daemon=True)
+        self.repository = repository
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.written_records = 0
+        self.dropped_records = 0
+        self.batches = 0
+
+    def submit(self, posture_data: PostureData) -> bool:
+        """Enfileira um registro sem bloquear; descarta o registro se a fila estiver cheia"""
+        try:
+            self.queue.put_nowait(posture_data)
+            return True
+        except queue.Full:
+            self.dropped_records += 1
+            if self.dropped_records == 1 or self.dropped_records % 1000 == 0:
+                print(f"Fila de gravação cheia: {self.dropped_records} registros descartados")
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Aguarda a gravação de tudo o que foi enfileirado até agora"""
+        if not self.is_alive():
+            return self.queue.empty()
+        request = _FlushRequest()
+        try:
+            self.queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Grava os registros pendentes e encerra a thread"""
+        if not self.is_alive():
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("Fila de gravação não esvaziou a tempo; registros pendentes podem ser perdidos")
+            return
+        self.join(timeout)
+
+    def run(self):
+        batch: List[PostureData] = []
+        deadline = None
+
+        while True:
+            wait = self.flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, PostureData):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            self._write(batch)
+            batch = []
+            deadline = None
+
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, batch: List[PostureData]) -> None:
+        if not batch:
+            return
+        try:
+            self.repository.save_posture_data_batch(batch)
+            self.written_records += len(batch)
+            self.batches += 1
+        except Exception as e:
+            print(f"Erro ao gravar {len(batch)} registros de postura: {e}")
@@ -0,0 +1,59 @@
+from datetime import date
+from threading import Lock, Thread
+from typing import Callable, Optional
+
+from ...domain.entities.statistics import PostureStatistics
+from ...domain.repositories.posture_repository import PostureRepository
+
+
+class StatisticsService:
+    """Calcula as estatísticas em segundo plano e as mantém em cache pela versão dos dados.
+
+    A versão combina `get_data_version` do repositório com a data atual, já que as contagens de
+    "hoje" e dos últimos 7 dias mudam na virada do dia mesmo sem novos registros.
+    """
+
+    def __init__(self, repository: PostureRepository):
+        self.repository = repository
+        self._lock = Lock()
+        self._version = None
+        self._statistics: Optional[PostureStatistics] = None
+        self._worker: Optional[Thread] = None
+
+    @property
+    def statistics(self) -> Optional[PostureStatistics]:
+        """Último resultado calculado, mesmo que desatualizado"""
+        return self._statistics
+
+    @property
+    def version(self):
+        return self._version
+
+    def _current_version(self) -> tuple:
+        return self.repository.get_data_version(), date.today().toordinal()
+
+    def request(self, on_done: Callable[[PostureStatistics, tuple], None],
+                on_error: Optional[Callable[[Exception], None]] = None) -> bool:
+        """Agenda o cálculo em uma thread; `on_done(statistics, version)` é chamado nessa thread.
+
+        Retorna False se já houver um cálculo em andamento.
+        """
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return False
+            self._worker = Thread(target=self._run, args=(on_done, on_error), daemon=True)
+            self._worker.start()
+            return True
+
+    def _run(self, on_done, on_error) -> None:
+        try:
+            version = self._current_version()
+            if version != self._version or self._statistics is None:
+                statistics = self.repository.get_statistics()
+                with self._lock:
+                    self._statistics, self._version = statistics, version
+            on_done(self._statistics, self._version)
+        except Exception as e:
+            print(f"Erro ao calcular estatísticas: {e}")
+            if on_error is not None:
+                on_error(e)
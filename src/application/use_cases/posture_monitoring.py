@@ -5,11 +5,14 @@ from ...domain.entities.posture_data import PostureData
 from ...domain.entities.posture_calibration import PostureCalibration
 from ...domain.entities.statistics import PostureStatistics
 from ...domain.repositories.posture_repository import PostureRepository
+from ..services.posture_record_writer import PostureRecordWriter
 
 class PostureMonitoringUseCase:
     
-    def __init__(self, repository: PostureRepository):
+    def __init__(self, repository: PostureRepository, write_behind: bool = True):
         self.repository = repository
+        self.write_behind = write_behind
+        self.writer: Optional[PostureRecordWriter] = None
     
     def process_posture_frame(self, shoulder_angle: float, neck_angle: float, 
                             camera_type: str, calibration_data: Optional[PostureCalibration] = None) -> None:
@@ -26,7 +29,26 @@ class PostureMonitoringUseCase:
             is_poor_posture=is_poor_posture
         )
         
-        self.repository.save_posture_data(posture_data)
+        if self.write_behind:
+            self._get_writer().submit(posture_data)
+        else:
+            self.repository.save_posture_data(posture_data)
+    
+    def _get_writer(self) -> PostureRecordWriter:
+        if self.writer is None or not self.writer.is_alive():
+            self.writer = PostureRecordWriter(self.repository)
+            self.writer.start()
+        return self.writer
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+    
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
     
     def get_statistics(self) -> PostureStatistics:
         return self.repository.get_statistics()
@@ -0,0 +1,47 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+P90_Z_SCORE = 1.2816
+
+
+@dataclass
+class AngleSummary:
+    count: int
+    total: float
+    total_squares: float
+    minimum: Optional[float]
+    maximum: Optional[float]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        if not self.count:
+            return None
+        variance = self.total_squares / self.count - self.mean ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def p90(self) -> Optional[float]:
+        """Estimativa do percentil 90 supondo distribuição normal, limitada ao máximo do intervalo"""
+        if not self.count:
+            return None
+        return min(self.mean + P90_Z_SCORE * self.std, self.maximum)
+
+
+@dataclass
+class PostureAggregate:
+    bucket_start: datetime
+    camera_type: str
+    samples: int
+    poor_samples: int
+    shoulder: AngleSummary
+    neck: AngleSummary
+
+    @property
+    def poor_fraction(self) -> float:
+        return self.poor_samples / self.samples if self.samples else 0.0
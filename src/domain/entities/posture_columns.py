@@ -0,0 +1,54 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List
+
+import numpy as np
+
+
+@dataclass
+class PostureColumns:
+    """Registros de postura em formato colunar; timestamps em milissegundos desde a época Unix"""
+    ids: np.ndarray
+    timestamps: np.ndarray
+    shoulder_angles: np.ndarray
+    neck_angles: np.ndarray
+    camera_codes: np.ndarray
+    is_poor_posture: np.ndarray
+    camera_types: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def camera_names(self) -> np.ndarray:
+        names = np.array(self.camera_types + [""], dtype=object)
+        return names[self.camera_codes]
+
+    def datetimes(self) -> List[datetime]:
+        return [datetime.fromtimestamp(value / 1000) for value in self.timestamps.tolist()]
+
+    @classmethod
+    def create_empty(cls, camera_types: List[str] = None) -> 'PostureColumns':
+        return cls(
+            ids=np.empty(0, dtype=np.int64),
+            timestamps=np.empty(0, dtype=np.int64),
+            shoulder_angles=np.empty(0, dtype=np.float64),
+            neck_angles=np.empty(0, dtype=np.float64),
+            camera_codes=np.empty(0, dtype=np.int16),
+            is_poor_posture=np.empty(0, dtype=bool),
+            camera_types=list(camera_types or [])
+        )
+
+    @classmethod
+    def concatenate(cls, chunks: Iterable['PostureColumns'], camera_types: List[str] = None) -> 'PostureColumns':
+        chunks = list(chunks)
+        if not chunks:
+            return cls.create_empty(camera_types)
+        return cls(
+            ids=np.concatenate([chunk.ids for chunk in chunks]),
+            timestamps=np.concatenate([chunk.timestamps for chunk in chunks]),
+            shoulder_angles=np.concatenate([chunk.shoulder_angles for chunk in chunks]),
+            neck_angles=np.concatenate([chunk.neck_angles for chunk in chunks]),
+            camera_codes=np.concatenate([chunk.camera_codes for chunk in chunks]),
+            is_poor_posture=np.concatenate([chunk.is_poor_posture for chunk in chunks]),
+            camera_types=list(camera_types if camera_types is not None else chunks[0].camera_types)
+        )
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from datetime import datetime, timedelta
 
+from ..entities.posture_aggregate import PostureAggregate
 from ..entities.posture_data import PostureData
 from ..entities.posture_calibration import PostureCalibration
+from ..entities.posture_columns import PostureColumns
 from ..entities.statistics import PostureStatistics
 
 
@@ -13,14 +15,42 @@ class PostureRepository(ABC):
     def save_posture_data(self, posture_data: PostureData) -> None:
         pass
     
+    @abstractmethod
+    def save_posture_data_batch(self, posture_data: List[PostureData]) -> None:
+        pass
+    
     @abstractmethod
     def get_posture_data_by_date_range(self, start_date: datetime, end_date: datetime) -> List[PostureData]:
         pass
     
+    @abstractmethod
+    def iter_posture_data_by_date_range(self, start_date: datetime, end_date: datetime,
+                                        chunk_size: int = 5000) -> Iterator[PostureData]:
+        pass
+    
+    @abstractmethod
+    def iter_posture_columns(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                             camera_type: Optional[str] = None, chunk_size: int = 65536) -> Iterator[PostureColumns]:
+        pass
+    
+    def get_posture_columns(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                            camera_type: Optional[str] = None) -> PostureColumns:
+        return PostureColumns.concatenate(self.iter_posture_columns(start_date, end_date, camera_type))
+    
+    @abstractmethod
+    def get_angle_aggregates(self, start_date: datetime, end_date: datetime, resolution_seconds: int,
+                             camera_type: Optional[str] = None) -> List[PostureAggregate]:
+        pass
+    
     @abstractmethod
     def get_statistics(self) -> PostureStatistics:
         pass
     
+    @abstractmethod
+    def get_data_version(self) -> int:
+        """Valor que muda sempre que novos registros são gravados"""
+        pass
+    
     @abstractmethod
     def save_calibration(self, calibration: PostureCalibration) -> None:
         pass
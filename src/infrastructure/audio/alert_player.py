@@ -0,0 +1,33 @@
+import threading
+import time
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+
+def play_alert_sound() -> None:
+    """Reproduz alerta sonoro usando winsound (mais confiável em executáveis)"""
+    def play_sound():
+        try:
+            print("Tocando alerta sonoro...")
+            if winsound is None:
+                print("\a", end="", flush=True)
+                return
+            winsound.Beep(800, 200) 
+            time.sleep(0.1)
+            winsound.Beep(1000, 200)
+            time.sleep(0.1)
+            winsound.Beep(1200, 300)
+            
+            print("Alerta sonoro reproduzido com sucesso!")
+            
+        except Exception as e:
+            print(f"Erro ao reproduzir alerta sonoro: {e}")
+            try:
+                winsound.Beep(1000, 500)
+                print("Alerta sonoro simples reproduzido")
+            except:
+                print("Não foi possível reproduzir nenhum alerta sonoro")
+    threading.Thread(target=play_sound, daemon=True).start()
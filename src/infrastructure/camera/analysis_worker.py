@@ -0,0 +1,127 @@
+import queue
+import time
+from threading import Lock, Thread
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .camera_thread import CameraThread, put_drop_oldest
+from .frame_ring import CapturedFrame
+from ...application.services.posture_analysis_service import PostureAnalysisService, PostureAnalysisResult
+from ...domain.entities.posture_calibration import PostureCalibration
+
+
+class AnalysisWorker(Thread):
+    """Consome os frames de uma CameraThread e executa a análise de postura fora da thread da UI.
+
+    O processor só é usado pela thread de inferência: comandos de calibração vindos da UI ou do
+    daemon entram em uma fila e são aplicados no início do próximo process_captured. Cada comando
+    abre uma nova época e resultados de épocas anteriores são descartados.
+    """
+
+    def __init__(self, camera_thread: CameraThread, processor: PostureAnalysisService, maxsize: int = 1,
+                 draw_overlay: bool = True):
+        super().__init__(daemon=True)
+        self.camera_thread = camera_thread
+        self.processor = processor
+        self.draw_overlay = draw_overlay
+        self.camera_type = processor.camera_type
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.running = True
+        self.processed_frames = 0
+        self.dropped_frames = 0
+        self.last_seq = 0
+        self.last_latency = 0.0
+
+        self.commands = queue.Queue()
+        self.last_analysis_result = None
+        self._calibrated = processor.is_calibrated
+        self._calibration_epoch = 0
+        self._calibration_lock = Lock()
+        self._processor_epoch = 0
+
+    def run(self):
+        while self.running:
+            captured = self.camera_thread.get_latest_frame(self.last_seq, timeout=0.1)
+            if captured is not None:
+                self.process_captured(captured)
+
+    def has_new_frame(self) -> bool:
+        ring = self.camera_thread.ring
+        return ring is not None and ring.latest >= 0 and ring.seqs[ring.latest] > self.last_seq
+
+    def _apply_commands(self) -> None:
+        while True:
+            try:
+                command, payload, epoch = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            if command == 'reset_calibration':
+                self.processor.reset_calibration()
+            elif command == 'apply_calibration':
+                self.processor.apply_calibration(payload)
+            self._processor_epoch = epoch
+
+    def process_captured(self, captured: CapturedFrame) -> None:
+        self._apply_commands()
+        epoch = self._processor_epoch
+        if self.last_seq:
+            self.dropped_frames += captured.seq - self.last_seq - 1
+        self.last_seq = captured.seq
+
+        try:
+            if self.draw_overlay:
+                annotated_frame, analysis_result = self.processor.process_frame(captured.frame)
+            else:
+                annotated_frame, analysis_result = None, self.processor.analyze_frame(captured.frame)
+        except Exception as e:
+            print(f"Erro no worker de análise {self.camera_type}: {e}")
+            return
+
+        with self._calibration_lock:
+            # Resultados anteriores ao último comando de calibração ainda refletem a calibração antiga
+            if epoch != self._calibration_epoch:
+                return
+            self.last_analysis_result = analysis_result
+            self._calibrated = self.processor.is_calibrated
+
+        if annotated_frame is captured.frame:
+            annotated_frame = captured.frame.copy()
+
+        self.processed_frames += 1
+        self.last_latency = time.monotonic() - captured.timestamp
+        put_drop_oldest(self.queue, (annotated_frame, analysis_result))
+
+    def get_latest(self) -> Optional[Tuple[np.ndarray, Optional[PostureAnalysisResult]]]:
+        latest = None
+        while True:
+            try:
+                latest = self.queue.get_nowait()
+            except queue.Empty:
+                return latest
+
+    @property
+    def is_calibrated(self) -> bool:
+        return self._calibrated
+
+    def _send_calibration_command(self, command: str, payload, calibrated: bool) -> None:
+        with self._calibration_lock:
+            self._calibrated = calibrated
+            self._calibration_epoch += 1
+            if not calibrated:
+                self.last_analysis_result = None
+            self.commands.put((command, payload, self._calibration_epoch))
+
+    def reset_calibration(self) -> None:
+        self._send_calibration_command('reset_calibration', None, False)
+
+    def apply_calibration(self, calibration: PostureCalibration) -> None:
+        self._send_calibration_command('apply_calibration', calibration, True)
+
+    def get_last_result(self) -> Optional[PostureAnalysisResult]:
+        return self.last_analysis_result
+
+    def stop(self):
+        self.running = False
+        if self.is_alive():
+            self.join(timeout=1.0)
@@ -0,0 +1,71 @@
+import json
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Union
+
+from ...domain.repositories.posture_repository import PostureRepository
+
+
+def parse_camera_source(value: str) -> Union[int, str]:
+    return int(value) if value.isdigit() else value
+
+
+@dataclass
+class CameraSource:
+    name: str
+    source: Union[int, str]
+    view: str = "frontal"
+    priority: float = 1.0
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+class CameraRegistry:
+    """Câmeras nomeadas da estação; cada uma recebe sua própria análise de postura"""
+
+    def __init__(self):
+        self.sources: Dict[str, CameraSource] = {}
+
+    def register(self, camera: CameraSource) -> None:
+        if camera.name in self.sources:
+            raise ValueError(f"Câmera {camera.name} já registrada")
+        if camera.view not in ("frontal", "lateral"):
+            raise ValueError(f"Visão inválida para a câmera {camera.name}: {camera.view}")
+        self.sources[camera.name] = camera
+
+    def names(self) -> List[str]:
+        return list(self.sources)
+
+    def __iter__(self) -> Iterator[CameraSource]:
+        return iter(self.sources.values())
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    @classmethod
+    def from_settings(cls, repository: PostureRepository, frontal_source: Union[int, str] = 0,
+                      lateral_source: Union[int, str] = "", include_extra: bool = True) -> 'CameraRegistry':
+        """Frontal e lateral como antes, mais as câmeras extras em app_settings['extra_cameras'] (lista JSON)"""
+        registry = cls()
+        registry.register(CameraSource('frontal', frontal_source, 'frontal', width=640, height=480))
+        if lateral_source != "":
+            registry.register(CameraSource('lateral', lateral_source, 'lateral'))
+
+        if not include_extra:
+            return registry
+
+        try:
+            extra_cameras = json.loads(repository.get_setting("extra_cameras", "[]"))
+        except ValueError as e:
+            print(f"Erro ao ler câmeras extras: {e}")
+            extra_cameras = []
+
+        for entry in extra_cameras:
+            registry.register(CameraSource(
+                name=entry['name'],
+                source=parse_camera_source(str(entry['source'])),
+                view=entry.get('view', 'lateral'),
+                priority=float(entry.get('priority', 1.0)),
+                width=entry.get('width'),
+                height=entry.get('height')
+            ))
+        return registry
@@ -1,13 +1,37 @@
 import cv2
+import numpy as np
 import queue
 from threading import Thread, Event
 import time
+from typing import Callable, List, Optional
+
+from .frame_ring import FrameRing, CapturedFrame
+
+
+def put_drop_oldest(target_queue: queue.Queue, item) -> None:
+    if target_queue.full():
+        try:
+            target_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    try:
+        target_queue.put_nowait(item)
+    except queue.Full:
+        pass
+
 
 class CameraThread(Thread):
-    def __init__(self, source):
+    def __init__(self, source, width: Optional[int] = None, height: Optional[int] = None, slots: int = 6):
         super().__init__(daemon=True)
-        self.queue = queue.Queue(maxsize=2)
+        self.ring = None
+        self.slots = slots
+        self.frame_event = Event()
+        self.frame_listeners: List[Callable[[], None]] = []
+        self.frames_captured = 0
         self.source = source
+        self.width = width
+        self.height = height
         self.running = True
         self.cap = None
         self.connected = False
@@ -21,22 +45,35 @@ class CameraThread(Thread):
                 return
             
             self.connected = True
+            if self.width:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            if self.height:
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
             self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             while self.running:
-                ret, frame = self.cap.read()
+                if self.ring is None:
+                    ret, frame = self.cap.read()
+                    if ret:
+                        self.ring = FrameRing(frame.shape, self.slots, frame.dtype)
+                        slot = self.ring.next_slot()
+                        np.copyto(self.ring.buffers[slot], frame)
+                        self._commit(slot)
+                    else:
+                        time.sleep(0.01)
+                    continue
+                
+                slot = self.ring.next_slot()
+                buffer = self.ring.buffers[slot]
+                ret, frame = self.cap.read(image=buffer)
                 
                 if ret:
-                    if self.queue.full():
-                        try:
-                            self.queue.get_nowait()
-                        except queue.Empty:
-                            pass
-                    
-                    try:
-                        self.queue.put_nowait(frame)
-                    except queue.Full:
-                        pass
+                    if frame is not buffer:
+                        if frame.shape != buffer.shape:
+                            self.ring = FrameRing(frame.shape, self.slots, frame.dtype)
+                            slot = self.ring.next_slot()
+                        np.copyto(self.ring.buffers[slot], frame)
+                    self._commit(slot)
                 else:
                     time.sleep(0.01)
                     
@@ -49,11 +86,39 @@ class CameraThread(Thread):
     def is_connected(self):
         return self.connected and self.cap is not None and self.cap.isOpened()
 
-    def get_frame(self):
-        try:
-            return self.queue.get_nowait() if not self.queue.empty() else None
-        except queue.Empty:
-            return None
+    def _commit(self, slot: int) -> None:
+        self.frames_captured += 1
+        self.ring.commit(slot, self.frames_captured, time.monotonic())
+        self.frame_event.set()
+        for listener in self.frame_listeners:
+            listener()
+
+    def get_latest_frame(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
+        """Retorna o frame mais recente com sequência maior que after_seq, sem copiá-lo.
+
+        O frame continua válido até a próxima chamada; quem precisar guardá-lo por mais tempo
+        deve usar copy_frame.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            ring = self.ring
+            if ring is not None:
+                captured = ring.latest_frame(after_seq)
+                if captured is not None:
+                    return captured
+            
+            if deadline is None:
+                return None
+            self.frame_event.clear()
+            ring = self.ring
+            if ring is not None and ring.latest >= 0 and ring.seqs[ring.latest] > after_seq:
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.frame_event.wait(remaining):
+                return None
+
+    def copy_frame(self, captured: CapturedFrame) -> Optional[np.ndarray]:
+        return self.ring.copy_if_current(captured) if self.ring is not None else None
 
     def stop(self):
         self.running = False
@@ -68,4 +133,4 @@ class CameraThread(Thread):
         self.connected = False
 
     def __del__(self):
-        self.cleanup() 
\ No newline at end of file
+        self.cleanup() 
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class CapturedFrame:
+    frame: np.ndarray
+    seq: int
+    timestamp: float
+    slot: int
+
+
+class FrameRing:
+    """Anel de buffers pré-alocados preenchidos pela thread da câmera.
+
+    Há um único escritor e um único leitor por anel. O escritor nunca sobrescreve o slot mais
+    recente nem o último slot entregue ao leitor, então o frame devolvido por latest_frame
+    permanece válido até a próxima chamada, sem locks nem cópias. O número de sequência de um
+    slot é zerado antes de ele ser reescrito, o que permite validar cópias tardias (seqlock).
+    O leitor reserva o slot antes de ler a sequência e o escritor confere a reserva depois de
+    zerá-la, então um slot nunca é entregue e reescrito ao mesmo tempo.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], slots: int = 6, dtype=np.uint8):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.buffers = np.empty((slots,) + self.shape, dtype=dtype)
+        self.seqs = [0] * slots
+        self.timestamps = [0.0] * slots
+        self.latest = -1
+        self.reader_slot = -1
+        self._next = 0
+
+    def next_slot(self) -> int:
+        for _ in range(self.slots):
+            slot = self._next
+            self._next = (self._next + 1) % self.slots
+            if slot != self.latest and slot != self.reader_slot:
+                seq = self.seqs[slot]
+                self.seqs[slot] = 0
+                if slot == self.reader_slot:
+                    # reservado pelo leitor depois da verificação acima
+                    self.seqs[slot] = seq
+                    continue
+                return slot
+        raise RuntimeError("Nenhum slot livre no anel de frames")
+
+    def commit(self, slot: int, seq: int, timestamp: float) -> None:
+        self.timestamps[slot] = timestamp
+        self.seqs[slot] = seq
+        self.latest = slot
+
+    def latest_frame(self, after_seq: int = 0) -> Optional[CapturedFrame]:
+        while True:
+            slot = self.latest
+            if slot < 0:
+                return None
+            self.reader_slot = slot
+            seq = self.seqs[slot]
+            if seq:
+                break
+            # sequência zerada: o escritor tomou o slot antes da reserva; tenta o novo mais recente
+        if seq <= after_seq:
+            return None
+        return CapturedFrame(self.buffers[slot], seq, self.timestamps[slot], slot)
+
+    def copy_if_current(self, captured: CapturedFrame) -> Optional[np.ndarray]:
+        if self.seqs[captured.slot] != captured.seq:
+            return None
+        frame = self.buffers[captured.slot].copy()
+        if self.seqs[captured.slot] != captured.seq:
+            return None
+        return frame
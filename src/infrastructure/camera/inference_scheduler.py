@@ -0,0 +1,94 @@
+import time
+from dataclasses import dataclass
+from threading import Condition, Thread
+from typing import List, Optional
+
+from .analysis_worker import AnalysisWorker
+
+
+@dataclass
+class _ScheduledWorker:
+    worker: AnalysisWorker
+    priority: float = 1.0
+    busy: bool = False
+    last_started: float = 0.0
+
+
+class InferenceScheduler:
+    """Divide um número fixo de threads de inferência entre as câmeras.
+
+    A cada rodada é escolhida, entre as câmeras com frame novo e sem inferência em andamento,
+    a de maior prioridade * tempo desde a última inferência. Com mais câmeras que capacidade a
+    taxa de cada uma cai proporcionalmente, sem que nenhuma fique sem ser atendida. Sem
+    trabalho, as threads esperam em uma Condition sinalizada pelas câmeras a cada frame novo e
+    pelo fim de cada inferência.
+    """
+
+    def __init__(self, capacity: int = 1):
+        self.capacity = max(1, capacity)
+        self.entries: List[_ScheduledWorker] = []
+        self.condition = Condition()
+        self.threads: List[Thread] = []
+        self.running = False
+
+    def add_worker(self, worker: AnalysisWorker, priority: float = 1.0) -> None:
+        with self.condition:
+            self.entries.append(_ScheduledWorker(worker, priority))
+        worker.camera_thread.frame_listeners.append(self._notify)
+
+    def _notify(self) -> None:
+        with self.condition:
+            self.condition.notify()
+
+    def start(self) -> None:
+        self.running = True
+        for index in range(self.capacity):
+            thread = Thread(target=self._run, name=f"inference-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _next_entry(self) -> Optional[_ScheduledWorker]:
+        """Espera até haver uma câmera com frame novo e livre; None quando o agendador para"""
+        with self.condition:
+            while self.running:
+                now = time.monotonic()
+                best, best_score = None, -1.0
+                for entry in self.entries:
+                    if entry.busy or not entry.worker.has_new_frame():
+                        continue
+                    score = entry.priority * (now - entry.last_started)
+                    if score > best_score:
+                        best, best_score = entry, score
+
+                if best is not None:
+                    best.busy = True
+                    best.last_started = now
+                    return best
+                self.condition.wait()
+            return None
+
+    def _run(self) -> None:
+        while self.running:
+            entry = self._next_entry()
+            if entry is None:
+                continue
+
+            try:
+                worker = entry.worker
+                captured = worker.camera_thread.get_latest_frame(worker.last_seq)
+                if captured is not None:
+                    worker.process_captured(captured)
+            except Exception as e:
+                print(f"Erro no agendador de inferência ({entry.worker.camera_type}): {e}")
+            finally:
+                with self.condition:
+                    entry.busy = False
+                    self.condition.notify()
+
+    def stop(self) -> None:
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+        self.threads = []
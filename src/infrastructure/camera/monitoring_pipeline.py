@@ -0,0 +1,74 @@
+import os
+from typing import Dict, Optional
+
+from .analysis_worker import AnalysisWorker
+from .camera_registry import CameraRegistry
+from .camera_thread import CameraThread
+from .inference_scheduler import InferenceScheduler
+from .process_analysis_worker import ProcessAnalysisWorker
+from ...application.services.posture_analysis_service import PostureAnalysisService
+from ...domain.repositories.posture_repository import PostureRepository
+
+
+class MonitoringPipeline:
+    """Captura e análise de todas as câmeras do registro, usada pela tela de monitoramento e pelo daemon"""
+
+    def __init__(self, registry: CameraRegistry, inference_mode: str = "thread",
+                 service_options: Optional[dict] = None, draw_overlay: bool = True,
+                 capacity: Optional[int] = None):
+        self.registry = registry
+        self.inference_mode = inference_mode
+        self.service_options = service_options or {}
+        self.draw_overlay = draw_overlay
+        self.capacity = capacity or min(len(registry), max(1, (os.cpu_count() or 2) // 2))
+        self.camera_threads: Dict[str, CameraThread] = {}
+        self.workers = {}
+        self.scheduler = None
+
+    @classmethod
+    def from_settings(cls, repository: PostureRepository, registry: CameraRegistry,
+                      draw_overlay: bool = True) -> 'MonitoringPipeline':
+        capacity = repository.get_setting("inference_capacity", "")
+        return cls(
+            registry,
+            inference_mode=repository.get_setting("inference_mode", "thread"),
+            service_options={
+                'inference_gating': repository.get_setting("inference_gating", "0") == "1",
+                'roi_tracking': repository.get_setting("roi_tracking", "0") == "1"
+            },
+            draw_overlay=draw_overlay,
+            capacity=int(capacity) if capacity else None
+        )
+
+    def start(self) -> None:
+        if self.inference_mode != "process":
+            self.scheduler = InferenceScheduler(self.capacity)
+
+        for camera in self.registry:
+            camera_thread = CameraThread(camera.source, width=camera.width, height=camera.height)
+            camera_thread.start()
+            self.camera_threads[camera.name] = camera_thread
+
+            options = dict(self.service_options, view=camera.view)
+            if self.inference_mode == "process":
+                worker = ProcessAnalysisWorker(camera_thread, camera.name, draw_overlay=self.draw_overlay, **options)
+                worker.start()
+            else:
+                worker = AnalysisWorker(camera_thread, PostureAnalysisService(camera.name, **options),
+                                        draw_overlay=self.draw_overlay)
+                self.scheduler.add_worker(worker, camera.priority)
+            self.workers[camera.name] = worker
+
+        if self.scheduler is not None:
+            self.scheduler.start()
+
+    def stop(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        for worker in self.workers.values():
+            worker.stop()
+        for camera_thread in self.camera_threads.values():
+            camera_thread.stop()
+        self.workers = {}
+        self.camera_threads = {}
@@ -0,0 +1,212 @@
+import multiprocessing as mp
+import queue
+import time
+from threading import Lock, Thread
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .camera_thread import CameraThread, put_drop_oldest
+from .frame_ring import CapturedFrame
+from .shared_frame_ring import SharedFrameRing
+from ...application.services.posture_analysis_service import PostureAnalysisService, PostureAnalysisResult
+from ...domain.entities.posture_calibration import PostureCalibration
+
+MAX_PENDING_FRAMES = 32
+
+
+def _inference_process_main(camera_type: str, service_options: dict, ring_args: tuple,
+                            command_queue, result_queue, stop_event) -> None:
+    ring = SharedFrameRing.attach(*ring_args)
+    processor = PostureAnalysisService(camera_type, **service_options)
+    epoch = 0
+
+    try:
+        while not stop_event.is_set():
+            try:
+                while True:
+                    command, payload, epoch = command_queue.get_nowait()
+                    if command == 'reset_calibration':
+                        processor.reset_calibration()
+                    elif command == 'apply_calibration':
+                        processor.apply_calibration(payload)
+            except queue.Empty:
+                pass
+
+            acquired = ring.acquire_latest(timeout=0.1)
+            if acquired is None:
+                continue
+
+            slot, seq, frame = acquired
+            try:
+                analysis_result = processor.analyze_frame(frame)
+            except Exception as e:
+                print(f"Erro no processo de inferência {camera_type}: {e}")
+                analysis_result = None
+            finally:
+                ring.release(slot)
+
+            try:
+                result_queue.put_nowait((seq, epoch, analysis_result))
+            except queue.Full:
+                pass
+    finally:
+        ring.close()
+
+
+class ProcessAnalysisWorker(Thread):
+    """Executa o Pose de uma câmera em um processo separado, trocando frames por memória compartilhada"""
+
+    def __init__(self, camera_thread: CameraThread, camera_type: str, maxsize: int = 1,
+                 draw_overlay: bool = True, **service_options):
+        super().__init__(daemon=True)
+        self.camera_thread = camera_thread
+        self.camera_type = camera_type
+        self.draw_overlay = draw_overlay
+        self.service_options = service_options
+        self.renderer = PostureAnalysisService(camera_type, view=service_options.get('view'))
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.running = True
+        self.processed_frames = 0
+        self.dropped_frames = 0
+        self.last_latency = 0.0
+
+        self.ring = None
+        self.process = None
+        self.command_queue = mp.Queue()
+        self.result_queue = mp.Queue(maxsize=8)
+        self.stop_event = mp.Event()
+        self.pending_frames = {}
+        self.last_analysis_result = None
+        self._calibrated = False
+        self._calibration_epoch = 0
+        self._calibration_lock = Lock()
+        self._seq = 0
+
+    def _start_process(self, frame: np.ndarray) -> None:
+        self.ring = SharedFrameRing(frame.shape)
+        self.process = mp.Process(
+            target=_inference_process_main,
+            args=(self.camera_type, self.service_options, self.ring.attach_args(), self.command_queue,
+                  self.result_queue, self.stop_event),
+            daemon=True
+        )
+        self.process.start()
+
+    def run(self):
+        try:
+            while self.running:
+                captured = self.camera_thread.get_latest_frame(self._seq, timeout=0.01)
+                if captured is not None:
+                    self._submit(captured)
+                self._collect_results()
+        except Exception as e:
+            print(f"Erro no worker de processo {self.camera_type}: {e}")
+        finally:
+            self._shutdown_process()
+
+    def _submit(self, captured: CapturedFrame) -> None:
+        frame = captured.frame
+        if self.ring is None:
+            self._start_process(frame)
+        if frame.shape != self.ring.shape:
+            frame = cv2.resize(frame, (self.ring.shape[1], self.ring.shape[0]))
+
+        if self._seq:
+            self.dropped_frames += captured.seq - self._seq - 1
+        self._seq = captured.seq
+        if self.ring.publish(frame, captured.seq):
+            self.dropped_frames += 1
+        self.pending_frames[captured.seq] = captured
+
+        if len(self.pending_frames) > MAX_PENDING_FRAMES:
+            del self.pending_frames[next(iter(self.pending_frames))]
+
+    def _collect_results(self) -> None:
+        while True:
+            try:
+                seq, epoch, analysis_result = self.result_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            captured = self.pending_frames.pop(seq, None)
+            for stale_seq in [s for s in self.pending_frames if s < seq]:
+                del self.pending_frames[stale_seq]
+            if captured is None:
+                continue
+            with self._calibration_lock:
+                # Resultados anteriores ao último comando de calibração ainda refletem a calibração antiga
+                if epoch != self._calibration_epoch:
+                    continue
+                self.last_analysis_result = analysis_result
+                if analysis_result is not None:
+                    self._calibrated = analysis_result.calibration_data is not None
+
+            self.processed_frames += 1
+            self.last_latency = time.monotonic() - captured.timestamp
+
+            if not self.draw_overlay:
+                put_drop_oldest(self.queue, (None, analysis_result))
+                continue
+
+            annotated_frame = self.camera_thread.copy_frame(captured)
+            if annotated_frame is None:
+                latest = self.camera_thread.get_latest_frame()
+                if latest is None:
+                    continue
+                annotated_frame = self.camera_thread.copy_frame(latest)
+                if annotated_frame is None:
+                    continue
+
+            if analysis_result is not None:
+                self.renderer.draw_analysis(annotated_frame, analysis_result)
+            put_drop_oldest(self.queue, (annotated_frame, analysis_result))
+
+    def get_latest(self) -> Optional[Tuple[np.ndarray, Optional[PostureAnalysisResult]]]:
+        latest = None
+        while True:
+            try:
+                latest = self.queue.get_nowait()
+            except queue.Empty:
+                return latest
+
+    @property
+    def is_calibrated(self) -> bool:
+        return self._calibrated
+
+    def _send_calibration_command(self, command: str, payload, calibrated: bool) -> None:
+        """Cada comando abre uma nova época; resultados de épocas anteriores são descartados"""
+        with self._calibration_lock:
+            self._calibrated = calibrated
+            self._calibration_epoch += 1
+            if not calibrated:
+                self.last_analysis_result = None
+            self.command_queue.put((command, payload, self._calibration_epoch))
+
+    def reset_calibration(self) -> None:
+        self._send_calibration_command('reset_calibration', None, False)
+
+    def apply_calibration(self, calibration: PostureCalibration) -> None:
+        self._send_calibration_command('apply_calibration', calibration, True)
+
+    def get_last_result(self) -> Optional[PostureAnalysisResult]:
+        return self.last_analysis_result
+
+    def _shutdown_process(self) -> None:
+        self.stop_event.set()
+        if self.process is not None:
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def stop(self):
+        self.running = False
+        if self.is_alive():
+            self.join(timeout=3.0)
+        else:
+            self._shutdown_process()
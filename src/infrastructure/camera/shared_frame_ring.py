@@ -0,0 +1,96 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class SharedFrameRing:
+    """Anel de frames em memória compartilhada entre o processo da aplicação e um worker de inferência.
+
+    O escritor publica sempre o frame mais recente; o leitor reserva o slot publicado enquanto
+    o processa. Com três slots sempre existe um livre, então a escrita nunca espera pelo leitor
+    e frames não consumidos são simplesmente substituídos.
+    """
+
+    def __init__(self, shape: Tuple[int, int, int], slots: int = 3,
+                 name: Optional[str] = None, create: bool = True, state=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.frame_size = int(np.prod(self.shape))
+        self.owner = create
+
+        if create:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.frame_size * slots)
+            self.state = state or {
+                'lock': mp.Lock(),
+                'event': mp.Event(),
+                'latest': mp.Value('i', -1, lock=False),
+                'busy': mp.Value('i', -1, lock=False),
+                'seq': mp.Array('q', slots, lock=False),
+            }
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.state = state
+
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def attach_args(self) -> tuple:
+        return (self.shape, self.slots, self.shm.name, self.state)
+
+    @classmethod
+    def attach(cls, shape, slots, name, state) -> 'SharedFrameRing':
+        return cls(shape, slots, name=name, create=False, state=state)
+
+    def publish(self, frame: np.ndarray, seq: int) -> bool:
+        """Copia o frame para um slot livre e o marca como o mais recente. Retorna True se um frame não consumido foi descartado."""
+        lock = self.state['lock']
+        latest = self.state['latest']
+        busy = self.state['busy']
+
+        with lock:
+            slot = next(i for i in range(self.slots) if i != latest.value and i != busy.value)
+
+        np.copyto(self.frames[slot], frame)
+
+        with lock:
+            dropped = latest.value >= 0
+            self.state['seq'][slot] = seq
+            latest.value = slot
+
+        self.state['event'].set()
+        return dropped
+
+    def acquire_latest(self, timeout: float = 0.1) -> Optional[Tuple[int, int, np.ndarray]]:
+        event = self.state['event']
+        if not event.wait(timeout):
+            return None
+        event.clear()
+
+        with self.state['lock']:
+            slot = self.state['latest'].value
+            if slot < 0:
+                return None
+            self.state['busy'].value = slot
+            self.state['latest'].value = -1
+            seq = self.state['seq'][slot]
+
+        return slot, seq, self.frames[slot]
+
+    def release(self, slot: int) -> None:
+        with self.state['lock']:
+            if self.state['busy'].value == slot:
+                self.state['busy'].value = -1
+
+    def close(self) -> None:
+        self.frames = None
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,290 @@
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ...domain.entities.posture_aggregate import AngleSummary, PostureAggregate
+from ...domain.entities.posture_data import PostureData
+from ...domain.entities.posture_calibration import PostureCalibration
+from ...domain.entities.posture_columns import PostureColumns
+from ...domain.entities.statistics import PostureStatistics
+from ...domain.repositories.posture_repository import PostureRepository
+from .sqlite_posture_repository import aggregate_tier, from_epoch_ms, to_epoch_ms
+
+QUARTER_HOUR_MS = 15 * 60 * 1000
+
+
+def local_day_ordinals(timestamps: np.ndarray) -> np.ndarray:
+    """Dia local (date.toordinal) de cada timestamp em milissegundos.
+
+    Os fusos horários usam deslocamentos múltiplos de 15 minutos, então basta converter cada
+    quarto de hora distinto uma única vez.
+    """
+    quarters, inverse = np.unique(timestamps // QUARTER_HOUR_MS, return_inverse=True)
+    ordinals = np.array([datetime.fromtimestamp(quarter * QUARTER_HOUR_MS / 1000).toordinal() for quarter in quarters.tolist()],
+                        dtype=np.int64)
+    return ordinals[inverse]
+
+
+def local_midnight_ms(ordinals: np.ndarray) -> np.ndarray:
+    days, inverse = np.unique(ordinals, return_inverse=True)
+    midnights = np.array([to_epoch_ms(datetime.fromordinal(day)) for day in days.tolist()], dtype=np.int64)
+    return midnights[inverse]
+
+
+class InMemoryPostureRepository(PostureRepository):
+    """Repositório mantido em memória, em arrays numpy ordenados por timestamp.
+
+    Útil em testes, demonstrações e como referência nos benchmarks. Os registros gravados ficam
+    pendentes até a próxima leitura, quando são ordenados e incorporados às colunas de uma vez,
+    e as contagens das estatísticas são atualizadas no mesmo passo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns = PostureColumns.create_empty()
+        self._camera_codes: Dict[str, int] = {}
+        self._pending: List[tuple] = []
+        self._next_id = 1
+        self._daily_counts = Counter()
+        self._camera_counts = Counter()
+        self._last_timestamps: Dict[str, int] = {}
+        self._settings: Dict[str, str] = {}
+        self._calibrations: Dict[str, PostureCalibration] = {}
+
+    def close(self) -> None:
+        pass
+
+    def _row(self, posture_data: PostureData) -> tuple:
+        code = self._camera_codes.setdefault(posture_data.camera_type, len(self._camera_codes))
+        row = (self._next_id,
+               to_epoch_ms(posture_data.timestamp),
+               np.nan if posture_data.shoulder_angle is None else posture_data.shoulder_angle,
+               np.nan if posture_data.neck_angle is None else posture_data.neck_angle,
+               code,
+               bool(posture_data.is_poor_posture))
+        self._next_id += 1
+        return row
+
+    def save_posture_data(self, posture_data: PostureData) -> None:
+        with self._lock:
+            self._pending.append(self._row(posture_data))
+
+    def save_posture_data_batch(self, posture_data: List[PostureData]) -> None:
+        with self._lock:
+            self._pending.extend(self._row(item) for item in posture_data)
+
+    def _snapshot(self) -> PostureColumns:
+        """Incorpora os registros pendentes e devolve as colunas atuais (arrays nunca alterados depois de publicados)"""
+        with self._lock:
+            if not self._pending:
+                return self._columns
+
+            ids, timestamps, shoulder, neck, codes, poor = zip(*self._pending)
+            self._pending = []
+            new = PostureColumns(
+                ids=np.array(ids, dtype=np.int64),
+                timestamps=np.array(timestamps, dtype=np.int64),
+                shoulder_angles=np.array(shoulder, dtype=np.float64),
+                neck_angles=np.array(neck, dtype=np.float64),
+                camera_codes=np.array(codes, dtype=np.int16),
+                is_poor_posture=np.array(poor, dtype=bool)
+            )
+            self._update_counts(new)
+
+            camera_types = list(self._camera_codes)
+            columns = PostureColumns.concatenate([self._columns, new], camera_types)
+            timestamps = columns.timestamps
+            if np.any(timestamps[1:] < timestamps[:-1]):
+                order = np.argsort(timestamps, kind='stable')
+                columns = PostureColumns(
+                    ids=columns.ids[order],
+                    timestamps=timestamps[order],
+                    shoulder_angles=columns.shoulder_angles[order],
+                    neck_angles=columns.neck_angles[order],
+                    camera_codes=columns.camera_codes[order],
+                    is_poor_posture=columns.is_poor_posture[order],
+                    camera_types=camera_types
+                )
+            self._columns = columns
+            return columns
+
+    def _update_counts(self, new: PostureColumns) -> None:
+        days, day_counts = np.unique(local_day_ordinals(new.timestamps), return_counts=True)
+        self._daily_counts.update(dict(zip(days.tolist(), day_counts.tolist())))
+
+        camera_types = list(self._camera_codes)
+        for code in np.unique(new.camera_codes).tolist():
+            selected = new.timestamps[new.camera_codes == code]
+            camera_type = camera_types[code]
+            self._camera_counts[camera_type] += len(selected)
+            self._last_timestamps[camera_type] = max(self._last_timestamps.get(camera_type, int(selected[0])), int(selected.max()))
+
+    def _range(self, columns: PostureColumns, start_ms: int, end_ms: int) -> slice:
+        return slice(int(np.searchsorted(columns.timestamps, start_ms, side='left')),
+                     int(np.searchsorted(columns.timestamps, end_ms, side='right')))
+
+    def get_posture_data_by_date_range(self, start_date: datetime, end_date: datetime) -> List[PostureData]:
+        return list(self.iter_posture_data_by_date_range(start_date, end_date))
+
+    def iter_posture_data_by_date_range(self, start_date: datetime, end_date: datetime,
+                                        chunk_size: int = 5000) -> Iterator[PostureData]:
+        columns = self._snapshot()
+        selected = self._range(columns, to_epoch_ms(start_date), to_epoch_ms(end_date))
+        camera_types = columns.camera_types
+        for start in range(selected.start, selected.stop, chunk_size):
+            chunk = slice(start, min(start + chunk_size, selected.stop))
+            for row_id, timestamp, shoulder, neck, code, poor in zip(
+                    columns.ids[chunk].tolist(), columns.timestamps[chunk].tolist(),
+                    columns.shoulder_angles[chunk].tolist(), columns.neck_angles[chunk].tolist(),
+                    columns.camera_codes[chunk].tolist(), columns.is_poor_posture[chunk].tolist()):
+                yield PostureData(
+                    id=row_id,
+                    timestamp=from_epoch_ms(timestamp),
+                    shoulder_angle=None if shoulder != shoulder else shoulder,
+                    neck_angle=None if neck != neck else neck,
+                    camera_type=camera_types[code],
+                    is_poor_posture=poor
+                )
+
+    def iter_posture_columns(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                             camera_type: Optional[str] = None, chunk_size: int = 65536) -> Iterator[PostureColumns]:
+        columns = self._snapshot()
+        selected = self._range(columns,
+                               to_epoch_ms(start_date) if start_date else np.iinfo(np.int64).min,
+                               to_epoch_ms(end_date) if end_date else np.iinfo(np.int64).max)
+        code = columns.camera_types.index(camera_type) if camera_type in columns.camera_types else -1
+
+        for start in range(selected.start, selected.stop, chunk_size):
+            chunk = slice(start, min(start + chunk_size, selected.stop))
+            if camera_type is None:
+                yield PostureColumns(
+                    ids=columns.ids[chunk],
+                    timestamps=columns.timestamps[chunk],
+                    shoulder_angles=columns.shoulder_angles[chunk],
+                    neck_angles=columns.neck_angles[chunk],
+                    camera_codes=columns.camera_codes[chunk],
+                    is_poor_posture=columns.is_poor_posture[chunk],
+                    camera_types=list(columns.camera_types)
+                )
+                continue
+
+            mask = columns.camera_codes[chunk] == code
+            if mask.any():
+                yield PostureColumns(
+                    ids=columns.ids[chunk][mask],
+                    timestamps=columns.timestamps[chunk][mask],
+                    shoulder_angles=columns.shoulder_angles[chunk][mask],
+                    neck_angles=columns.neck_angles[chunk][mask],
+                    camera_codes=np.zeros(int(mask.sum()), dtype=np.int16),
+                    is_poor_posture=columns.is_poor_posture[chunk][mask],
+                    camera_types=[camera_type]
+                )
+
+    def get_angle_aggregates(self, start_date: datetime, end_date: datetime, resolution_seconds: int,
+                             camera_type: Optional[str] = None) -> List[PostureAggregate]:
+        """Mesmos baldes de SQLitePostureRepository.get_angle_aggregates, calculados sobre os registros brutos"""
+        columns = self._snapshot()
+        start_ms, end_ms = to_epoch_ms(start_date), to_epoch_ms(end_date)
+        tier, seconds = aggregate_tier(start_ms, resolution_seconds)
+        resolution_ms = max(resolution_seconds, seconds) * 1000
+
+        timestamps = columns.timestamps
+        if tier == 'day':
+            bucket_starts = local_midnight_ms(local_day_ordinals(timestamps))
+        else:
+            bucket_starts = timestamps // (seconds * 1000) * (seconds * 1000)
+        mask = (bucket_starts >= start_ms) & (bucket_starts < end_ms)
+        if camera_type is not None:
+            if camera_type not in columns.camera_types:
+                return []
+            mask &= columns.camera_codes == columns.camera_types.index(camera_type)
+        if not mask.any():
+            return []
+
+        buckets = (bucket_starts[mask] - start_ms + seconds * 500) // resolution_ms
+        codes = columns.camera_codes[mask].astype(np.int64)
+        name_ranks = np.argsort(np.argsort(np.array(columns.camera_types)))
+        order = np.lexsort((name_ranks[codes], buckets))
+        buckets, codes = buckets[order], codes[order]
+        boundaries = np.flatnonzero((np.diff(buckets) != 0) | (np.diff(codes) != 0)) + 1
+        starts = np.concatenate(([0], boundaries))
+
+        samples = np.diff(np.append(starts, len(buckets)))
+        poor = np.add.reduceat(columns.is_poor_posture[mask][order].astype(np.int64), starts)
+        summaries = [self._angle_summaries(values[mask][order], starts)
+                     for values in (columns.shoulder_angles, columns.neck_angles)]
+
+        return [PostureAggregate(
+            bucket_start=from_epoch_ms(start_ms + int(buckets[first]) * resolution_ms),
+            camera_type=columns.camera_types[codes[first]],
+            samples=int(samples[index]),
+            poor_samples=int(poor[index]),
+            shoulder=summaries[0][index],
+            neck=summaries[1][index]
+        ) for index, first in enumerate(starts.tolist())]
+
+    @staticmethod
+    def _angle_summaries(values: np.ndarray, starts: np.ndarray) -> List[AngleSummary]:
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        counts = np.add.reduceat(present.astype(np.int64), starts)
+        totals = np.add.reduceat(filled, starts)
+        squares = np.add.reduceat(filled * filled, starts)
+        minimums = np.fmin.reduceat(values, starts)
+        maximums = np.fmax.reduceat(values, starts)
+        return [AngleSummary(
+            count=count,
+            total=total,
+            total_squares=square,
+            minimum=minimum if count else None,
+            maximum=maximum if count else None
+        ) for count, total, square, minimum, maximum in zip(
+            counts.tolist(), totals.tolist(), squares.tolist(), minimums.tolist(), maximums.tolist())]
+
+    def get_statistics(self) -> PostureStatistics:
+        self._snapshot()
+        with self._lock:
+            if not self._camera_counts:
+                return PostureStatistics.create_empty()
+            daily_counts = dict(self._daily_counts)
+            camera_distribution = dict(self._camera_counts.most_common())
+            last_timestamp = max(self._last_timestamps.values())
+
+        today = datetime.now().date()
+        week_ago = (today - timedelta(days=6)).toordinal()
+        weekly_trend = Counter()
+        for day, occurrences in daily_counts.items():
+            year, week, _ = date.fromordinal(day).isocalendar()
+            weekly_trend[f"{year}-W{week:02d}"] += occurrences
+        daily_occurrences = {date.fromordinal(day).isoformat(): daily_counts[day]
+                             for day in sorted(daily_counts) if day >= week_ago}
+
+        return PostureStatistics(
+            total_occurrences=sum(camera_distribution.values()),
+            today_occurrences=daily_counts.get(today.toordinal(), 0),
+            frontal_camera_count=camera_distribution.get('frontal', 0),
+            lateral_camera_count=camera_distribution.get('lateral', 0),
+            last_occurrence=from_epoch_ms(last_timestamp),
+            daily_occurrences=daily_occurrences,
+            camera_distribution=camera_distribution,
+            weekly_trend=dict(sorted(weekly_trend.items()))
+        )
+
+    def get_data_version(self) -> int:
+        with self._lock:
+            return self._next_id - 1
+
+    def save_calibration(self, calibration: PostureCalibration) -> None:
+        self._calibrations[calibration.camera_type] = calibration
+
+    def get_calibration(self, camera_type: str) -> Optional[PostureCalibration]:
+        return self._calibrations.get(camera_type)
+
+    def save_setting(self, key: str, value: str) -> None:
+        self._settings[key] = value
+
+    def get_setting(self, key: str, default: str = "") -> str:
+        return self._settings.get(key, default)
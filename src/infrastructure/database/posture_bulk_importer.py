@@ -0,0 +1,92 @@
+import csv
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+from .sqlite_posture_repository import SQLitePostureRepository, converted_records_insert_sql, records_select
+
+MAX_ATTACHED_SOURCES = 8
+CSV_COLUMNS = ('timestamp', 'shoulder_angle', 'neck_angle', 'camera_type', 'is_poor_posture')
+CSV_ALIASES = {
+    'camera': 'camera_type',
+    'angulo_ombro': 'shoulder_angle',
+    'angulo_pescoco': 'neck_angle',
+}
+TRUE_VALUES = "('1', 'true', 'sim', 'yes')"
+
+
+def is_sqlite_file(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(16) == b'SQLite format 3\x00'
+
+
+class PostureBulkImporter:
+    """Importa registros de CSV, de bancos antigos do Cervicalia e de posture_data.db de outras estações"""
+
+    def __init__(self, repository: SQLitePostureRepository, default_camera_type: str = 'frontal'):
+        self.repository = repository
+        self.default_camera_type = default_camera_type
+
+    def import_files(self, paths: Iterable[str]) -> Dict[str, int]:
+        """Importa os arquivos em transações grandes, com índices e agregações adiados; retorna registros por arquivo"""
+        own_path = os.path.abspath(self.repository.db_path)
+        paths = [path for path in paths if os.path.abspath(path) != own_path]
+        databases = [path for path in paths if is_sqlite_file(path)]
+        csv_files = [path for path in paths if path not in databases]
+        groups = [databases[i:i + MAX_ATTACHED_SOURCES] for i in range(0, len(databases), MAX_ATTACHED_SOURCES)] or [[]]
+
+        imported = {}
+        for index, group in enumerate(groups):
+            imported.update(self._import_group(group, csv_files if index == 0 else []))
+        return imported
+
+    def _import_group(self, databases: List[str], csv_files: List[str]) -> Dict[str, int]:
+        aliases = {path: f"source_{number}" for number, path in enumerate(databases)}
+        attach = {alias: os.path.abspath(path) for path, alias in aliases.items()}
+
+        imported = {}
+        with self.repository.bulk_transaction(attach) as conn:
+            for path, alias in aliases.items():
+                imported[path] = self._import_attached(conn, alias)
+            for path in csv_files:
+                imported[path] = self._import_csv(conn, path)
+        return imported
+
+    def _import_attached(self, conn: sqlite3.Connection, alias: str) -> int:
+        columns = {row[1] for row in conn.execute(f"PRAGMA {alias}.table_info(posture_records)")}
+        select = records_select(columns, f"{alias}.posture_records")
+        if select is None:
+            print(f"Banco {alias} sem tabela posture_records reconhecível; ignorado")
+            return 0
+        return self._insert_converted(conn, select)
+
+    def _import_csv(self, conn: sqlite3.Connection, path: str) -> int:
+        conn.execute("DROP TABLE IF EXISTS temp.posture_import")
+        conn.execute("CREATE TEMP TABLE posture_import (timestamp, shoulder_angle, neck_angle, camera_type, is_poor_posture)")
+
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = [name.strip().lower().replace(' ', '_') for name in next(reader, [])]
+            header = [CSV_ALIASES.get(name, name) for name in header]
+            if 'timestamp' not in header or 'neck_angle' not in header:
+                print(f"{path}: cabeçalho sem as colunas timestamp e neck_angle; ignorado")
+                return 0
+
+            positions = [header.index(column) if column in header else None for column in CSV_COLUMNS]
+            rows = (tuple(row[i] if i is not None and i < len(row) else None for i in positions)
+                    for row in reader if row)
+            conn.executemany("INSERT INTO temp.posture_import VALUES (?, ?, ?, ?, ?)", rows)
+
+        count = self._insert_converted(conn, f'''SELECT rowid AS src_rowid, timestamp AS src_timestamp,
+                                                        CAST(NULLIF(shoulder_angle, '') AS REAL) AS src_shoulder,
+                                                        CAST(NULLIF(neck_angle, '') AS REAL) AS src_neck,
+                                                        COALESCE(NULLIF(camera_type, ''), ?) AS src_camera,
+                                                        lower(COALESCE(is_poor_posture, '')) IN {TRUE_VALUES} AS src_poor
+                                                 FROM temp.posture_import''', (self.default_camera_type,))
+        conn.execute("DROP TABLE temp.posture_import")
+        return count
+
+    def _insert_converted(self, conn: sqlite3.Connection, select: str, params: Optional[tuple] = None) -> int:
+        before = conn.total_changes
+        conn.execute(converted_records_insert_sql('posture_records', select), params or ())
+        return conn.total_changes - before
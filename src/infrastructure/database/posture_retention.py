@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from threading import Thread
+from typing import List, Optional
+
+from .sqlite_posture_repository import (
+    PARTITION_INDEXES,
+    POSTURE_RECORDS_DDL,
+    RAW_WATERMARK_SETTING,
+    UPSERT_SETTING_SQL,
+    SQLitePostureRepository,
+    from_epoch_ms,
+    to_epoch_ms,
+)
+
+
+def month_start(value: datetime, months_back: int = 0) -> datetime:
+    index = value.year * 12 + value.month - 1 - months_back
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+@dataclass
+class RetentionReport:
+    archived: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+    freed_pages: int = 0
+
+
+class PostureRetention:
+    """Particiona posture_records por mês e descarta registros brutos antigos.
+
+    Meses completos mais antigos que `hot_months` saem de posture_records para tabelas
+    posture_records_AAAAMM. Partições mais antigas que `raw_months` são removidas junto com os
+    agregados por minuto do período; os agregados por hora e dia e as contagens das estatísticas
+    continuam disponíveis. `raw_months` igual a 0 mantém os registros brutos indefinidamente.
+
+    O aplicativo e o daemon aplicam a política automaticamente uma vez por dia (`run_daily`).
+    """
+    _daily_thread: Optional[Thread] = None
+
+    def __init__(self, repository: SQLitePostureRepository, hot_months: int = 3, raw_months: int = 12):
+        self.repository = repository
+        self.hot_months = max(hot_months, 1)
+        self.raw_months = max(raw_months, self.hot_months) if raw_months > 0 else 0
+
+    @classmethod
+    def from_settings(cls, repository: SQLitePostureRepository) -> 'PostureRetention':
+        return cls(
+            repository,
+            hot_months=int(repository.get_setting("retention_hot_months", "3")),
+            raw_months=int(repository.get_setting("retention_raw_months", "12"))
+        )
+
+    @classmethod
+    def run_daily(cls, repository: SQLitePostureRepository) -> Optional[Thread]:
+        """Aplica a retenção em segundo plano se ainda não foi aplicada hoje e `retention_auto` não for 0"""
+        if repository.get_setting("retention_auto", "1") == "0":
+            return None
+        if cls._daily_thread is not None and cls._daily_thread.is_alive():
+            return None
+        retention = cls.from_settings(repository)
+        if not retention.is_due():
+            return None
+        cls._daily_thread = Thread(target=retention.apply_if_due, name='retention', daemon=True)
+        cls._daily_thread.start()
+        return cls._daily_thread
+
+    def is_due(self, now: Optional[datetime] = None) -> bool:
+        today = (now or datetime.now()).date().isoformat()
+        return self.repository.get_setting("retention_last_run", "") != today
+
+    def apply_if_due(self, now: Optional[datetime] = None) -> Optional[RetentionReport]:
+        """Aplica a retenção no máximo uma vez por dia; a data da última execução fica em app_settings"""
+        now = now or datetime.now()
+        if not self.is_due(now):
+            return None
+        try:
+            report = self.apply(now)
+        except Exception as e:
+            print(f"Erro ao aplicar a retenção de registros: {e}")
+            return None
+        self.repository.save_setting("retention_last_run", now.date().isoformat())
+        if report.archived or report.dropped:
+            print(f"Retenção aplicada: {len(report.archived)} meses particionados, {len(report.dropped)} partições descartadas")
+        return report
+
+    def apply(self, now: Optional[datetime] = None, vacuum: bool = True) -> RetentionReport:
+        now = now or datetime.now()
+        report = RetentionReport()
+        self.archive(to_epoch_ms(month_start(now, self.hot_months)), report)
+        if self.raw_months:
+            self.expire(to_epoch_ms(month_start(now, self.raw_months)), report)
+        if vacuum:
+            report.freed_pages = self.repository.compact()
+        return report
+
+    def archive(self, cutoff_ms: int, report: RetentionReport) -> None:
+        """Move os meses anteriores a cutoff_ms de posture_records para as partições mensais"""
+        while True:
+            with self.repository.transaction() as conn:
+                oldest = conn.execute("SELECT MIN(timestamp) FROM posture_records WHERE timestamp < ?", (cutoff_ms,)).fetchone()[0]
+                if oldest is None:
+                    return
+
+                start = month_start(from_epoch_ms(oldest))
+                start_ms = to_epoch_ms(start)
+                end_ms = min(to_epoch_ms(month_start(start, -1)), cutoff_ms)
+                table = f"posture_records_{start.year:04d}{start.month:02d}"
+
+                conn.execute(POSTURE_RECORDS_DDL.format(table=table))
+                for statement in PARTITION_INDEXES:
+                    conn.execute(statement.format(table=table))
+                conn.execute("INSERT OR IGNORE INTO posture_partitions (name, start_ms, end_ms) VALUES (?, ?, ?)",
+                             (table, start_ms, to_epoch_ms(month_start(start, -1))))
+                conn.execute(f"INSERT INTO {table} SELECT * FROM posture_records WHERE timestamp >= ? AND timestamp < ?",
+                             (start_ms, end_ms))
+                conn.execute("DELETE FROM posture_records WHERE timestamp >= ? AND timestamp < ?", (start_ms, end_ms))
+            report.archived.append(table)
+
+    def expire(self, cutoff_ms: int, report: RetentionReport) -> None:
+        """Remove as partições que terminam antes de cutoff_ms e os agregados por minuto do período.
+
+        O fim da última partição removida fica registrado como marca da retenção, para que
+        recálculos posteriores não apaguem os agregados por hora e dia do período descartado.
+        """
+        with self.repository.transaction() as conn:
+            expired = conn.execute("SELECT name, end_ms FROM posture_partitions WHERE end_ms <= ? ORDER BY start_ms",
+                                   (cutoff_ms,)).fetchall()
+            for table, end_ms in expired:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute("DELETE FROM posture_partitions WHERE name = ?", (table,))
+                conn.execute("DELETE FROM posture_angles_minute WHERE bucket_start < ?", (end_ms,))
+                report.dropped.append(table)
+            if expired:
+                watermark = max(self.repository.raw_watermark(conn), max(end_ms for _, end_ms in expired))
+                conn.execute(UPSERT_SETTING_SQL, (RAW_WATERMARK_SETTING, str(watermark)))
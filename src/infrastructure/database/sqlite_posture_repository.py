@@ -1,208 +1,744 @@
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Optional
-import pandas as pd
+from typing import Dict, Iterator, List, Optional
 
+import numpy as np
+
+from ...domain.entities.posture_aggregate import AngleSummary, PostureAggregate
 from ...domain.entities.posture_data import PostureData
 from ...domain.entities.posture_calibration import PostureCalibration
+from ...domain.entities.posture_columns import PostureColumns
 from ...domain.entities.statistics import PostureStatistics
 from ...domain.repositories.posture_repository import PostureRepository
 
-class SQLitePostureRepository(PostureRepository):
-    def __init__(self, db_path: str = 'posture_data.db'):
-        self.db_path = db_path
-        self._init_db()
-        self._migrate_database()
+INSERT_POSTURE_SQL = "INSERT INTO posture_records (timestamp, shoulder_angle, neck_angle, camera_type, is_poor_posture) VALUES (?, ?, ?, ?, ?)"
+SELECT_RANGE_SQL = "SELECT id, timestamp, shoulder_angle, neck_angle, camera_type, is_poor_posture FROM {table} WHERE timestamp BETWEEN ? AND ?"
+UPSERT_CALIBRATION_SQL = "INSERT OR REPLACE INTO calibration (camera_type, shoulder_angle_min, shoulder_angle_max, neck_angle_min, neck_angle_max, margin) VALUES (?, ?, ?, ?, ?, ?)"
+SELECT_CALIBRATIONS_SQL = "SELECT camera_type, shoulder_angle_min, shoulder_angle_max, neck_angle_min, neck_angle_max, margin FROM calibration"
+UPSERT_SETTING_SQL = "INSERT OR REPLACE INTO app_settings (key, value) VALUES (?, ?)"
+SELECT_SETTINGS_SQL = "SELECT key, value FROM app_settings"
 
-    def _init_db(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS posture_records
+MIN_EPOCH_MS = -(2 ** 62)
+MAX_EPOCH_MS = 2 ** 62
+
+# Fim do último período cujos registros brutos (e agregados por minuto) a retenção descartou
+RAW_WATERMARK_SETTING = 'retention_raw_watermark_ms'
+
+SCHEMA_VERSION = 5
+MIGRATIONS = (
+    (1, '_migrate_base_schema'),
+    (2, '_create_statistics_rollups'),
+    (3, '_create_angle_aggregates'),
+    (4, '_create_partition_registry'),
+    (5, '_create_partition_camera_indexes'),
+)
+
+POSTURE_RECORDS_DDL = '''CREATE TABLE IF NOT EXISTS {table}
                      (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      timestamp TEXT NOT NULL,
+                      timestamp INTEGER NOT NULL,
                       shoulder_angle REAL,
-                      neck_angle REAL NOT NULL,
+                      neck_angle REAL,
                       camera_type TEXT NOT NULL,
-                      is_poor_posture INTEGER DEFAULT 0)''')
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS app_settings
+                      is_poor_posture INTEGER DEFAULT 0)'''
+
+TEXT_TO_EPOCH_MS_SQL = ("CASE WHEN typeof({column}) = 'integer' THEN {column} "
+                        "WHEN {column} GLOB '[0-9]*' AND {column} NOT GLOB '*[^0-9]*' THEN CAST({column} AS INTEGER) "
+                        "ELSE CAST(strftime('%s', {column}, 'utc') AS INTEGER) * 1000 END")
+
+SETTINGS_DDL = '''CREATE TABLE IF NOT EXISTS app_settings
                      (key TEXT PRIMARY KEY,
-                      value TEXT NOT NULL)''')
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS calibration
+                      value TEXT NOT NULL)'''
+
+CALIBRATION_DDL = '''CREATE TABLE IF NOT EXISTS calibration
                      (camera_type TEXT PRIMARY KEY,
                       shoulder_angle_min REAL,
                       shoulder_angle_max REAL,
                       neck_angle_min REAL,
                       neck_angle_max REAL,
-                      margin REAL)''')
-        
-        conn.commit()
-        conn.close()
+                      margin REAL)'''
 
-    def _migrate_database(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
+MIGRATION_CHUNK_SIZE = 50000
+
+PARTITIONS_DDL = '''CREATE TABLE IF NOT EXISTS posture_partitions
+                     (name TEXT PRIMARY KEY,
+                      start_ms INTEGER NOT NULL,
+                      end_ms INTEGER NOT NULL)'''
+PARTITION_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_{table}_timestamp ON {table} (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_{table}_camera_timestamp ON {table} (camera_type, timestamp)",
+)
+
+AGGREGATE_TRIGGERS = ('trg_posture_records_rollups', 'trg_posture_records_angles')
+POSTURE_RECORDS_INDEX_NAMES = ('idx_posture_records_timestamp', 'idx_posture_records_camera_timestamp')
+POSTURE_RECORDS_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_posture_records_timestamp ON posture_records (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_posture_records_camera_timestamp ON posture_records (camera_type, timestamp)",
+)
+
+LOCAL_DAY_SQL = "date({ms} / 1000, 'unixepoch', 'localtime')"
+ISO_THURSDAY_SQL = "date({day}, '-' || ((CAST(strftime('%w', {day}) AS INTEGER) + 6) % 7) || ' days', '+3 days')"
+ISO_WEEK_SQL = "strftime('%Y', thursday) || '-W' || printf('%02d', (CAST(strftime('%j', thursday) AS INTEGER) - 1) / 7 + 1)"
+
+STATISTICS_ROLLUPS_DDL = (
+    '''CREATE TABLE IF NOT EXISTS posture_daily_counts
+       (day TEXT NOT NULL,
+        camera_type TEXT NOT NULL,
+        occurrences INTEGER NOT NULL,
+        PRIMARY KEY (day, camera_type)) WITHOUT ROWID''',
+    '''CREATE TABLE IF NOT EXISTS posture_weekly_counts
+       (year_week TEXT PRIMARY KEY,
+        occurrences INTEGER NOT NULL) WITHOUT ROWID''',
+    '''CREATE TABLE IF NOT EXISTS posture_camera_counts
+       (camera_type TEXT PRIMARY KEY,
+        occurrences INTEGER NOT NULL,
+        last_timestamp INTEGER NOT NULL) WITHOUT ROWID''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_posture_records_rollups AFTER INSERT ON posture_records
+        BEGIN
+            INSERT INTO posture_daily_counts (day, camera_type, occurrences)
+                VALUES ({LOCAL_DAY_SQL.format(ms='NEW.timestamp')}, NEW.camera_type, 1)
+                ON CONFLICT (day, camera_type) DO UPDATE SET occurrences = occurrences + 1;
+            INSERT INTO posture_weekly_counts (year_week, occurrences)
+                SELECT {ISO_WEEK_SQL}, 1
+                FROM (SELECT {ISO_THURSDAY_SQL.format(day=LOCAL_DAY_SQL.format(ms='NEW.timestamp'))} AS thursday) WHERE 1
+                ON CONFLICT (year_week) DO UPDATE SET occurrences = occurrences + 1;
+            INSERT INTO posture_camera_counts (camera_type, occurrences, last_timestamp)
+                VALUES (NEW.camera_type, 1, NEW.timestamp)
+                ON CONFLICT (camera_type) DO UPDATE SET occurrences = occurrences + 1,
+                                                        last_timestamp = MAX(last_timestamp, excluded.last_timestamp);
+        END''',
+)
+
+AGGREGATE_TIERS = (('day', 86400), ('hour', 3600), ('minute', 60))
+AGGREGATE_ANGLES = ('shoulder', 'neck')
+
+
+def _bucket_sql(tier: str, seconds: int, ms: str) -> str:
+    if tier == 'day':
+        return f"CAST(strftime('%s', {LOCAL_DAY_SQL.format(ms=ms)}, 'utc') AS INTEGER) * 1000"
+    return f"({ms} / {seconds * 1000}) * {seconds * 1000}"
+
+
+def _angle_aggregates_ddl() -> tuple:
+    angle_columns = ", ".join(
+        f"{angle}_count INTEGER NOT NULL, {angle}_sum REAL NOT NULL, {angle}_sumsq REAL NOT NULL, {angle}_min REAL, {angle}_max REAL"
+        for angle in AGGREGATE_ANGLES)
+    insert_columns = ", ".join(f"{angle}_count, {angle}_sum, {angle}_sumsq, {angle}_min, {angle}_max" for angle in AGGREGATE_ANGLES)
+    new_values = ", ".join(
+        f"NEW.{angle}_angle IS NOT NULL, COALESCE(NEW.{angle}_angle, 0), COALESCE(NEW.{angle}_angle * NEW.{angle}_angle, 0), "
+        f"NEW.{angle}_angle, NEW.{angle}_angle"
+        for angle in AGGREGATE_ANGLES)
+    updates = ", ".join(
+        f"{angle}_count = {angle}_count + excluded.{angle}_count, "
+        f"{angle}_sum = {angle}_sum + excluded.{angle}_sum, "
+        f"{angle}_sumsq = {angle}_sumsq + excluded.{angle}_sumsq, "
+        f"{angle}_min = MIN(COALESCE({angle}_min, excluded.{angle}_min), COALESCE(excluded.{angle}_min, {angle}_min)), "
+        f"{angle}_max = MAX(COALESCE({angle}_max, excluded.{angle}_max), COALESCE(excluded.{angle}_max, {angle}_max))"
+        for angle in AGGREGATE_ANGLES)
+
+    statements = []
+    trigger_body = []
+    for tier, seconds in AGGREGATE_TIERS:
+        statements.append(f'''CREATE TABLE IF NOT EXISTS posture_angles_{tier}
+           (bucket_start INTEGER NOT NULL,
+            camera_type TEXT NOT NULL,
+            samples INTEGER NOT NULL,
+            poor_samples INTEGER NOT NULL,
+            {angle_columns},
+            PRIMARY KEY (bucket_start, camera_type)) WITHOUT ROWID''')
+        trigger_body.append(
+            f"INSERT INTO posture_angles_{tier} (bucket_start, camera_type, samples, poor_samples, {insert_columns}) "
+            f"VALUES ({_bucket_sql(tier, seconds, 'NEW.timestamp')}, NEW.camera_type, 1, COALESCE(NEW.is_poor_posture, 0) != 0, {new_values}) "
+            f"ON CONFLICT (bucket_start, camera_type) DO UPDATE SET samples = samples + 1, "
+            f"poor_samples = poor_samples + excluded.poor_samples, {updates};")
+    statements.append("CREATE TRIGGER IF NOT EXISTS trg_posture_records_angles AFTER INSERT ON posture_records BEGIN\n"
+                      + "\n".join(trigger_body) + "\nEND")
+    return tuple(statements)
+
+
+def _angle_aggregates_rebuild_sql(tier: str, seconds: int, tables: List[str]) -> str:
+    """O nível de minuto é recalculado a partir dos registros em `tables`; hora e dia a partir do nível de minuto.
+
+    Apenas os baldes entre os parâmetros `since` e `until` (alinhados aos baldes do nível) são recalculados.
+    """
+    if tier == 'minute':
+        angle_values = ", ".join(
+            f"COUNT({angle}_angle), TOTAL({angle}_angle), TOTAL({angle}_angle * {angle}_angle), MIN({angle}_angle), MAX({angle}_angle)"
+            for angle in AGGREGATE_ANGLES)
+        records = " UNION ALL ".join(
+            f"SELECT timestamp, shoulder_angle, neck_angle, camera_type, is_poor_posture FROM {table}" for table in tables)
+        return (f"INSERT INTO posture_angles_{tier} "
+                f"SELECT {_bucket_sql(tier, seconds, 'timestamp')} AS bucket, camera_type, COUNT(*), "
+                f"SUM(COALESCE(is_poor_posture, 0) != 0), {angle_values} "
+                f"FROM ({records}) WHERE timestamp >= :since AND timestamp < :until GROUP BY bucket, camera_type")
+
+    angle_values = ", ".join(
+        f"SUM({angle}_count), SUM({angle}_sum), SUM({angle}_sumsq), MIN({angle}_min), MAX({angle}_max)"
+        for angle in AGGREGATE_ANGLES)
+    return (f"INSERT INTO posture_angles_{tier} "
+            f"SELECT {_bucket_sql(tier, seconds, 'bucket_start')} AS bucket, camera_type, SUM(samples), SUM(poor_samples), "
+            f"{angle_values} FROM posture_angles_minute WHERE bucket_start >= :since AND bucket_start < :until "
+            f"GROUP BY bucket, camera_type")
+
+
+ANGLE_AGGREGATES_DDL = _angle_aggregates_ddl()
+
+
+def records_select(columns: set, table: str) -> Optional[str]:
+    """SELECT com colunas src_* para uma posture_records em qualquer esquema conhecido.
+
+    Aceita o esquema atual, o de timestamps TEXT e o legado (camera, angulo_ombro, angulo_pescoco).
+    """
+    if 'camera_type' in columns:
+        return ("SELECT rowid AS src_rowid, timestamp AS src_timestamp, shoulder_angle AS src_shoulder, "
+                "neck_angle AS src_neck, camera_type AS src_camera, COALESCE(is_poor_posture, 0) AS src_poor "
+                f"FROM {table}")
+    if 'camera' in columns:
+        return ("SELECT rowid AS src_rowid, timestamp AS src_timestamp, angulo_ombro AS src_shoulder, "
+                "angulo_pescoco AS src_neck, camera AS src_camera, "
+                "angulo_ombro IS NOT NULL OR angulo_pescoco IS NOT NULL AS src_poor "
+                f"FROM {table}")
+    return None
+
+
+def converted_records_insert_sql(target: str, select: str, keep_ids: bool = False) -> str:
+    """INSERT em `target` das linhas de `select` (colunas src_*), convertendo timestamps e ignorando linhas inválidas"""
+    id_column, id_value = ("id, ", "src_rowid, ") if keep_ids else ("", "")
+    return (f"INSERT INTO {target} ({id_column}timestamp, shoulder_angle, neck_angle, camera_type, is_poor_posture) "
+            f"SELECT {id_value}ms, src_shoulder, src_neck, src_camera, src_poor "
+            f"FROM (SELECT *, {TEXT_TO_EPOCH_MS_SQL.format(column='src_timestamp')} AS ms FROM ({select})) "
+            f"WHERE ms IS NOT NULL AND src_camera IS NOT NULL")
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """Converte um datetime local (sem fuso) em milissegundos desde a época Unix"""
+    return int(round(value.timestamp() * 1000))
+
+
+def from_epoch_ms(value: int) -> datetime:
+    return datetime.fromtimestamp(value / 1000)
+
+
+def aggregate_tier(start_ms: int, resolution_seconds: int) -> tuple:
+    """Escolhe o nível mais grosso cujo intervalo divide a resolução e se alinha ao início da consulta.
+
+    A resolução precisa ser múltipla do nível mais fino (minuto): baldes de minuto inteiros não
+    se distribuem corretamente em resoluções como 90 segundos.
+    """
+    finest = AGGREGATE_TIERS[-1][1]
+    if resolution_seconds <= 0 or resolution_seconds % finest:
+        raise ValueError(f"Resolução deve ser um múltiplo positivo de {finest} segundos: {resolution_seconds}")
+    for tier, seconds in AGGREGATE_TIERS:
+        if resolution_seconds % seconds:
+            continue
+        if tier == 'day':
+            start = from_epoch_ms(start_ms)
+            aligned = start == datetime(start.year, start.month, start.day)
+        else:
+            aligned = start_ms % (seconds * 1000) == 0
+        if aligned:
+            return tier, seconds
+    return AGGREGATE_TIERS[-1]
+
+
+class SQLitePostureRepository(PostureRepository):
+    def __init__(self, db_path: str = 'posture_data.db', synchronous: str = 'NORMAL', config_check_interval: float = 1.0):
+        self.db_path = db_path
+        self.synchronous = synchronous
+        self.config_check_interval = config_check_interval
+        self._local = threading.local()
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+        self._config = None
+        self._config_checked = 0.0
+        self._config_generation = 0
+        self._migrate()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão persistente da thread atual, em modo WAL e com cache de statements preparados"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(self.db_path, timeout=10.0, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        self._local.connection = conn
+
+        current = threading.current_thread()
+        with self._connections_lock:
+            for ident, (thread, other) in list(self._connections.items()):
+                if not thread.is_alive():
+                    other.close()
+                    del self._connections[ident]
+            self._connections[current.ident] = (current, conn)
+        return conn
+
+    def close(self) -> None:
+        self._config = None
+        with self._connections_lock:
+            for _, conn in self._connections.values():
+                conn.close()
+            self._connections = {}
+        self._local = threading.local()
+
+    def _migrate(self) -> None:
+        """Aplica em ordem as migrações de MIGRATIONS ainda não registradas em PRAGMA user_version.
+
+        Cada migração roda em uma transação que também grava a nova versão; migrações longas
+        podem confirmar o progresso em partes (e retomá-lo em uma próxima execução).
+        """
+        conn = self._connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        for target, method in MIGRATIONS:
+            if target <= version:
+                continue
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                getattr(self, method)(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"Erro na migração do banco de dados para a versão {target}: {e}")
+                raise
+
+    def _migrate_base_schema(self, conn: sqlite3.Connection) -> None:
+        """Versão 1: posture_records com timestamps INTEGER em milissegundos e índices, app_settings e calibration.
+
+        Bancos anteriores (timestamps TEXT ou o esquema legado com camera/angulo_*) são copiados em
+        partes de MIGRATION_CHUNK_SIZE linhas, cada uma confirmada com o progresso em
+        schema_migration_progress, para que uma migração interrompida continue de onde parou.
+        """
+        conn.execute(SETTINGS_DDL)
+        conn.execute(CALIBRATION_DDL)
+
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posture_records'").fetchone()
+        if exists:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(posture_records)")}
+            select = records_select(columns, 'posture_records')
+            if select is None:
+                raise ValueError("Tabela posture_records com esquema desconhecido")
+
+            print("Convertendo registros do banco de dados para o novo formato...")
+            conn.execute(POSTURE_RECORDS_DDL.format(table='posture_records_v1'))
+            conn.execute("CREATE TABLE IF NOT EXISTS schema_migration_progress (name TEXT PRIMARY KEY, last_rowid INTEGER NOT NULL)")
+            row = conn.execute("SELECT last_rowid FROM schema_migration_progress WHERE name = 'posture_records_v1'").fetchone()
+            last_rowid = row[0] if row else 0
+
+            while True:
+                chunk_end = conn.execute("SELECT MAX(rowid) FROM (SELECT rowid FROM posture_records WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+                                         (last_rowid, MIGRATION_CHUNK_SIZE)).fetchone()[0]
+                if chunk_end is None:
+                    break
+                conn.execute(converted_records_insert_sql('posture_records_v1', f"{select} WHERE rowid > ? AND rowid <= ?", keep_ids=True),
+                             (last_rowid, chunk_end))
+                conn.execute("INSERT OR REPLACE INTO schema_migration_progress (name, last_rowid) VALUES ('posture_records_v1', ?)",
+                             (chunk_end,))
+                conn.commit()
+                conn.execute("BEGIN IMMEDIATE")
+                last_rowid = chunk_end
+
+            skipped = conn.execute("SELECT (SELECT COUNT(*) FROM posture_records) - (SELECT COUNT(*) FROM posture_records_v1)").fetchone()[0]
+            if skipped:
+                print(f"{skipped} registros com timestamp ou câmera inválidos foram ignorados na conversão")
+            conn.execute("DROP TABLE posture_records")
+            conn.execute("ALTER TABLE posture_records_v1 RENAME TO posture_records")
+            conn.execute("DROP TABLE schema_migration_progress")
+        else:
+            conn.execute(POSTURE_RECORDS_DDL.format(table='posture_records'))
+
+        for statement in POSTURE_RECORDS_INDEXES:
+            conn.execute(statement)
+
+    def _create_statistics_rollups(self, conn: sqlite3.Connection) -> None:
+        """Versão 2: contagens diárias, semanais (ISO) e por câmera mantidas por trigger"""
+        for statement in STATISTICS_ROLLUPS_DDL:
+            conn.execute(statement)
+        self._rebuild_statistics_rollups(conn)
+
+    def _rebuild_statistics_rollups(self, conn: sqlite3.Connection, from_aggregates: bool = False) -> None:
+        """Recalcula as contagens a partir dos registros ou, se já recalculados, dos agregados diários"""
+        conn.execute("DELETE FROM posture_daily_counts")
+        conn.execute("DELETE FROM posture_weekly_counts")
+        conn.execute("DELETE FROM posture_camera_counts")
+        if from_aggregates:
+            conn.execute(f'''INSERT INTO posture_daily_counts (day, camera_type, occurrences)
+                            SELECT {LOCAL_DAY_SQL.format(ms='bucket_start')} AS day, camera_type, SUM(samples)
+                            FROM posture_angles_day GROUP BY day, camera_type''')
+        else:
+            conn.execute(f'''INSERT INTO posture_daily_counts (day, camera_type, occurrences)
+                            SELECT {LOCAL_DAY_SQL.format(ms='timestamp')} AS day, camera_type, COUNT(*)
+                            FROM posture_records GROUP BY day, camera_type''')
+        conn.execute(f'''INSERT INTO posture_weekly_counts (year_week, occurrences)
+                        SELECT {ISO_WEEK_SQL} AS year_week, SUM(occurrences)
+                        FROM (SELECT {ISO_THURSDAY_SQL.format(day='day')} AS thursday, occurrences FROM posture_daily_counts)
+                        GROUP BY year_week''')
+        tables = self._record_tables(conn) if from_aggregates else ['posture_records']
+        latest_timestamps = "".join(
+            f"(SELECT MAX(timestamp) FROM {table} AS records WHERE records.camera_type = daily.camera_type), "
+            for table in reversed(tables))
+        conn.execute(f'''INSERT INTO posture_camera_counts (camera_type, occurrences, last_timestamp)
+                        SELECT camera_type, SUM(occurrences),
+                               COALESCE({latest_timestamps}CAST(strftime('%s', MAX(day), 'utc') AS INTEGER) * 1000)
+                        FROM posture_daily_counts AS daily GROUP BY camera_type''')
+
+    def _create_angle_aggregates(self, conn: sqlite3.Connection) -> None:
+        """Versão 3: agregados de ângulos por minuto, hora e dia, mantidos por trigger"""
+        for statement in ANGLE_AGGREGATES_DDL:
+            conn.execute(statement)
+        self._rebuild_angle_aggregates(conn, ['posture_records'])
+
+    def _create_partition_registry(self, conn: sqlite3.Connection) -> None:
+        """Versão 4: registro das partições mensais criadas pela retenção"""
+        conn.execute(PARTITIONS_DDL)
+
+    def _create_partition_camera_indexes(self, conn: sqlite3.Connection) -> None:
+        """Versão 5: índice (camera_type, timestamp) nas partições, como em posture_records"""
+        for table in self._record_tables(conn)[:-1]:
+            for statement in PARTITION_INDEXES:
+                conn.execute(statement.format(table=table))
+
+    def raw_watermark(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """Antes deste instante a retenção já descartou os registros brutos; só restam os agregados por hora e dia"""
+        conn = conn or self._connection()
+        row = conn.execute("SELECT value FROM app_settings WHERE key = ?", (RAW_WATERMARK_SETTING,)).fetchone()
+        return int(row[0]) if row else MIN_EPOCH_MS
+
+    def _rebuild_angle_aggregates(self, conn: sqlite3.Connection, tables: Optional[List[str]] = None,
+                                  start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> None:
+        """Recalcula os agregados cobertos por registros brutos; os anteriores (já sem registros) são mantidos.
+
+        Com `start_ms` e `end_ms` (primeiro e último registro alterado) só os baldes de cada nível
+        que cobrem esse intervalo são recalculados; sem eles, tudo a partir do registro mais antigo.
+        Os baldes anteriores à marca da retenção nunca são recalculados, mesmo que registros antigos
+        tenham sido importados depois: o período já não tem todos os registros brutos.
+        """
+        if start_ms is None:
+            tables = tables or self._record_tables(conn)
+            start_ms = min((conn.execute(f"SELECT MIN(timestamp) FROM {table}").fetchone()[0] for table in tables),
+                           key=lambda value: MAX_EPOCH_MS if value is None else value)
+            if start_ms is None:
+                return
+        watermark = self.raw_watermark(conn)
+        for tier, seconds in reversed(AGGREGATE_TIERS):
+            since, until = self._bucket_bounds(conn, tier, seconds, max(start_ms, watermark), end_ms, watermark)
+            if tier == 'minute':
+                tables = tables or self._record_tables(conn, since, until)
+            conn.execute(f"DELETE FROM posture_angles_{tier} WHERE bucket_start >= ? AND bucket_start < ?", (since, until))
+            conn.execute(_angle_aggregates_rebuild_sql(tier, seconds, tables), {'since': since, 'until': until})
+
+    @staticmethod
+    def _bucket_bounds(conn: sqlite3.Connection, tier: str, seconds: int, start_ms: int,
+                       end_ms: Optional[int], watermark: int) -> tuple:
+        """Início do balde de start_ms (ou do seguinte, se começar antes da marca da retenção) e fim do balde de end_ms"""
+        def bucket(ms: int) -> int:
+            return conn.execute(f"SELECT {_bucket_sql(tier, seconds, ':ms')}", {'ms': ms}).fetchone()[0]
+
+        # um balde e meio adiante cai sempre no balde seguinte, mesmo em dias de 23 ou 25 horas
+        step = seconds * 1500
+        since = bucket(start_ms)
+        if since < watermark:
+            since = bucket(since + step)
+        until = MAX_EPOCH_MS if end_ms is None else bucket(bucket(end_ms) + step)
+        return since, until
+
+    def _aggregate_rows_before_watermark(self, conn: sqlite3.Connection, after_id: int) -> None:
+        """Soma aos agregados preservados os registros carregados sem triggers anteriores à marca da retenção.
+
+        Esses registros são reinseridos (com os mesmos ids) para passar pelos triggers, já que o
+        recálculo não alcança os baldes antes da marca.
+        """
+        watermark = self.raw_watermark(conn)
+        if watermark == MIN_EPOCH_MS:
+            return
+        params = (after_id, watermark)
+        conn.execute("CREATE TEMP TABLE posture_expired_rows AS SELECT * FROM posture_records WHERE id > ? AND timestamp < ?", params)
+        conn.execute("DELETE FROM posture_records WHERE id > ? AND timestamp < ?", params)
+        conn.execute("INSERT INTO posture_records SELECT * FROM temp.posture_expired_rows")
+        conn.execute("DROP TABLE temp.posture_expired_rows")
+
+    def _record_tables(self, conn: sqlite3.Connection, start_ms: int = MIN_EPOCH_MS, end_ms: int = MAX_EPOCH_MS) -> List[str]:
+        """Partições mensais que cobrem o intervalo, em ordem cronológica, seguidas de posture_records"""
+        partitions = conn.execute("SELECT name FROM posture_partitions WHERE end_ms > ? AND start_ms <= ? ORDER BY start_ms",
+                                  (start_ms, end_ms)).fetchall()
+        return [row[0] for row in partitions] + ['posture_records']
+
+    def compact(self) -> int:
+        """Devolve ao sistema as páginas livres; bancos criados sem auto_vacuum incremental são convertidos uma única vez"""
+        conn = self._connection()
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if not free_pages:
+            return 0
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            conn.executescript("PRAGMA incremental_vacuum;")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return free_pages
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            c.execute("PRAGMA table_info(posture_records)")
-            columns = [column[1] for column in c.fetchall()]
-            
-            if 'camera' in columns and 'camera_type' not in columns:
-                print("Migrando esquema do banco de dados...")
-                
-                c.execute("ALTER TABLE posture_records ADD COLUMN camera_type TEXT")
-                c.execute("ALTER TABLE posture_records ADD COLUMN shoulder_angle REAL")
-                c.execute("ALTER TABLE posture_records ADD COLUMN neck_angle REAL")
-                c.execute("ALTER TABLE posture_records ADD COLUMN is_poor_posture INTEGER DEFAULT 0")
-                
-                c.execute("UPDATE posture_records SET camera_type = camera")
-                c.execute("UPDATE posture_records SET shoulder_angle = angulo_ombro")
-                c.execute("UPDATE posture_records SET neck_angle = angulo_pescoco")
-                c.execute("UPDATE posture_records SET is_poor_posture = 1 WHERE angulo_ombro IS NOT NULL OR angulo_pescoco IS NOT NULL")
-                
-                c.execute("CREATE TABLE posture_records_new AS SELECT id, timestamp, shoulder_angle, neck_angle, camera_type, is_poor_posture FROM posture_records")
-                c.execute("DROP TABLE posture_records")
-                c.execute("ALTER TABLE posture_records_new RENAME TO posture_records")
-                
-                print("Migração do banco de dados concluída com sucesso")
-                
-        except Exception as e:
-            print(f"Erro na migração (isso é normal para bancos novos): {e}")
-        
-        conn.commit()
-        conn.close()
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def rebuild_statistics_rollups(self) -> None:
+        """Recalcula as tabelas de contagens e de agregados a partir de posture_records"""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._rebuild_angle_aggregates(conn)
+            self._rebuild_statistics_rollups(conn, from_aggregates=True)
+
+    @contextmanager
+    def bulk_transaction(self, attach: Optional[Dict[str, str]] = None) -> Iterator[sqlite3.Connection]:
+        """Transação única para cargas em massa.
+
+        Os índices de posture_records e os triggers de agregação são removidos durante a carga e
+        recriados no fim; os agregados são recalculados de uma vez, só nos baldes do intervalo de
+        tempo dos registros carregados, e as contagens a partir dos agregados diários. Em caso de erro
+        nada é alterado. Os bancos em `attach` (alias -> caminho) ficam anexados durante a carga.
+        """
+        conn = self._connection()
+        attached = []
+        try:
+            for alias, path in (attach or {}).items():
+                conn.execute(f"ATTACH DATABASE ? AS {alias}", (path,))
+                attached.append(alias)
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM posture_records").fetchone()[0]
+                for name in AGGREGATE_TRIGGERS:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                for name in POSTURE_RECORDS_INDEX_NAMES:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+                yield conn
+                for statement in POSTURE_RECORDS_INDEXES + STATISTICS_ROLLUPS_DDL + ANGLE_AGGREGATES_DDL:
+                    conn.execute(statement)
+                start_ms, end_ms = conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM posture_records WHERE id > ?",
+                                                (last_id,)).fetchone()
+                self._aggregate_rows_before_watermark(conn, last_id)
+                if start_ms is not None:
+                    self._rebuild_angle_aggregates(conn, start_ms=start_ms, end_ms=end_ms)
+                self._rebuild_statistics_rollups(conn, from_aggregates=True)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        finally:
+            for alias in attached:
+                conn.execute(f"DETACH DATABASE {alias}")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def get_angle_aggregates(self, start_date: datetime, end_date: datetime, resolution_seconds: int,
+                             camera_type: Optional[str] = None) -> List[PostureAggregate]:
+        """Baldes de `resolution_seconds` a partir de `start_date`.
+
+        Intervalos que começam antes da marca da retenção não têm mais o nível de minuto: são
+        atendidos pelo nível de hora, com o início arredondado para baixo e a resolução para cima
+        em horas inteiras.
+        """
+        start_ms, end_ms = to_epoch_ms(start_date), to_epoch_ms(end_date)
+        tier, seconds = aggregate_tier(start_ms, resolution_seconds)
+        if tier == 'minute' and start_ms < self.raw_watermark():
+            tier, seconds = 'hour', 3600
+            start_ms -= start_ms % (seconds * 1000)
+            resolution_seconds = -(-resolution_seconds // seconds) * seconds
+        resolution_ms = max(resolution_seconds, seconds) * 1000
+
+        angle_columns = ", ".join(
+            f"SUM({angle}_count), SUM({angle}_sum), SUM({angle}_sumsq), MIN({angle}_min), MAX({angle}_max)"
+            for angle in AGGREGATE_ANGLES)
+        query = (f"SELECT (bucket_start - ? + ?) / ? AS bucket, camera_type, SUM(samples), SUM(poor_samples), {angle_columns} "
+                 f"FROM posture_angles_{tier} WHERE bucket_start >= ? AND bucket_start < ?")
+        params = [start_ms, seconds * 500, resolution_ms, start_ms, end_ms]
+        if camera_type is not None:
+            query += " AND camera_type = ?"
+            params.append(camera_type)
+        query += " GROUP BY bucket, camera_type ORDER BY bucket, camera_type"
+
+        return [PostureAggregate(
+            bucket_start=from_epoch_ms(start_ms + row[0] * resolution_ms),
+            camera_type=row[1],
+            samples=row[2],
+            poor_samples=row[3],
+            shoulder=AngleSummary(*row[4:9]),
+            neck=AngleSummary(*row[9:14])
+        ) for row in self._connection().execute(query, params)]
+
+    @staticmethod
+    def _posture_row(posture_data: PostureData) -> tuple:
+        return (to_epoch_ms(posture_data.timestamp),
+                posture_data.shoulder_angle,
+                posture_data.neck_angle,
+                posture_data.camera_type,
+                int(posture_data.is_poor_posture))
 
     def save_posture_data(self, posture_data: PostureData) -> None:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("INSERT INTO posture_records (timestamp, shoulder_angle, neck_angle, camera_type, is_poor_posture) VALUES (?, ?, ?, ?, ?)",
-                  (posture_data.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                   posture_data.shoulder_angle,
-                   posture_data.neck_angle,
-                   posture_data.camera_type,
-                   int(posture_data.is_poor_posture)))
-        conn.commit()
-        conn.close()
+        conn = self._connection()
+        with conn:
+            conn.execute(INSERT_POSTURE_SQL, self._posture_row(posture_data))
+
+    def save_posture_data_batch(self, posture_data: List[PostureData]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.executemany(INSERT_POSTURE_SQL, (self._posture_row(item) for item in posture_data))
 
     def get_posture_data_by_date_range(self, start_date: datetime, end_date: datetime) -> List[PostureData]:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT id, timestamp, shoulder_angle, neck_angle, camera_type, is_poor_posture FROM posture_records WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp",
-                  (start_date.strftime("%Y-%m-%d %H:%M:%S"), end_date.strftime("%Y-%m-%d %H:%M:%S")))
-        rows = c.fetchall()
-        conn.close()
-        return [PostureData(
-            id=row[0],
-            timestamp=datetime.strptime(row[1], "%Y-%m-%d %H:%M:%S"),
-            shoulder_angle=row[2],
-            neck_angle=row[3],
-            camera_type=row[4],
-            is_poor_posture=bool(row[5])
-        ) for row in rows]
+        return list(self.iter_posture_data_by_date_range(start_date, end_date))
+
+    def _iter_range_rows(self, query: str, params: list, start_ms: int, end_ms: int, chunk_size: int) -> Iterator[list]:
+        """Executa `query` (com {table} e os limites de timestamp) nas partições do intervalo e em posture_records.
+
+        As tabelas são unidas em um único SELECT ordenado por timestamp: posture_records pode ter
+        registros de meses já particionados (importados depois da última retenção).
+        """
+        conn = self._connection()
+        tables = self._record_tables(conn, start_ms, end_ms)
+        union = " UNION ALL ".join(query.format(table=table) for table in tables)
+        cursor = conn.cursor()
+        cursor.execute(f"{union} ORDER BY timestamp", params * len(tables))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+    def iter_posture_data_by_date_range(self, start_date: datetime, end_date: datetime,
+                                        chunk_size: int = 5000) -> Iterator[PostureData]:
+        start_ms, end_ms = to_epoch_ms(start_date), to_epoch_ms(end_date)
+        for rows in self._iter_range_rows(SELECT_RANGE_SQL, [start_ms, end_ms], start_ms, end_ms, chunk_size):
+            for row in rows:
+                yield PostureData(
+                    id=row[0],
+                    timestamp=from_epoch_ms(row[1]),
+                    shoulder_angle=row[2],
+                    neck_angle=row[3],
+                    camera_type=row[4],
+                    is_poor_posture=bool(row[5])
+                )
+
+    def iter_posture_columns(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                             camera_type: Optional[str] = None, chunk_size: int = 65536) -> Iterator[PostureColumns]:
+        conn = self._connection()
+        if camera_type is not None:
+            camera_types = [camera_type]
+        else:
+            camera_types = [row[0] for row in conn.execute("SELECT camera_type FROM posture_camera_counts ORDER BY camera_type")]
+
+        camera_code_sql = "CASE camera_type " + "".join(f"WHEN ? THEN {code} " for code in range(len(camera_types))) + "ELSE -1 END"
+        query = (f"SELECT id, timestamp, shoulder_angle, neck_angle, {camera_code_sql}, is_poor_posture "
+                 "FROM {table} WHERE timestamp BETWEEN ? AND ?")
+        start_ms = to_epoch_ms(start_date) if start_date else MIN_EPOCH_MS
+        end_ms = to_epoch_ms(end_date) if end_date else MAX_EPOCH_MS
+        params = camera_types + [start_ms, end_ms]
+        if camera_type is not None:
+            query += " AND camera_type = ?"
+            params.append(camera_type)
+
+        for rows in self._iter_range_rows(query, params, start_ms, end_ms, chunk_size):
+            ids, timestamps, shoulder, neck, codes, poor = zip(*rows)
+            yield PostureColumns(
+                ids=np.array(ids, dtype=np.int64),
+                timestamps=np.array(timestamps, dtype=np.int64),
+                shoulder_angles=np.array(shoulder, dtype=np.float64),
+                neck_angles=np.array(neck, dtype=np.float64),
+                camera_codes=np.array(codes, dtype=np.int16),
+                is_poor_posture=np.array(poor, dtype=bool),
+                camera_types=camera_types
+            )
 
     def get_statistics(self) -> PostureStatistics:
-        conn = sqlite3.connect(self.db_path)
-        
-        try:
-            c = conn.cursor()
-            c.execute("PRAGMA table_info(posture_records)")
-            columns = [column[1] for column in c.fetchall()]
-            
-            if 'camera_type' not in columns:
-                df = pd.read_sql_query("SELECT * FROM posture_records ORDER BY timestamp", conn)
-                if not df.empty and 'camera' in df.columns:
-                    df = df.rename(columns={
-                        'camera': 'camera_type',
-                        'angulo_ombro': 'shoulder_angle',
-                        'angulo_pescoco': 'neck_angle'
-                    })
-                    if 'is_poor_posture' not in df.columns:
-                        df['is_poor_posture'] = True
-                else:
-                    df = pd.DataFrame()
-            else:
-                df = pd.read_sql_query("SELECT * FROM posture_records ORDER BY timestamp", conn)
-        except Exception as e:
-            print(f"Erro ao ler estatísticas: {e}")
-            df = pd.DataFrame()
-        
-        conn.close()
-        
-        if df.empty:
-            return PostureStatistics.create_empty()
-        
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['date'] = df['timestamp'].dt.date
+        conn = self._connection()
         today = datetime.now().date()
         week_ago = today - timedelta(days=6)
         
-        df_week = df[df['date'] >= week_ago]
-        daily_counts = df_week.groupby('date').size().to_dict()
-        
-        daily_occurrences = {date.isoformat(): count for date, count in daily_counts.items()}
-        
-        camera_distribution = df['camera_type'].value_counts().to_dict()
-        
-        df['week'] = df['timestamp'].dt.isocalendar().week
-        df['year'] = df['timestamp'].dt.year
-        df['year_week'] = df['year'].astype(str) + '-W' + df['week'].astype(str).str.zfill(2)
-        weekly_counts = df.groupby('year_week').size().to_dict()
+        camera_rows = conn.execute(
+            "SELECT camera_type, occurrences, last_timestamp FROM posture_camera_counts ORDER BY occurrences DESC").fetchall()
+        if not camera_rows:
+            return PostureStatistics.create_empty()
         
-        total_occurrences = len(df)
-        today_occurrences = len(df[df['date'] == today])
-        frontal_camera_count = len(df[df['camera_type'] == 'frontal'])
-        lateral_camera_count = len(df[df['camera_type'] == 'lateral'])
-        last_occurrence = df['timestamp'].max().to_pydatetime()
+        daily_occurrences = dict(conn.execute(
+            "SELECT day, SUM(occurrences) FROM posture_daily_counts WHERE day >= ? GROUP BY day ORDER BY day",
+            (week_ago.isoformat(),)).fetchall())
+        weekly_trend = dict(conn.execute(
+            "SELECT year_week, occurrences FROM posture_weekly_counts ORDER BY year_week").fetchall())
+        camera_distribution = {camera_type: occurrences for camera_type, occurrences, _ in camera_rows}
         
         return PostureStatistics(
-            total_occurrences=total_occurrences,
-            today_occurrences=today_occurrences,
-            frontal_camera_count=frontal_camera_count,
-            lateral_camera_count=lateral_camera_count,
-            last_occurrence=last_occurrence,
+            total_occurrences=sum(camera_distribution.values()),
+            today_occurrences=daily_occurrences.get(today.isoformat(), 0),
+            frontal_camera_count=camera_distribution.get('frontal', 0),
+            lateral_camera_count=camera_distribution.get('lateral', 0),
+            last_occurrence=from_epoch_ms(max(row[2] for row in camera_rows)),
             daily_occurrences=daily_occurrences,
             camera_distribution=camera_distribution,
-            weekly_trend=weekly_counts
+            weekly_trend=weekly_trend
         )
 
+    def get_data_version(self) -> int:
+        """Último id atribuído em posture_records (AUTOINCREMENT nunca reutiliza ids)"""
+        row = self._connection().execute("SELECT seq FROM sqlite_sequence WHERE name = 'posture_records'").fetchone()
+        return row[0] if row else 0
+
+    def _config_cache(self) -> tuple:
+        """Cache de app_settings e calibration.
+
+        Escritas deste repositório invalidam o cache depois do commit; escritas de outras conexões
+        ou processos são detectadas por PRAGMA data_version, verificado no máximo a cada
+        config_check_interval segundos.
+        """
+        config = self._config
+        now = time.monotonic()
+        if config is not None and now - self._config_checked < self.config_check_interval:
+            return config
+
+        conn = self._connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if config is None or version != getattr(self._local, 'data_version', None):
+            generation = self._config_generation
+            settings = dict(conn.execute(SELECT_SETTINGS_SQL).fetchall())
+            calibrations = {row[0]: PostureCalibration(*row) for row in conn.execute(SELECT_CALIBRATIONS_SQL).fetchall()}
+            config = (settings, calibrations)
+            # uma escrita concluída durante a leitura pode não estar nela; a próxima consulta relê
+            if generation == self._config_generation:
+                self._config = config
+            self._local.data_version = version
+        self._config_checked = now
+        return config
+
+    def _write_config(self, sql: str, params: tuple) -> None:
+        """Grava em app_settings ou calibration e só então invalida o cache, que nunca guarda valores não confirmados"""
+        conn = self._connection()
+        with conn:
+            conn.execute(sql, params)
+        self._config_generation += 1
+        self._config = None
+
     def save_calibration(self, calibration: PostureCalibration) -> None:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("INSERT OR REPLACE INTO calibration (camera_type, shoulder_angle_min, shoulder_angle_max, neck_angle_min, neck_angle_max, margin) VALUES (?, ?, ?, ?, ?, ?)",
-                  (calibration.camera_type, calibration.shoulder_angle_min, calibration.shoulder_angle_max, calibration.neck_angle_min, calibration.neck_angle_max, calibration.margin))
-        conn.commit()
-        conn.close()
+        self._write_config(UPSERT_CALIBRATION_SQL,
+                           (calibration.camera_type, calibration.shoulder_angle_min, calibration.shoulder_angle_max, calibration.neck_angle_min, calibration.neck_angle_max, calibration.margin))
 
     def get_calibration(self, camera_type: str) -> Optional[PostureCalibration]:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT camera_type, shoulder_angle_min, shoulder_angle_max, neck_angle_min, neck_angle_max, margin FROM calibration WHERE camera_type = ?", (camera_type,))
-        row = c.fetchone()
-        conn.close()
-        if row:
-            return PostureCalibration(
-                camera_type=row[0],
-                shoulder_angle_min=row[1],
-                shoulder_angle_max=row[2],
-                neck_angle_min=row[3],
-                neck_angle_max=row[4],
-                margin=row[5]
-            )
-        return None
+        return self._config_cache()[1].get(camera_type)
 
     def save_setting(self, key: str, value: str) -> None:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("INSERT OR REPLACE INTO app_settings (key, value) VALUES (?, ?)", (key, value))
-        conn.commit()
-        conn.close()
+        self._write_config(UPSERT_SETTING_SQL, (key, value))
 
     def get_setting(self, key: str, default: str = "") -> str:
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT value FROM app_settings WHERE key = ?", (key,))
-        row = c.fetchone()
-        conn.close()
-        return row[0] if row else default 
\ No newline at end of file
+        return self._config_cache()[0].get(key, default)
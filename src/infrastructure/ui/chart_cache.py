@@ -0,0 +1,102 @@
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+from PIL import Image
+
+CachedChart = Tuple[Tuple[int, int], bytes]
+
+
+class ChartCache:
+    """Cache de gráficos renderizados, indexado pelo hash das séries e do tamanho do gráfico.
+
+    Os pixels RGBA ficam em memória (LRU com até `max_entries` itens). Com `directory`, também
+    são gravados em PNG, reaproveitados entre execuções do aplicativo; os arquivos menos usados
+    recentemente (pela data de modificação) são removidos acima de `max_files`. Pode ser usado
+    por várias threads de renderização ao mesmo tempo.
+    """
+
+    def __init__(self, max_entries: int = 12, directory: Optional[str] = None, max_files: int = 64):
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self.directory = None
+        self._requested_directory = None
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.set_directory(directory)
+
+    def set_directory(self, directory: Optional[str]) -> None:
+        directory = directory or None
+        if directory == self._requested_directory:
+            return
+        self._requested_directory = directory
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                print(f"Erro ao criar diretório do cache de gráficos: {e}")
+                directory = None
+        self.directory = directory
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"chart_{key}.png")
+
+    def get(self, key: str) -> Optional[CachedChart]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return None
+        try:
+            path = self._path(key)
+            with Image.open(path) as image:
+                image = image.convert('RGBA')
+                size, pixels = image.size, image.tobytes()
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao ler gráfico do cache: {e}")
+            return None
+        return self._remember(key, (size, pixels))
+
+    def put(self, key: str, size: Tuple[int, int], pixels) -> None:
+        """Guarda uma cópia dos pixels RGBA (linha superior primeiro); `pixels` pode ser um memoryview"""
+        if self.directory is not None:
+            try:
+                Image.frombuffer('RGBA', size, pixels, 'raw', 'RGBA', 0, 1).save(self._path(key), format='PNG')
+                self._evict_files()
+            except OSError as e:
+                print(f"Erro ao gravar gráfico no cache: {e}")
+        self._remember(key, (tuple(size), bytes(pixels)))
+
+    def _remember(self, key: str, entry: CachedChart) -> CachedChart:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _evict_files(self) -> None:
+        files = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.startswith('chart_') and name.endswith('.png')]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
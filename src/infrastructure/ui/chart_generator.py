@@ -1,216 +1,123 @@
-import matplotlib
-matplotlib.use('Agg')  # Configurar backend não-interativo para executável
-import matplotlib.pyplot as plt
-import pandas as pd
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Callable, Dict, Optional, Set
+from kivy.clock import Clock
 from kivy.graphics.texture import Texture
-from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 from ...domain.entities.statistics import PostureStatistics
+from .chart_cache import ChartCache
+from .chart_renderer import CHART_FIGURES, CHART_NAMES, render_cache, render_cached_chart
+
 
 class ChartGenerator:
-    
-    @staticmethod
-    def create_daily_occurrences_chart(statistics: PostureStatistics) -> Texture:
-        try:
-            if not statistics.daily_occurrences:
-                fig, ax = plt.subplots(figsize=(10, 6), dpi=80)
-                ax.text(0.5, 0.5, 'Nenhum dado disponível', ha='center', va='center', 
-                       transform=ax.transAxes, fontsize=16, fontweight='bold')
-                ax.set_title('Ocorrências por Dia (Últimos 7 dias)', fontsize=18, pad=20)
-                plt.tight_layout()
-                return ChartGenerator._fig_to_texture(fig)
-            
-            today = datetime.now().date()
-            week_ago = today - timedelta(days=6)
-            
-            date_range = pd.date_range(start=week_ago, end=today, freq='D')
-            daily_counts = []
-            
-            for date in date_range:
-                date_str = date.date().isoformat()
-                daily_counts.append(statistics.daily_occurrences.get(date_str, 0))
-            
-            fig, ax = plt.subplots(figsize=(10, 6), dpi=80)
-            fig.patch.set_facecolor('white')
-            
-            bars = ax.bar(range(len(daily_counts)), daily_counts, 
-                         color='#3498db', alpha=0.8, edgecolor='#2980b9', linewidth=1)
-            
-            ax.set_xlabel('Data', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Número de Ocorrências', fontsize=14, fontweight='bold')
-            ax.set_title('Ocorrências por Dia (Últimos 7 dias)', fontsize=18, pad=20, fontweight='bold')
-            ax.set_xticks(range(len(daily_counts)))
-            ax.set_xticklabels([d.strftime('%d/%m') for d in date_range], 
-                              rotation=45, ha='right', fontsize=12)
-            
-            for i, bar in enumerate(bars):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                       f'{int(height)}', ha='center', va='bottom', fontsize=12, fontweight='bold')
-            
-            ax.grid(True, alpha=0.3, axis='y')
-            ax.set_ylim(0, max(daily_counts) * 1.2 if max(daily_counts) > 0 else 1)
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.tick_params(axis='both', which='major', labelsize=11)
-            
-            plt.tight_layout()
-            return ChartGenerator._fig_to_texture(fig)
-        except Exception as e:
-            print(f"Erro ao criar gráfico diário: {e}")
-            return ChartGenerator._create_error_texture("Erro ao gerar gráfico")
-    
-    @staticmethod
-    def create_camera_distribution_chart(statistics: PostureStatistics) -> Texture:
-        try:
-            if not statistics.camera_distribution:
-                fig, ax = plt.subplots(figsize=(8, 6), dpi=80)
-                fig.patch.set_facecolor('white')
-                ax.text(0.5, 0.5, 'Nenhum dado disponível', ha='center', va='center', 
-                       transform=ax.transAxes, fontsize=16, fontweight='bold')
-                ax.set_title('Distribuição por Câmera', fontsize=18)
-                return ChartGenerator._fig_to_texture(fig)
-            
-            camera_counts = statistics.camera_distribution
-            
-            fig, ax = plt.subplots(figsize=(8, 6), dpi=80)
-            fig.patch.set_facecolor('white')
-            colors = ['#e74c3c', '#3498db']
-            
-            wedges, texts, autotexts = ax.pie(camera_counts.values(), 
-                                             labels=[f'Câmera {label.title()}' for label in camera_counts.keys()],
-                                             autopct='%1.1f%%',
-                                             colors=colors[:len(camera_counts)],
-                                             startangle=90,
-                                             textprops={'fontsize': 14, 'fontweight': 'bold'})
-            
-            ax.set_title('Distribuição de Ocorrências por Câmera', fontsize=18, pad=20, fontweight='bold')
-            
-            for autotext in autotexts:
-                autotext.set_color('white')
-                autotext.set_fontweight('bold')
-                autotext.set_fontsize(14)
-            
-            legend_labels = [f'{label.title()}: {count}' for label, count in camera_counts.items()]
-            ax.legend(wedges, legend_labels, title="Totais", loc="center left", 
-                     bbox_to_anchor=(1, 0, 0.5, 1), fontsize=12)
-            
-            plt.tight_layout()
-            return ChartGenerator._fig_to_texture(fig)
-        except Exception as e:
-            print(f"Erro ao criar gráfico de distribuição: {e}")
-            return ChartGenerator._create_error_texture("Erro ao gerar gráfico")
-    
+    """Gera os gráficos da tela de estatísticas em um pool de workers.
+
+    Cada gráfico tem uma Figure persistente no worker e uma textura persistente no Kivy: a cada
+    atualização os pixels do canvas são enviados direto para a mesma textura (blit_buffer do
+    memoryview do canvas no modo `thread`). A única cópia dos pixels é a do cache em memória,
+    feita no worker junto com a consulta e a gravação do cache, de modo que a thread do Kivy só
+    envia os pixels à textura. Um mesmo gráfico nunca é renderizado duas vezes ao mesmo tempo;
+    pedidos feitos durante a renderização esperam e só o mais recente é atendido. `render_mode`
+    `thread` (padrão) usa um pool de threads e `process` um pool de processos.
+    """
+    cache = render_cache
+    cache_dir: Optional[str] = None
+    render_mode = 'thread'
+    _executor: Optional[Executor] = None
+    _textures: Dict[str, Texture] = {}
+    _shown: Dict[str, Optional[str]] = {}
+    _in_flight: Set[str] = set()
+    _queued: Dict[str, tuple] = {}
+
+    @classmethod
+    def configure(cls, render_mode: str = 'thread', cache_dir: Optional[str] = None) -> None:
+        if render_mode != cls.render_mode:
+            cls.shutdown()
+            cls.render_mode = render_mode
+        cls.cache_dir = cache_dir or None
+
+    @classmethod
+    def _get_executor(cls) -> Executor:
+        if cls._executor is None:
+            if cls.render_mode == 'process':
+                cls._executor = ProcessPoolExecutor(max_workers=len(CHART_NAMES))
+            else:
+                cls._executor = ThreadPoolExecutor(max_workers=len(CHART_NAMES), thread_name_prefix='chart')
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+        cls._in_flight.clear()
+        cls._queued.clear()
+
     @staticmethod
-    def create_weekly_trend_chart(statistics: PostureStatistics) -> Texture:
+    def chart_data(statistics: PostureStatistics) -> Dict[str, object]:
+        """Séries de cada gráfico, em tipos simples para enviar aos workers e compor a chave do cache"""
+        today = datetime.now().date()
+        week_ago = today - timedelta(days=6)
+        dates = [(week_ago + timedelta(days=offset)).isoformat() for offset in range(7)]
+        daily = [(day, statistics.daily_occurrences.get(day, 0)) for day in dates]
+        return {
+            'daily': daily if statistics.daily_occurrences else None,
+            'camera': list(statistics.camera_distribution.items()),
+            'weekly': list(statistics.weekly_trend.items()),
+        }
+
+    @classmethod
+    def render_charts(cls, statistics: PostureStatistics, on_ready: Callable[[str, Texture], None]) -> None:
+        """Entrega cada gráfico a `on_ready(nome, textura)` na thread do Kivy.
+
+        A textura de um gráfico é sempre o mesmo objeto enquanto o tamanho não muda. Gráficos já
+        exibidos são entregues imediatamente; os demais são buscados no cache ou renderizados em
+        paralelo pelos workers.
+        """
+        for name, data in cls.chart_data(statistics).items():
+            cls._request(name, data, ChartCache.make_key(name, data, CHART_FIGURES[name]), on_ready)
+
+    @classmethod
+    def _request(cls, name: str, data, key: str, on_ready: Callable[[str, Texture], None]) -> None:
+        if name in cls._in_flight:
+            cls._queued[name] = (data, key, on_ready)
+            return
+        if cls._shown.get(name) == key:
+            on_ready(name, cls._textures[name])
+            return
+
+        cls._in_flight.add(name)
+        future = cls._get_executor().submit(render_cached_chart, name, data, key, cls.cache_dir,
+                                            cls.render_mode == 'process')
+        future.add_done_callback(
+            lambda done: Clock.schedule_once(lambda dt: cls._deliver(done, name, key, on_ready)))
+
+    @classmethod
+    def _deliver(cls, future, name: str, key: str, on_ready: Callable[[str, Texture], None]) -> None:
+        cls._in_flight.discard(name)
+        if future.cancelled():
+            return
         try:
-            if not statistics.weekly_trend:
-                fig, ax = plt.subplots(figsize=(10, 6), dpi=80)
-                fig.patch.set_facecolor('white')
-                ax.text(0.5, 0.5, 'Nenhum dado disponível', ha='center', va='center', 
-                       transform=ax.transAxes, fontsize=14)
-                ax.set_title('Tendência Semanal', fontsize=16)
-                plt.tight_layout()
-                return ChartGenerator._fig_to_texture(fig)
-            
-            weekly_counts = statistics.weekly_trend
-            
-            if len(weekly_counts) < 2:
-                fig, ax = plt.subplots(figsize=(12, 6), dpi=100)
-                ax.text(0.5, 0.5, 'Dados insuficientes para tendência\n(mínimo 2 semanas)', 
-                       ha='center', va='center', transform=ax.transAxes, fontsize=14)
-                ax.set_title('Tendência Semanal', fontsize=16)
-                plt.tight_layout()
-                return ChartGenerator._fig_to_texture(fig)
-            
-            fig, ax = plt.subplots(figsize=(12, 6), dpi=100)
-            
-            x_values = range(len(weekly_counts))
-            y_values = list(weekly_counts.values())
-            
-            ax.plot(x_values, y_values, marker='o', linewidth=3, markersize=8, 
-                   color='#e74c3c', markerfacecolor='#c0392b', markeredgecolor='white', 
-                   markeredgewidth=2)
-            
-            ax.set_xlabel('Semana', fontsize=12)
-            ax.set_ylabel('Número de Ocorrências', fontsize=12)
-            ax.set_title('Tendência Semanal de Ocorrências', fontsize=16, pad=20)
-            ax.set_xticks(x_values)
-            
-            week_labels = [f'S{i+1}' for i in range(len(weekly_counts))]
-            ax.set_xticklabels(week_labels, rotation=0)
-            
-            ax.grid(True, alpha=0.3)
-            ax.set_ylim(0, max(y_values) * 1.2 if max(y_values) > 0 else 1)
-            
-            for i, value in enumerate(y_values):
-                ax.annotate(f'{value}', (i, value), textcoords="offset points", 
-                           xytext=(0,15), ha='center', fontsize=10, 
-                           bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
-            
-            if len(y_values) >= 2:
-                first_week = y_values[0]
-                last_week = y_values[-1]
-                
-                if first_week > 0:
-                    change_percent = ((last_week - first_week) / first_week) * 100
-                    trend_text = f"Mudança: {change_percent:+.1f}%"
-                    color = '#27ae60' if change_percent < 0 else '#e74c3c'
-                    
-                    ax.text(0.02, 0.98, trend_text, transform=ax.transAxes, 
-                           verticalalignment='top', fontsize=12, fontweight='bold',
-                           bbox=dict(boxstyle='round,pad=0.5', facecolor=color, alpha=0.2))
-            
-            plt.tight_layout()
-            return ChartGenerator._fig_to_texture(fig)
+            size, pixels, ok = future.result()
         except Exception as e:
-            print(f"Erro ao criar gráfico de tendência: {e}")
-            return ChartGenerator._create_error_texture("Erro ao gerar gráfico")
-    
-    @staticmethod
-    def _fig_to_texture(fig) -> Texture:
-        try:
-            canvas = FigureCanvasAgg(fig)
-            canvas.draw()
-            renderer = canvas.get_renderer()
-            raw_data = renderer.tostring_rgb()
-            size = canvas.get_width_height()
-            texture = Texture.create(size=size, colorfmt='rgb')
-            texture.blit_buffer(raw_data, colorfmt='rgb', bufferfmt='ubyte')
+            print(f"Erro ao renderizar gráfico {name}: {e}")
+            size, pixels, ok = None, None, False
+
+        if size is not None:
+            on_ready(name, cls._upload(name, key if ok else None, size, pixels))
+
+        queued = cls._queued.pop(name, None)
+        if queued is not None:
+            cls._request(name, *queued)
+
+    @classmethod
+    def _upload(cls, name: str, key: Optional[str], size, pixels) -> Texture:
+        """Envia os pixels para a textura persistente do gráfico, recriando-a só se o tamanho mudar"""
+        texture = cls._textures.get(name)
+        if texture is None or tuple(texture.size) != tuple(size):
+            texture = Texture.create(size=tuple(size), colorfmt='rgba')
             texture.flip_vertical()
-            
-            plt.close(fig)
-            return texture
-        except Exception as e:
-            print(f"Erro ao converter figura para textura: {e}")
-            return ChartGenerator._create_error_texture("Erro de renderização")
-    
-    @staticmethod
-    def _create_error_texture(message: str) -> Texture:
-        """Cria uma textura com mensagem de erro"""
-        try:
-            fig, ax = plt.subplots(figsize=(8, 6), dpi=80)
-            fig.patch.set_facecolor('white')
-            ax.text(0.5, 0.5, message, ha='center', va='center', 
-                   transform=ax.transAxes, fontsize=14, fontweight='bold', color='red')
-            ax.set_title('Erro', fontsize=16, color='red')
-            plt.tight_layout()
-            return ChartGenerator._fig_to_texture(fig)
-        except:
-            from kivy.core.image import Image as CoreImage
-            import io
-            try:
-                from PIL import Image, ImageDraw, ImageFont
-                img = Image.new('RGB', (400, 300), color='white')
-                draw = ImageDraw.Draw(img)
-                draw.text((200, 150), message, fill='red', anchor='mm')               
-                buffer = io.BytesIO()
-                img.save(buffer, format='PNG')
-                buffer.seek(0)
-                
-                core_image = CoreImage(io.BytesIO(buffer.getvalue()), ext='png')
-                return core_image.texture
-            except:
-                return Texture.create(size=(400, 300), colorfmt='rgb') 
\ No newline at end of file
+            cls._textures[name] = texture
+        texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+        cls._shown[name] = key
+        return texture
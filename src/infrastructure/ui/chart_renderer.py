@@ -0,0 +1,304 @@
+import math
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure, SubplotParams
+
+from .chart_cache import ChartCache
+
+# Renderização dos gráficos de estatísticas sem pyplot nem Kivy. Cada gráfico mantém uma única
+# Figure por thread ou processo de renderização e, a cada atualização, só altera os dados dos
+# artistas existentes antes de redesenhar. O resultado são os pixels RGBA do próprio canvas.
+# Este módulo é o ponto de entrada dos processos de renderização e não deve importar o Kivy.
+
+RenderedChart = Tuple[Tuple[int, int], object, bool]
+
+CHART_FIGURES = {
+    'daily': ((10, 6), 80),
+    'camera': ((8, 6), 80),
+    'weekly': ((12, 6), 100),
+    'error': ((8, 6), 80),
+}
+NO_DATA_MESSAGE = 'Nenhum dado disponível'
+
+
+class _Chart(ABC):
+    name = None
+
+    def __init__(self):
+        figsize, dpi = CHART_FIGURES[self.name]
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.figure.patch.set_facecolor('white')
+        self.ax = self.figure.add_subplot()
+        self._create_message()
+        self._layout = None
+
+    def _create_message(self) -> None:
+        self.message = self.ax.text(0.5, 0.5, '', ha='center', va='center', transform=self.ax.transAxes,
+                                    fontsize=16, fontweight='bold', visible=False)
+
+    @abstractmethod
+    def update(self, data) -> None:
+        pass
+
+    def _show_message(self, message: Optional[str]) -> None:
+        self.message.set_text(message or '')
+        self.message.set_visible(bool(message))
+
+    def _relayout(self, layout) -> None:
+        """tight_layout só quando algo que afeta as margens mudou (estado, largura dos rótulos do eixo y)"""
+        if layout != self._layout:
+            defaults = SubplotParams()
+            self.figure.subplots_adjust(left=defaults.left, right=defaults.right, bottom=defaults.bottom, top=defaults.top)
+            self.figure.tight_layout()
+            self._layout = layout
+
+    def render(self, data) -> Tuple[Tuple[int, int], memoryview]:
+        self.update(data)
+        self.canvas.draw()
+        return self.canvas.get_width_height(), self.canvas.buffer_rgba()
+
+
+class DailyOccurrencesChart(_Chart):
+    name = 'daily'
+    days = 7
+
+    def __init__(self):
+        super().__init__()
+        ax = self.ax
+        self.bars = ax.bar(range(self.days), [0] * self.days,
+                           color='#3498db', alpha=0.8, edgecolor='#2980b9', linewidth=1)
+        self.value_labels = [ax.text(bar.get_x() + bar.get_width()/2., 0.1, '', ha='center', va='bottom',
+                                     fontsize=12, fontweight='bold') for bar in self.bars]
+
+        ax.set_xlabel('Data', fontsize=14, fontweight='bold')
+        ax.set_ylabel('Número de Ocorrências', fontsize=14, fontweight='bold')
+        ax.set_title('Ocorrências por Dia (Últimos 7 dias)', fontsize=18, pad=20, fontweight='bold')
+        ax.set_xticks(range(self.days))
+        ax.grid(True, alpha=0.3, axis='y')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.tick_params(axis='both', which='major', labelsize=11)
+
+    def update(self, series: Optional[List[Tuple[str, int]]]) -> None:
+        """`series`: pares (data ISO, ocorrências) dos últimos 7 dias, ou None sem dados"""
+        self._show_message(None if series else NO_DATA_MESSAGE)
+        series = series or []
+        counts = [count for _, count in series] + [0] * (self.days - len(series))
+
+        for bar, label, count in zip(self.bars, self.value_labels, counts):
+            bar.set_height(count)
+            label.set_position((bar.get_x() + bar.get_width()/2., count + 0.1))
+            label.set_text(f'{int(count)}')
+            label.set_visible(bool(series))
+        self.ax.set_xticklabels([f'{day[8:10]}/{day[5:7]}' for day, _ in series] or [''] * self.days,
+                                rotation=45, ha='right', fontsize=12)
+
+        top = max(counts) * 1.2 if max(counts) > 0 else 1
+        self.ax.set_ylim(0, top)
+        self._relayout((bool(series), len(str(int(top)))))
+
+
+class CameraDistributionChart(_Chart):
+    name = 'camera'
+    colors = ['#e74c3c', '#3498db']
+    start_angle = 90
+    label_distance = 1.1
+    pct_distance = 0.6
+
+    def __init__(self):
+        super().__init__()
+        self.wedges, self.texts, self.autotexts = [], [], []
+        self.legend = None
+
+    def _draw(self, camera_counts: List[Tuple[str, int]]) -> None:
+        """Recria a pizza; usado apenas quando muda o número de câmeras"""
+        ax = self.ax
+        ax.clear()
+        ax.set_aspect('auto')
+        ax.set_frame_on(True)
+        ax.set_position(ax.get_position(original=True))
+        self._create_message()
+        self.wedges, self.texts, self.autotexts, self.legend = [], [], [], None
+        if not camera_counts:
+            return
+
+        self.wedges, self.texts, self.autotexts = ax.pie([count for _, count in camera_counts],
+                                                         labels=[f'Câmera {label.title()}' for label, _ in camera_counts],
+                                                         autopct='%1.1f%%',
+                                                         colors=self.colors[:len(camera_counts)],
+                                                         startangle=self.start_angle,
+                                                         textprops={'fontsize': 14, 'fontweight': 'bold'})
+        for autotext in self.autotexts:
+            autotext.set_color('white')
+            autotext.set_fontweight('bold')
+            autotext.set_fontsize(14)
+
+        legend_labels = [f'{label.title()}: {count}' for label, count in camera_counts]
+        self.legend = ax.legend(self.wedges, legend_labels, title="Totais", loc="center left",
+                                bbox_to_anchor=(1, 0, 0.5, 1), fontsize=12)
+
+    def _move(self, camera_counts: List[Tuple[str, int]]) -> None:
+        """Atualiza ângulos, rótulos e legenda das fatias existentes (mesma geometria de Axes.pie)"""
+        total = sum(count for _, count in camera_counts) or 1
+        theta1 = self.start_angle / 360
+        for (label, count), wedge, text, autotext, legend_text in zip(
+                camera_counts, self.wedges, self.texts, self.autotexts, self.legend.get_texts()):
+            fraction = count / total
+            theta2 = theta1 + fraction
+            wedge.set_theta1(360 * theta1)
+            wedge.set_theta2(360 * theta2)
+
+            middle = math.pi * (theta1 + theta2)
+            x, y = math.cos(middle), math.sin(middle)
+            text.set_position((self.label_distance * x, self.label_distance * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            text.set_text(f'Câmera {label.title()}')
+            autotext.set_position((self.pct_distance * x, self.pct_distance * y))
+            autotext.set_text(f'{100 * fraction:1.1f}%')
+            legend_text.set_text(f'{label.title()}: {count}')
+            theta1 = theta2
+
+    def update(self, camera_counts: List[Tuple[str, int]]) -> None:
+        if camera_counts and len(camera_counts) == len(self.wedges):
+            self._move(camera_counts)
+        else:
+            self._draw(camera_counts)
+        self._show_message(None if camera_counts else NO_DATA_MESSAGE)
+        self.ax.set_title('Distribuição de Ocorrências por Câmera' if camera_counts else 'Distribuição por Câmera',
+                          fontsize=18, pad=20, fontweight='bold')
+        # o texto da legenda inclui as contagens, e sua largura muda as margens
+        self._relayout(tuple(f'{label.title()}: {count}' for label, count in camera_counts))
+
+
+class WeeklyTrendChart(_Chart):
+    name = 'weekly'
+
+    def __init__(self):
+        super().__init__()
+        ax = self.ax
+        self.message.set_fontsize(14)
+        self.message.set_fontweight('normal')
+        self.line, = ax.plot([], [], marker='o', linewidth=3, markersize=8,
+                             color='#e74c3c', markerfacecolor='#c0392b', markeredgecolor='white',
+                             markeredgewidth=2)
+        self.annotations = []
+        self.change = ax.text(0.02, 0.98, '', transform=ax.transAxes,
+                              verticalalignment='top', fontsize=12, fontweight='bold',
+                              bbox=dict(boxstyle='round,pad=0.5', facecolor='white', alpha=0.2))
+        ax.set_xlabel('Semana', fontsize=12)
+        ax.set_ylabel('Número de Ocorrências', fontsize=12)
+        ax.grid(True, alpha=0.3)
+
+    def _annotation(self, index: int):
+        while len(self.annotations) <= index:
+            self.annotations.append(self.ax.annotate('', (0, 0), textcoords="offset points",
+                                                     xytext=(0,15), ha='center', fontsize=10,
+                                                     bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8)))
+        return self.annotations[index]
+
+    def update(self, weekly_counts: List[Tuple[str, int]]) -> None:
+        enough = len(weekly_counts) >= 2
+        if not weekly_counts:
+            self._show_message(NO_DATA_MESSAGE)
+        else:
+            self._show_message(None if enough else 'Dados insuficientes para tendência\n(mínimo 2 semanas)')
+        self.ax.set_title('Tendência Semanal de Ocorrências' if enough else 'Tendência Semanal', fontsize=16, pad=20)
+
+        y_values = [count for _, count in weekly_counts] if enough else []
+        x_values = list(range(len(y_values)))
+        self.line.set_data(x_values, y_values)
+        for index, annotation in enumerate(self.annotations):
+            annotation.set_visible(index < len(y_values))
+        for index, value in enumerate(y_values):
+            annotation = self._annotation(index)
+            annotation.xy = (index, value)
+            annotation.set_text(f'{value}')
+            annotation.set_visible(True)
+
+        self.change.set_visible(False)
+        if enough:
+            last = len(y_values) - 1
+            self.ax.set_xlim(-0.05 * last, last * 1.05)
+            self.ax.set_xticks(x_values)
+            self.ax.set_xticklabels([f'S{i+1}' for i in x_values], rotation=0)
+            top = max(y_values) * 1.2 if max(y_values) > 0 else 1
+            self.ax.set_ylim(0, top)
+
+            first_week, last_week = y_values[0], y_values[-1]
+            if first_week > 0:
+                change_percent = ((last_week - first_week) / first_week) * 100
+                self.change.set_text(f"Mudança: {change_percent:+.1f}%")
+                self.change.get_bbox_patch().set_facecolor('#27ae60' if change_percent < 0 else '#e74c3c')
+                self.change.set_visible(True)
+        else:
+            top = 1
+            self.ax.set_xlim(0, 1)
+            self.ax.set_xticks([])
+            self.ax.set_ylim(0, 1)
+        self._relayout((enough, len(str(int(top)))))
+
+
+class ErrorChart(_Chart):
+    name = 'error'
+
+    def __init__(self):
+        super().__init__()
+        self.message.set_color('red')
+        self.message.set_fontsize(14)
+        self.ax.set_title('Erro', fontsize=16, color='red')
+
+    def update(self, message: str) -> None:
+        self._show_message(message)
+        self._relayout(True)
+
+
+CHART_TYPES = {chart.name: chart for chart in (DailyOccurrencesChart, CameraDistributionChart, WeeklyTrendChart, ErrorChart)}
+CHART_NAMES = ('daily', 'camera', 'weekly')
+_charts = {}
+# Cache de cada processo de renderização; no modo `thread` é o mesmo de ChartGenerator.cache
+render_cache = ChartCache()
+
+
+def _chart(name: str) -> _Chart:
+    """Figure persistente de cada gráfico (uma por processo de renderização; o ChartGenerator
+    nunca renderiza o mesmo gráfico em duas threads ao mesmo tempo)"""
+    if name not in _charts:
+        _charts[name] = CHART_TYPES[name]()
+    return _charts[name]
+
+
+def render_chart(name: str, data, copy: bool = False) -> RenderedChart:
+    """Ponto de entrada dos workers.
+
+    Devolve (tamanho, pixels RGBA, ok). Os pixels são um memoryview do buffer do canvas, válido
+    até a próxima renderização do mesmo gráfico; `copy=True` devolve bytes (necessário entre
+    processos). Em caso de erro devolve o gráfico de erro com ok=False.
+    """
+    try:
+        size, pixels = _chart(name).render(data)
+        ok = True
+    except Exception as e:
+        print(f"Erro ao gerar gráfico {name}: {e}")
+        _charts.pop(name, None)
+        size, pixels = ErrorChart().render("Erro ao gerar gráfico")
+        ok = False
+    return size, bytes(pixels) if copy else pixels, ok
+
+
+def render_cached_chart(name: str, data, key: str, cache_dir: Optional[str], copy: bool) -> RenderedChart:
+    """Ponto de entrada dos workers: consulta o cache, renderiza se preciso e guarda o resultado.
+
+    Leitura e gravação dos PNGs e a limpeza do diretório ficam fora da thread do Kivy.
+    """
+    render_cache.set_directory(cache_dir)
+    cached = render_cache.get(key)
+    if cached is not None:
+        size, pixels = cached
+        return size, pixels, True
+    size, pixels, ok = render_chart(name, data, copy)
+    if ok:
+        render_cache.put(key, size, pixels)
+    return size, pixels, ok
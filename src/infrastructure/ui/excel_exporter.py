@@ -5,8 +5,21 @@ import os
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
 
+from ...domain.entities.posture_columns import PostureColumns
+
 class ExcelExporter:
     
+    @staticmethod
+    def posture_columns_to_dataframe(columns: PostureColumns) -> pd.DataFrame:
+        return pd.DataFrame({
+            'id': columns.ids,
+            'timestamp': pd.to_datetime(columns.datetimes()),
+            'shoulder_angle': columns.shoulder_angles,
+            'neck_angle': columns.neck_angles,
+            'camera_type': columns.camera_names(),
+            'is_poor_posture': columns.is_poor_posture
+        })
+    
     @staticmethod
     def export_posture_data_to_excel(data: pd.DataFrame, filename: str = None, 
                                    start_date: Optional[datetime] = None, 
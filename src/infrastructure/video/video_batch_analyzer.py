@@ -0,0 +1,257 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ...application.services.posture_analysis_service import PostureAnalysisService
+from ...application.services.posture_geometry import (NECK_ANGLE, SHOULDER_ANGLE, classify_poor_posture,
+                                                      posture_angles)
+from ...domain.entities.posture_calibration import PostureCalibration
+from ...domain.entities.posture_data import PostureData
+
+RESULT_COLUMNS = ('offset_ms', 'shoulder_angle', 'neck_angle', 'is_poor_posture')
+
+
+@dataclass
+class VideoSegment:
+    path: str
+    start_frame: int
+    end_frame: Optional[int]
+    fps: float
+
+
+@dataclass
+class VideoAnalysisReport:
+    path: str
+    start_time: datetime
+    duration: float
+    frames_decoded: int = 0
+    frames_analyzed: int = 0
+    elapsed: float = 0.0
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def rows(self) -> int:
+        return len(self.columns.get('offset_ms', ()))
+
+    @property
+    def fps(self) -> float:
+        return self.frames_decoded / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        return self.duration / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    return {
+        'offset_ms': np.empty(0, dtype=np.int64),
+        'shoulder_angle': np.empty(0, dtype=np.float32),
+        'neck_angle': np.empty(0, dtype=np.float32),
+        'is_poor_posture': np.empty(0, dtype=np.bool_),
+    }
+
+
+def analyze_segment(segment: VideoSegment, camera_type: str, calibration: PostureCalibration,
+                    frame_stride: int, sample_interval: float,
+                    service_options: dict) -> Tuple[Dict[str, np.ndarray], int, int]:
+    """Analisa um trecho do vídeo em um processo do pool e devolve os resultados em colunas.
+
+    Um trecho sem `end_frame` é lido até o fim do arquivo. Os landmarks de todos os frames amostrados são acumulados e os ângulos e a classificação
+    são calculados de uma vez sobre o lote (N, 33, 4).
+    """
+    processor = PostureAnalysisService(camera_type, **service_options)
+    gate = processor.inference_gate
+
+    cap = cv2.VideoCapture(segment.path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, segment.start_frame)
+
+    offsets, landmark_batch = [], []
+    frames_decoded = frames_analyzed = 0
+    next_sample_ms = -1.0
+    frame_index = segment.start_frame
+    frame_size = None
+
+    try:
+        while segment.end_frame is None or frame_index < segment.end_frame:
+            if (frame_index - segment.start_frame) % frame_stride:
+                if not cap.grab():
+                    break
+                frame_index += 1
+                frames_decoded += 1
+                continue
+
+            ret, frame = cap.read()
+            if not ret:
+                break
+            offset_ms = frame_index * 1000.0 / segment.fps
+            frame_index += 1
+            frames_decoded += 1
+            frame_size = frame.shape[1], frame.shape[0]
+
+            # Frames descartados pelo gate não geram amostras: os landmarks anteriores não são repetidos
+            if gate is not None and not gate.should_infer(frame):
+                continue
+            try:
+                landmarks = processor.detect_landmarks(frame)
+            except Exception as e:
+                print(f"Erro ao analisar frame {frame_index} de {segment.path}: {e}")
+                continue
+            frames_analyzed += 1
+
+            if landmarks is None or offset_ms < next_sample_ms:
+                continue
+            next_sample_ms = offset_ms + sample_interval * 1000.0
+
+            offsets.append(int(offset_ms))
+            landmark_batch.append(landmarks)
+    finally:
+        cap.release()
+
+    if not landmark_batch:
+        return _empty_columns(), frames_decoded, frames_analyzed
+
+    angles = posture_angles(np.stack(landmark_batch), *frame_size)
+    columns = {
+        'offset_ms': np.asarray(offsets, dtype=np.int64),
+        'shoulder_angle': angles[:, SHOULDER_ANGLE].astype(np.float32),
+        'neck_angle': angles[:, NECK_ANGLE].astype(np.float32),
+        'is_poor_posture': classify_poor_posture(angles, calibration, processor.view),
+    }
+    return columns, frames_decoded, frames_analyzed
+
+
+class VideoBatchAnalyzer:
+    """Reprocessa vídeos gravados sem interface, dividindo cada vídeo em trechos entre processos"""
+
+    def __init__(self, camera_type: str = "frontal", workers: Optional[int] = None,
+                 segment_seconds: float = 300.0, frame_stride: int = 1, sample_interval: float = 0.0,
+                 calibration: Optional[PostureCalibration] = None, **service_options):
+        self.camera_type = camera_type
+        self.workers = workers or os.cpu_count() or 1
+        self.segment_seconds = segment_seconds
+        self.frame_stride = max(1, frame_stride)
+        self.sample_interval = sample_interval
+        self.calibration = calibration
+        self.service_options = service_options
+
+    def calibrate_from_video(self, path: str, max_frames: int = 900) -> PostureCalibration:
+        processor = PostureAnalysisService(self.camera_type, **self.service_options)
+        cap = cv2.VideoCapture(path)
+        try:
+            for _ in range(max_frames):
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                processor.analyze_frame(frame)
+                if processor.is_calibrated:
+                    return processor.get_calibration()
+        finally:
+            cap.release()
+        raise ValueError(f"Não foi possível calibrar a partir de {path}: nenhuma pose detectada")
+
+    def split_segments(self, path: str) -> Tuple[List[VideoSegment], float, float]:
+        """Divide o vídeo em trechos de `segment_seconds`.
+
+        Sem contagem de frames (alguns contêineres e streams informam 0 ou -1), devolve um único
+        trecho lido até o fim do arquivo e duração 0, calculada depois pelos frames decodificados.
+        """
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise ValueError(f"Não foi possível abrir o vídeo {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        if total_frames <= 0:
+            return [VideoSegment(path, 0, None, fps)], fps, 0.0
+
+        frames_per_segment = max(1, int(self.segment_seconds * fps))
+        segments = [VideoSegment(path, start, min(start + frames_per_segment, total_frames), fps)
+                    for start in range(0, total_frames, frames_per_segment)]
+        return segments, fps, total_frames / fps
+
+    def analyze(self, paths: List[str], start_times: Optional[List[datetime]] = None) -> List[VideoAnalysisReport]:
+        """Envia ao pool os trechos de todos os vídeos de uma vez e agrupa os resultados por vídeo.
+
+        `elapsed` de cada relatório vai do início da análise até o fim do último trecho do vídeo.
+        """
+        calibration = self.calibration or self.calibrate_from_video(paths[0])
+
+        reports = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            started = time.perf_counter()
+            jobs = []
+            for path in paths:
+                segments, fps, duration = self.split_segments(path)
+                finished = []
+                futures = [executor.submit(analyze_segment, segment, self.camera_type, calibration,
+                                           self.frame_stride, self.sample_interval, self.service_options)
+                           for segment in segments]
+                for future in futures:
+                    future.add_done_callback(lambda _, finished=finished: finished.append(time.perf_counter()))
+                jobs.append((path, fps, duration, futures, finished))
+
+            for index, (path, fps, duration, futures, finished) in enumerate(jobs):
+                parts = []
+                frames_decoded = frames_analyzed = 0
+                for future in futures:
+                    columns, segment_decoded, segment_analyzed = future.result()
+                    parts.append(columns)
+                    frames_decoded += segment_decoded
+                    frames_analyzed += segment_analyzed
+
+                duration = duration or frames_decoded / fps
+                if start_times and start_times[index]:
+                    start_time = start_times[index]
+                else:
+                    start_time = datetime.fromtimestamp(os.path.getmtime(path)) - timedelta(seconds=duration)
+
+                reports.append(VideoAnalysisReport(
+                    path=path,
+                    start_time=start_time,
+                    duration=duration,
+                    frames_decoded=frames_decoded,
+                    frames_analyzed=frames_analyzed,
+                    elapsed=max(finished, default=started) - started,
+                    columns={name: np.concatenate([part[name] for part in parts])
+                             for name in RESULT_COLUMNS} if parts else _empty_columns()
+                ))
+        return reports
+
+    def to_posture_data(self, report: VideoAnalysisReport) -> List[PostureData]:
+        columns = report.columns
+        return [PostureData(
+            shoulder_angle=float(columns['shoulder_angle'][i]),
+            neck_angle=float(columns['neck_angle'][i]),
+            camera_type=self.camera_type,
+            timestamp=report.start_time + timedelta(milliseconds=int(columns['offset_ms'][i])),
+            is_poor_posture=bool(columns['is_poor_posture'][i])
+        ) for i in range(report.rows)]
+
+    @staticmethod
+    def save_columnar(reports: List[VideoAnalysisReport], output_path: str, camera_type: str) -> None:
+        timestamps, shoulder, neck, poor, sources = [], [], [], [], []
+        for index, report in enumerate(reports):
+            base_ms = int(report.start_time.timestamp() * 1000)
+            timestamps.append(report.columns['offset_ms'] + base_ms)
+            shoulder.append(report.columns['shoulder_angle'])
+            neck.append(report.columns['neck_angle'])
+            poor.append(report.columns['is_poor_posture'])
+            sources.append(np.full(report.rows, index, dtype=np.int32))
+
+        np.savez_compressed(
+            output_path,
+            timestamp_ms=np.concatenate(timestamps) if timestamps else np.empty(0, dtype=np.int64),
+            shoulder_angle=np.concatenate(shoulder) if shoulder else np.empty(0, dtype=np.float32),
+            neck_angle=np.concatenate(neck) if neck else np.empty(0, dtype=np.float32),
+            is_poor_posture=np.concatenate(poor) if poor else np.empty(0, dtype=np.bool_),
+            source_index=np.concatenate(sources) if sources else np.empty(0, dtype=np.int32),
+            sources=np.array([report.path for report in reports]),
+            camera_type=np.array(camera_type)
+        )
@@ -0,0 +1,147 @@
+import time
+
+from ...application.use_cases.posture_monitoring import PostureMonitoringUseCase
+from ...domain.repositories.posture_repository import PostureRepository
+from ...infrastructure.audio.alert_player import play_alert_sound
+from ...infrastructure.camera.camera_registry import CameraRegistry, parse_camera_source
+from ...infrastructure.camera.monitoring_pipeline import MonitoringPipeline
+from ...infrastructure.database.posture_retention import PostureRetention
+from ...infrastructure.database.sqlite_posture_repository import SQLitePostureRepository
+
+RETENTION_CHECK_INTERVAL = 3600
+
+
+class PostureMonitoringDaemon:
+    """Monitoramento, gravação e alertas sem Kivy e sem desenhar o overlay nos frames"""
+
+    def __init__(self, repository: PostureRepository, recalibrate: bool = False, poll_interval: float = 0.1):
+        self.repository = repository
+        self.monitoring_use_case = PostureMonitoringUseCase(repository)
+        self.recalibrate = recalibrate
+        self.poll_interval = poll_interval
+        self.pipeline = None
+        self.workers = {}
+        self.saved_calibrations = set()
+        self.running = False
+        self.last_save_times = {}
+        self.last_alert_time = 0
+        self.last_retention_check = 0
+        self.load_settings()
+
+    def load_settings(self) -> None:
+        get_setting = self.repository.get_setting
+        self.registry = CameraRegistry.from_settings(
+            self.repository,
+            frontal_source=parse_camera_source(get_setting("frontal_source", "0")),
+            lateral_source=parse_camera_source(get_setting("lateral_source", ""))
+        )
+        self.save_interval = float(get_setting("save_interval", "5"))
+        self.alert_interval = float(get_setting("alert_interval", "10"))
+
+    def start(self) -> None:
+        self.pipeline = MonitoringPipeline.from_settings(self.repository, self.registry, draw_overlay=False)
+        self.pipeline.start()
+        self.workers = self.pipeline.workers
+
+        for camera_type, worker in self.workers.items():
+            calibration = None if self.recalibrate else self.repository.get_calibration(camera_type)
+            if calibration:
+                worker.apply_calibration(calibration)
+                self.saved_calibrations.add(camera_type)
+                print(f"Calibração {camera_type} carregada do banco de dados")
+            else:
+                print(f"Calibrando câmera {camera_type}: mantenha a postura correta")
+
+        self.running = True
+
+    def is_calibrated(self) -> bool:
+        return bool(self.workers) and all(worker.is_calibrated for worker in self.workers.values())
+
+    def step(self) -> None:
+        current_time = time.time()
+        poor_posture = False
+
+        for camera_type, worker in self.workers.items():
+            latest = worker.get_latest()
+            if latest is None:
+                continue
+
+            _, analysis_result = latest
+            if analysis_result is None:
+                continue
+
+            if analysis_result.calibration_data and camera_type not in self.saved_calibrations:
+                self.monitoring_use_case.save_calibration(analysis_result.calibration_data)
+                self.saved_calibrations.add(camera_type)
+                print(f"Calibração {camera_type} salva")
+
+            if not self.is_calibrated():
+                continue
+
+            poor_posture = poor_posture or analysis_result.is_poor_posture
+            self.save_posture_data(analysis_result, camera_type, current_time)
+
+        if poor_posture:
+            self.check_alert(current_time)
+        self.check_retention(current_time)
+
+    def check_retention(self, current_time: float) -> None:
+        """Aplica a retenção diária do banco, verificando no máximo uma vez por hora"""
+        if current_time - self.last_retention_check < RETENTION_CHECK_INTERVAL:
+            return
+        self.last_retention_check = current_time
+        if isinstance(self.repository, SQLitePostureRepository):
+            PostureRetention.run_daily(self.repository)
+
+    def save_posture_data(self, analysis_result, camera_type: str, current_time: float) -> None:
+        """Grava no máximo um registro por câmera a cada `save_interval` segundos"""
+        if current_time - self.last_save_times.get(camera_type, 0) <= self.save_interval or not analysis_result.calibration_data:
+            return
+        try:
+            self.monitoring_use_case.process_posture_frame(
+                analysis_result.shoulder_angle,
+                analysis_result.neck_angle,
+                camera_type,
+                analysis_result.calibration_data
+            )
+            self.last_save_times[camera_type] = current_time
+        except Exception as e:
+            print(f"Erro ao salvar dados {camera_type}: {e}")
+
+    def check_alert(self, current_time: float) -> None:
+        if current_time - self.last_alert_time <= self.alert_interval:
+            return
+        play_alert_sound()
+        self.last_alert_time = current_time
+
+        for camera_type, worker in self.workers.items():
+            last_result = worker.get_last_result()
+            if last_result and last_result.is_poor_posture and last_result.calibration_data:
+                try:
+                    self.monitoring_use_case.process_posture_frame(
+                        last_result.shoulder_angle,
+                        last_result.neck_angle,
+                        camera_type,
+                        last_result.calibration_data
+                    )
+                except Exception as e:
+                    print(f"Erro ao salvar dados do alerta: {e}")
+
+    def run(self) -> None:
+        self.start()
+        try:
+            while self.running:
+                self.step()
+                time.sleep(self.poll_interval)
+        finally:
+            self.shutdown()
+
+    def stop(self, *args) -> None:
+        self.running = False
+
+    def shutdown(self) -> None:
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+        self.workers = {}
+        self.monitoring_use_case.close()
@@ -1,14 +1,16 @@
 from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.image import Image
 from kivy.clock import Clock
 from kivy.graphics.texture import Texture
+from kivymd.uix.label import MDLabel
 import cv2
 import time
 import os
-import threading
-import winsound
 
-from ...infrastructure.camera.camera_thread import CameraThread
-from ...application.services.posture_analysis_service import PostureAnalysisService
+from ...infrastructure.audio.alert_player import play_alert_sound
+from ...infrastructure.camera.camera_registry import CameraRegistry
+from ...infrastructure.camera.monitoring_pipeline import MonitoringPipeline
 from ...application.use_cases.posture_monitoring import PostureMonitoringUseCase
 
 class PostureMonitorScreen(Screen):
@@ -19,9 +21,10 @@ class PostureMonitorScreen(Screen):
         self.frontal_only = True
         self.lateral_ip = ""
         self.last_bad_posture_time = {}
-        self.lateral_processor = None
-        self.lateral_thread = None
-        self.frontal_processor = None
+        self.pipeline = None
+        self.workers = {}
+        self.camera_widgets = {}
+        self.camera_views = {}
         self.last_save_time = 0
         self.save_interval = 5
     
@@ -29,28 +32,18 @@ class PostureMonitorScreen(Screen):
         self.frontal_only = frontal_only
         self.lateral_ip = lateral_ip
         
-        self.frontal_processor = PostureAnalysisService("frontal")
-        self.lateral_processor = PostureAnalysisService("lateral") if not frontal_only else None
+        registry = CameraRegistry.from_settings(
+            self.repository,
+            lateral_source=lateral_ip if not frontal_only else "",
+            include_extra=not frontal_only
+        )
+        self.build_camera_panels(registry)
         
-        self.frontal_cam = cv2.VideoCapture(0)
-        if not self.frontal_cam.isOpened():
-            print("Erro: Não foi possível abrir a câmera frontal")
-            return
-            
-        self.frontal_cam.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.frontal_cam.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.frontal_cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        
-        if not frontal_only and lateral_ip:
-            self.lateral_thread = CameraThread(lateral_ip)
-            self.lateral_thread.start()
-        else:
-            self.lateral_thread = None
-            self.lateral_processor = None
-            self.ids.lateral_cam.opacity = 0
-            self.ids.lateral_angle.opacity = 0
-            self.ids.lateral_status.opacity = 0
+        self.pipeline = MonitoringPipeline.from_settings(self.repository, registry)
+        self.pipeline.start()
+        self.workers = self.pipeline.workers
         
+        self.save_interval = float(self.repository.get_setting("save_interval", "5"))
         self.is_calibrated = False
         self.last_alert_time = 0
         self.alert_interval = 10
@@ -62,59 +55,68 @@ class PostureMonitorScreen(Screen):
         self.ids.status.theme_text_color = "Custom"
         self.ids.status.text_color = (1, 0, 0, 1)
     
+    def build_camera_panels(self, registry):
+        container = self.ids.cameras_box
+        container.clear_widgets()
+        self.camera_widgets = {}
+        self.camera_views = {}
+        
+        for camera in registry:
+            panel = BoxLayout(orientation='vertical', spacing='5dp')
+            image = Image(keep_ratio=True, allow_stretch=True)
+            angle_label = MDLabel(text=f"{camera.name.upper()}: Ângulos", halign='center', font_style='Caption')
+            status_label = MDLabel(text="STATUS", halign='center', theme_text_color="Custom", text_color=(0, 1, 0, 1))
+            panel.add_widget(image)
+            panel.add_widget(angle_label)
+            panel.add_widget(status_label)
+            container.add_widget(panel)
+            
+            self.camera_widgets[camera.name] = {'cam': image, 'angle': angle_label, 'status': status_label}
+            self.camera_views[camera.name] = camera.view
+    
     def update_frame(self, dt):
-        if not hasattr(self, 'frontal_cam') or self.frontal_cam is None:
-            return
-        if not hasattr(self, 'frontal_processor') or self.frontal_processor is None:
-            return
+        for camera_type, worker in self.workers.items():
+            latest = worker.get_latest()
+            if latest is None:
+                continue
             
-        ret, frontal_frame = self.frontal_cam.read()
-        if ret:
-            frame_annotated, analysis_result = self.frontal_processor.process_frame(frontal_frame)
-            self.show_frame(frame_annotated, 'frontal')
+            frame_annotated, analysis_result = latest
+            self.show_frame(frame_annotated, camera_type)
             if analysis_result and self.is_calibrated:
-                self.update_interface(analysis_result, 'frontal')
-                self.save_posture_data(analysis_result, 'frontal')
-        
-        if not self.frontal_only and self.lateral_thread and self.lateral_processor:
-            lateral_frame = self.lateral_thread.get_frame()
-            if lateral_frame is not None:
-                frame_annotated, analysis_result = self.lateral_processor.process_frame(lateral_frame)
-                self.show_frame(frame_annotated, 'lateral')
-                if analysis_result and self.is_calibrated:
-                    self.update_interface(analysis_result, 'lateral')
-                    self.save_posture_data(analysis_result, 'lateral')
+                self.update_interface(analysis_result, camera_type)
+                self.save_posture_data(analysis_result, camera_type)
     
     def show_frame(self, frame, camera_type):
         try:
             buf = cv2.flip(frame, 0).tobytes()
             texture = Texture.create(size=(frame.shape[1], frame.shape[0]), colorfmt='bgr')
             texture.blit_buffer(buf, colorfmt='bgr', bufferfmt='ubyte')
-            self.ids[f'{camera_type}_cam'].texture = texture
+            self.camera_widgets[camera_type]['cam'].texture = texture
         except Exception as e:
             print(f"Erro ao mostrar frame {camera_type}: {e}")
     
     def update_interface(self, analysis_result, camera_type):
         try:
+            widgets = self.camera_widgets[camera_type]
             if analysis_result.is_calibrating:
-                self.ids[f'{camera_type}_angle'].text = f"{camera_type.upper()}: Calibrando... {analysis_result.calibration_frames}/30"
-                self.ids[f'{camera_type}_status'].text = "CALIBRANDO"
-                self.ids[f'{camera_type}_status'].text_color = (1, 1, 0, 1)
+                widgets['angle'].text = f"{camera_type.upper()}: Calibrando... {analysis_result.calibration_frames}/30"
+                widgets['status'].text = "CALIBRANDO"
+                widgets['status'].text_color = (1, 1, 0, 1)
             else:
-                if camera_type == 'frontal':
-                    angle_text = f"FRONTAL: Ombro={analysis_result.shoulder_angle:.1f}° Pescoço={analysis_result.neck_angle:.1f}°"
+                if self.camera_views.get(camera_type) == 'frontal':
+                    angle_text = f"{camera_type.upper()}: Ombro={analysis_result.shoulder_angle:.1f}° Pescoço={analysis_result.neck_angle:.1f}°"
                 else:
-                    angle_text = f"LATERAL: Cervical={analysis_result.neck_angle:.1f}°"
+                    angle_text = f"{camera_type.upper()}: Cervical={analysis_result.neck_angle:.1f}°"
                 
-                self.ids[f'{camera_type}_angle'].text = angle_text
+                widgets['angle'].text = angle_text
                 
                 if analysis_result.is_poor_posture:
-                    self.ids[f'{camera_type}_status'].text = "POSTURA RUIM"
-                    self.ids[f'{camera_type}_status'].text_color = (1, 0, 0, 1)
+                    widgets['status'].text = "POSTURA RUIM"
+                    widgets['status'].text_color = (1, 0, 0, 1)
                     self.check_alert()
                 else:
-                    self.ids[f'{camera_type}_status'].text = "POSTURA BOA"
-                    self.ids[f'{camera_type}_status'].text_color = (0, 1, 0, 1)
+                    widgets['status'].text = "POSTURA BOA"
+                    widgets['status'].text_color = (0, 1, 0, 1)
         except Exception as e:
             print(f"Erro ao atualizar interface {camera_type}: {e}")
     
@@ -137,52 +139,22 @@ class PostureMonitorScreen(Screen):
     
     def save_alert_data(self):
         try:
-            if hasattr(self, 'frontal_processor') and self.frontal_processor:
-                frontal_result = self.frontal_processor.get_last_result()
-                if frontal_result and frontal_result.is_poor_posture and frontal_result.calibration_data:
-                    self.monitoring_use_case.process_posture_frame(
-                        frontal_result.shoulder_angle,
-                        frontal_result.neck_angle,
-                        'frontal',
-                        frontal_result.calibration_data
-                    )
-                    print("Dados frontais salvos devido ao alerta")
-            
-            if hasattr(self, 'lateral_processor') and self.lateral_processor:
-                lateral_result = self.lateral_processor.get_last_result()
-                if lateral_result and lateral_result.is_poor_posture and lateral_result.calibration_data:
+            for camera_type, worker in self.workers.items():
+                last_result = worker.get_last_result()
+                if last_result and last_result.is_poor_posture and last_result.calibration_data:
                     self.monitoring_use_case.process_posture_frame(
-                        lateral_result.shoulder_angle,
-                        lateral_result.neck_angle,
-                        'lateral',
-                        lateral_result.calibration_data
+                        last_result.shoulder_angle,
+                        last_result.neck_angle,
+                        camera_type,
+                        last_result.calibration_data
                     )
-                    print("Dados laterais salvos devido ao alerta")
+                    print(f"Dados {camera_type} salvos devido ao alerta")
                     
         except Exception as e:
             print(f"Erro ao salvar dados do alerta: {e}")
     
     def play_alert_sound(self):
-        """Reproduz alerta sonoro usando winsound (mais confiável em executáveis)"""
-        def play_sound():
-            try:
-                print("Tocando alerta sonoro...")
-                winsound.Beep(800, 200) 
-                time.sleep(0.1)
-                winsound.Beep(1000, 200)
-                time.sleep(0.1)
-                winsound.Beep(1200, 300)
-                
-                print("Alerta sonoro reproduzido com sucesso!")
-                
-            except Exception as e:
-                print(f"Erro ao reproduzir alerta sonoro: {e}")
-                try:
-                    winsound.Beep(1000, 500)
-                    print("Alerta sonoro simples reproduzido")
-                except:
-                    print("Não foi possível reproduzir nenhum alerta sonoro")
-        threading.Thread(target=play_sound, daemon=True).start()
+        play_alert_sound()
     
     def check_alert(self):
         current_time = time.time()
@@ -192,10 +164,8 @@ class PostureMonitorScreen(Screen):
             self.save_alert_data()
     
     def calibrate(self):
-        if hasattr(self, 'frontal_processor') and self.frontal_processor:
-            self.frontal_processor.reset_calibration()
-        if hasattr(self, 'lateral_processor') and self.lateral_processor:
-            self.lateral_processor.reset_calibration()
+        for worker in self.workers.values():
+            worker.reset_calibration()
         
         self.is_calibrated = False
         self.ids.status.text = "RECALIBRANDO..."
@@ -205,10 +175,7 @@ class PostureMonitorScreen(Screen):
         Clock.schedule_once(self.check_calibration, 1)
     
     def check_calibration(self, dt):
-        frontal_calibrated = self.frontal_processor.is_calibrated if hasattr(self, 'frontal_processor') and self.frontal_processor else False
-        lateral_calibrated = self.lateral_processor.is_calibrated if self.lateral_processor else True
-        
-        if frontal_calibrated and lateral_calibrated:
+        if self.workers and all(worker.is_calibrated for worker in self.workers.values()):
             self.is_calibrated = True
             self.ids.status.text = "CALIBRADO - MONITORANDO"
             self.ids.status.text_color = (0, 1, 0, 1)
@@ -222,11 +189,8 @@ class PostureMonitorScreen(Screen):
     def on_stop(self):
         Clock.unschedule(self.update_frame)
         
-        if hasattr(self, 'lateral_thread') and self.lateral_thread:
-            self.lateral_thread.running = False
-        if hasattr(self, 'frontal_cam'):
-            self.frontal_cam.release()
-        if hasattr(self, 'frontal_processor'):
-            del self.frontal_processor
-        if hasattr(self, 'lateral_processor'):
-            del self.lateral_processor 
\ No newline at end of file
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+        self.workers = {}
+        self.monitoring_use_case.close()
@@ -5,10 +5,11 @@ from kivymd.uix.dialog import MDDialog
 from kivymd.uix.textfield import MDTextField
 from kivy.clock import Clock
 from datetime import datetime
-import pandas as pd
 import os
+from src.application.services.statistics_service import StatisticsService
 from src.infrastructure.ui.chart_generator import ChartGenerator
-from src.infrastructure.ui.excel_exporter import ExcelExporter
+
+CHART_IMAGES = {'daily': 'daily_chart', 'camera': 'camera_chart', 'weekly': 'trend_chart'}
 
 class StatisticsScreen(Screen):
     def __init__(self, repository, **kwargs):
@@ -17,24 +18,71 @@ class StatisticsScreen(Screen):
         self.export_dialog = None
         self.start_date_input = None
         self.end_date_input = None
+        self.statistics_service = StatisticsService(repository)
+        ChartGenerator.configure(repository.get_setting("chart_render_mode", "thread"),
+                                 repository.get_setting("chart_cache_dir", ""))
+        self._rendered_version = None
+        self._rendering_version = None
+        self._pending_charts = set()
 
     def on_enter(self):
         self.refresh_statistics()
     
-    def refresh_statistics(self):
-        try:
-            stats = self.repository.get_statistics()
-            self.ids.total_occurrences.text = f"Total de Ocorrências: {stats.total_occurrences}"
-            self.ids.today_occurrences.text = f"Hoje: {stats.today_occurrences}"
-            self.ids.frontal_count.text = f"Frontal: {stats.frontal_camera_count}"
-            self.ids.lateral_count.text = f"Lateral: {stats.lateral_camera_count}"
+    def refresh_statistics(self, *args):
+        """Calcula as estatísticas em segundo plano; se os dados não mudaram, nada é redesenhado"""
+        if self.statistics_service.statistics is None:
+            self.ids.total_occurrences.text = "Total de Ocorrências: ..."
+            self.ids.today_occurrences.text = "Hoje: ..."
+            self.ids.frontal_count.text = "Frontal: ..."
+            self.ids.lateral_count.text = "Lateral: ..."
+        if self.statistics_service.request(self._on_statistics_ready, self._on_statistics_error):
+            self._set_progress("Calculando estatísticas...", 10)
 
-            self.ids.daily_chart.texture = ChartGenerator.create_daily_occurrences_chart(stats)
-            self.ids.camera_chart.texture = ChartGenerator.create_camera_distribution_chart(stats)
-            self.ids.trend_chart.texture = ChartGenerator.create_weekly_trend_chart(stats)
-        except Exception as e:
-            print(f"Erro ao atualizar estatísticas: {e}")
+    def _on_statistics_ready(self, stats, version):
+        Clock.schedule_once(lambda dt: self._show_statistics(stats, version))
+
+    def _on_statistics_error(self, error):
+        Clock.schedule_once(lambda dt: self._set_progress(f"Erro ao atualizar estatísticas: {error}", None))
+
+    def _show_statistics(self, stats, version):
+        if version == self._rendered_version:
+            self._set_progress("", None)
+            return
+
+        self.ids.total_occurrences.text = f"Total de Ocorrências: {stats.total_occurrences}"
+        self.ids.today_occurrences.text = f"Hoje: {stats.today_occurrences}"
+        self.ids.frontal_count.text = f"Frontal: {stats.frontal_camera_count}"
+        self.ids.lateral_count.text = f"Lateral: {stats.lateral_camera_count}"
+
+        self._rendering_version = version
+        self._pending_charts = set(CHART_IMAGES)
+        self._set_progress(f"Gerando gráficos (0/{len(CHART_IMAGES)})...", 30)
+        ChartGenerator.render_charts(stats, lambda name, texture: self._on_chart_ready(name, texture, version))
+
+    def _on_chart_ready(self, name, texture, version):
+        if version != self._rendering_version:
+            return
+        image = self.ids[CHART_IMAGES[name]]
+        if image.texture is texture:
+            image.canvas.ask_update()
+        else:
+            image.texture = texture
+        self._pending_charts.discard(name)
+        done = len(CHART_IMAGES) - len(self._pending_charts)
+        if self._pending_charts:
+            self._set_progress(f"Gerando gráficos ({done}/{len(CHART_IMAGES)})...", 30 + 70 * done / len(CHART_IMAGES))
+        else:
+            self._rendered_version = version
+            self._set_progress("", None)
+
+    def _set_progress(self, text, value):
+        self.ids.statistics_status.text = text
+        self.ids.statistics_progress.opacity = 0 if value is None else 1
+        self.ids.statistics_progress.value = value or 0
     
+    def on_stop(self):
+        ChartGenerator.shutdown()
+
     def go_back(self):
         self.manager.current = 'welcome'
 
@@ -56,13 +104,15 @@ class StatisticsScreen(Screen):
         self.export_dialog.open()
 
     def export_to_excel(self, *args):
+        # pandas e openpyxl só são carregados ao exportar; as estatísticas não dependem deles
+        from src.infrastructure.ui.excel_exporter import ExcelExporter
         start_date = self.start_date_input.text.strip()
         end_date = self.end_date_input.text.strip()
         self.export_dialog.dismiss()
         try:
-            df = self._get_posture_data_df()
             start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
             end_dt = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
+            df = self._get_posture_data_df(start_dt, end_dt)
             filename = ExcelExporter.get_export_filename(start_dt, end_dt)
             filepath = ExcelExporter.export_posture_data_to_excel(df, filename, start_dt, end_dt)
             self.show_export_result(filepath)
@@ -77,11 +127,6 @@ class StatisticsScreen(Screen):
             dialog = MDDialog(title="Exportação concluída", text=f"Arquivo salvo em:\n{filepath}", buttons=[MDRaisedButton(text="OK", on_press=lambda x: dialog.dismiss())])
             dialog.open()
 
-    def _get_posture_data_df(self):
-        import sqlite3
-        conn = sqlite3.connect(self.repository.db_path)
-        try:
-            df = pd.read_sql_query("SELECT * FROM posture_records ORDER BY timestamp", conn)
-        finally:
-            conn.close()
-        return df 
\ No newline at end of file
+    def _get_posture_data_df(self, start_dt=None, end_dt=None):
+        from src.infrastructure.ui.excel_exporter import ExcelExporter
+        return ExcelExporter.posture_columns_to_dataframe(self.repository.get_posture_columns(start_dt, end_dt)) 
\ No newline at end of file
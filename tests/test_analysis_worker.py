@@ -0,0 +1,107 @@
+import importlib.util
+import math
+import time
+import unittest
+from threading import Event, Thread, current_thread
+
+import numpy as np
+
+MEDIAPIPE_AVAILABLE = importlib.util.find_spec('mediapipe') is not None
+
+if MEDIAPIPE_AVAILABLE:
+    from src.application.services.posture_analysis_service import LANDMARK_COUNT, PostureAnalysisService
+    from src.infrastructure.camera.analysis_worker import AnalysisWorker
+    from src.infrastructure.camera.frame_ring import CapturedFrame
+
+    class FixedPoseService(PostureAnalysisService):
+        """Devolve sempre os mesmos landmarks; `hold` permite pausar uma inferência em andamento"""
+
+        def __init__(self):
+            super().__init__('frontal')
+            self.landmarks = np.full((LANDMARK_COUNT, 4), 0.5, dtype=np.float32)
+            self.landmarks[[11, 7], 0] = 0.4
+            self.landmarks[7, 1] = 0.3
+            self.started = Event()
+            self.hold = None
+            self.reset_threads = set()
+
+        def reset_calibration(self):
+            self.reset_threads.add(current_thread())
+            super().reset_calibration()
+
+        def detect_landmarks(self, frame):
+            self.started.set()
+            if self.hold is not None:
+                self.hold.wait()
+            return self.landmarks
+
+
+@unittest.skipUnless(MEDIAPIPE_AVAILABLE, 'mediapipe não instalado')
+class AnalysisWorkerCalibrationTest(unittest.TestCase):
+    def setUp(self):
+        self.processor = FixedPoseService()
+        self.worker = AnalysisWorker(None, self.processor, draw_overlay=False)
+        self.frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        self.seq = 0
+
+    def process(self, count: int = 1) -> None:
+        for _ in range(count):
+            self.seq += 1
+            self.worker.process_captured(CapturedFrame(self.frame, self.seq, 0.0, 0))
+
+    def assert_finite_limits(self) -> None:
+        calibration = self.processor.get_calibration()
+        self.assertIsNotNone(calibration)
+        for value in (calibration.shoulder_angle_min, calibration.shoulder_angle_max,
+                      calibration.neck_angle_min, calibration.neck_angle_max):
+            self.assertTrue(math.isfinite(value))
+
+    def test_reset_during_inference_drops_the_stale_result(self):
+        self.process(31)
+        self.assertTrue(self.worker.is_calibrated)
+        self.worker.get_latest()
+
+        self.processor.hold = Event()
+        self.processor.started.clear()
+        inference = Thread(target=self.process)
+        inference.start()
+        self.processor.started.wait(1.0)
+        self.worker.reset_calibration()
+        self.processor.hold.set()
+        inference.join()
+        self.processor.hold = None
+
+        self.assertFalse(self.worker.is_calibrated)
+        self.assertIsNone(self.worker.get_last_result())
+        self.assertIsNone(self.worker.get_latest())
+
+        self.process()
+        self.assertTrue(self.worker.get_last_result().is_calibrating)
+        self.assertEqual(self.worker.get_last_result().calibration_frames, 1)
+
+    def test_resets_concurrent_with_inference_keep_calibration_finite(self):
+        running = True
+
+        def infer():
+            while running:
+                self.process()
+
+        inference = Thread(target=infer)
+        inference.start()
+        try:
+            for _ in range(200):
+                self.worker.reset_calibration()
+                time.sleep(0.001)
+        finally:
+            running = False
+            inference.join()
+
+        self.assertEqual(self.processor.reset_threads, {inference})
+        self.process(31)
+        self.assertTrue(self.worker.is_calibrated)
+        self.assert_finite_limits()
+        self.assertFalse(self.worker.get_last_result().is_poor_posture)
+
+
+if __name__ == '__main__':
+    unittest.main()
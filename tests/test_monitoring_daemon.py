@@ -0,0 +1,63 @@
+import importlib.util
+import unittest
+from datetime import datetime
+
+MEDIAPIPE_AVAILABLE = importlib.util.find_spec('mediapipe') is not None
+
+if MEDIAPIPE_AVAILABLE:
+    from src.application.services.posture_analysis_service import PostureAnalysisResult
+    from src.application.use_cases.posture_monitoring import PostureMonitoringUseCase
+    from src.domain.entities.posture_calibration import PostureCalibration
+    from src.infrastructure.database.in_memory_posture_repository import InMemoryPostureRepository
+    from src.presentation.daemon.monitoring_daemon import PostureMonitoringDaemon
+
+
+class StubWorker:
+    """Entrega sempre o mesmo resultado calibrado, como um AnalysisWorker com frame novo"""
+
+    def __init__(self, result):
+        self.result = result
+        self.is_calibrated = True
+
+    def get_latest(self):
+        return None, self.result
+
+    def get_last_result(self):
+        return self.result
+
+
+@unittest.skipUnless(MEDIAPIPE_AVAILABLE, 'mediapipe não instalado')
+class MonitoringDaemonSaveTest(unittest.TestCase):
+    def setUp(self):
+        self.repository = InMemoryPostureRepository()
+        self.daemon = PostureMonitoringDaemon(self.repository)
+        self.daemon.monitoring_use_case = PostureMonitoringUseCase(self.repository, write_behind=False)
+        self.daemon.last_retention_check = float('inf')
+
+    def result(self, camera_type: str):
+        calibration = PostureCalibration(camera_type=camera_type, shoulder_angle_min=0.0, shoulder_angle_max=10.0,
+                                         neck_angle_min=0.0, neck_angle_max=10.0, margin=5.0)
+        return PostureAnalysisResult(shoulder_angle=5.0, neck_angle=5.0, is_calibrating=False,
+                                     calibration_frames=30, is_poor_posture=False, calibration_data=calibration)
+
+    def saved_cameras(self):
+        records = self.repository.get_posture_data_by_date_range(datetime(2000, 1, 1), datetime.now())
+        return sorted(record.camera_type for record in records)
+
+    def test_each_camera_is_saved_once_per_interval(self):
+        self.daemon.saved_calibrations = {'frontal', 'lateral'}
+        self.daemon.workers = {camera_type: StubWorker(self.result(camera_type)) for camera_type in ('frontal', 'lateral')}
+
+        self.daemon.step()
+        self.assertEqual(self.saved_cameras(), ['frontal', 'lateral'])
+        self.daemon.step()
+        self.assertEqual(self.saved_cameras(), ['frontal', 'lateral'])
+
+        for camera_type in self.daemon.last_save_times:
+            self.daemon.last_save_times[camera_type] -= self.daemon.save_interval + 1
+        self.daemon.step()
+        self.assertEqual(self.saved_cameras(), ['frontal', 'frontal', 'lateral', 'lateral'])
+
+
+if __name__ == '__main__':
+    unittest.main()
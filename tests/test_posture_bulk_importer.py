@@ -0,0 +1,55 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.domain.entities.posture_data import PostureData
+from src.infrastructure.database.posture_bulk_importer import PostureBulkImporter
+from src.infrastructure.database.sqlite_posture_repository import AGGREGATE_TIERS, SQLitePostureRepository
+
+
+class PostureBulkImporterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.repository = SQLitePostureRepository(os.path.join(self.directory, 'posture_data.db'))
+        self.now = datetime.now().replace(microsecond=0)
+        self.repository.save_posture_data_batch([
+            PostureData(
+                shoulder_angle=float(index % 7),
+                neck_angle=60.0 + index % 11,
+                camera_type='frontal' if index % 2 else 'lateral',
+                timestamp=self.now - timedelta(minutes=37 * index),
+                is_poor_posture=index % 3 == 0
+            )
+            for index in range(2000)
+        ])
+
+    def tearDown(self):
+        self.repository.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def aggregates(self):
+        conn = self.repository._connection()
+        return {tier: conn.execute(f"SELECT * FROM posture_angles_{tier} ORDER BY bucket_start, camera_type").fetchall()
+                for tier, _ in AGGREGATE_TIERS}
+
+    def test_import_rebuilds_the_touched_buckets_like_a_full_rebuild(self):
+        path = os.path.join(self.directory, 'import.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', 'shoulder_angle', 'neck_angle', 'camera_type'])
+            for minutes in (20 * 37 * 60, 20 * 37 * 60 + 1, 500 * 37 * 60 + 5):
+                timestamp = self.now - timedelta(seconds=minutes)
+                writer.writerow([timestamp.strftime('%Y-%m-%d %H:%M:%S'), '2.0', '70.0', 'frontal'])
+
+        self.assertEqual(PostureBulkImporter(self.repository).import_files([path]), {path: 3})
+        imported = self.aggregates()
+        self.repository.rebuild_statistics_rollups()
+        self.assertEqual(imported, self.aggregates())
+        self.assertEqual(self.repository.get_statistics().total_occurrences, 2003)
+
+
+if __name__ == '__main__':
+    unittest.main()
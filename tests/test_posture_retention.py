@@ -0,0 +1,98 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.domain.entities.posture_data import PostureData
+from src.infrastructure.database.posture_bulk_importer import PostureBulkImporter
+from src.infrastructure.database.posture_retention import PostureRetention, month_start
+from src.infrastructure.database.sqlite_posture_repository import SQLitePostureRepository
+
+
+class PostureRetentionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.repository = SQLitePostureRepository(os.path.join(self.directory, 'posture_data.db'))
+        self.now = datetime.now()
+        for months_back in range(18):
+            self.repository.save_posture_data(PostureData(
+                shoulder_angle=2.0,
+                neck_angle=70.0,
+                camera_type='frontal',
+                timestamp=month_start(self.now, months_back).replace(day=10, hour=12),
+                is_poor_posture=True
+            ))
+
+    def tearDown(self):
+        self.repository.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def import_csv(self, timestamp: str) -> None:
+        path = os.path.join(self.directory, 'import.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', 'shoulder_angle', 'neck_angle', 'camera_type'])
+            writer.writerow([timestamp, '2.0', '70.0', 'frontal'])
+        PostureBulkImporter(self.repository).import_files([path])
+
+    def total(self) -> int:
+        return self.repository.get_statistics().total_occurrences
+
+    def day_samples(self) -> int:
+        aggregates = self.repository.get_angle_aggregates(datetime(2000, 1, 1), self.now, 86400)
+        return sum(aggregate.samples for aggregate in aggregates)
+
+    def test_import_of_old_records_keeps_downsampled_history(self):
+        report = PostureRetention(self.repository, hot_months=3, raw_months=12).apply(self.now)
+        self.assertTrue(report.dropped)
+        self.assertEqual(self.total(), 18)
+
+        self.import_csv('2024-03-05 10:00:00')
+        self.assertEqual(self.total(), 19)
+        self.assertEqual(self.day_samples(), 19)
+
+        self.repository.rebuild_statistics_rollups()
+        self.assertEqual(self.total(), 19)
+        self.assertEqual(self.day_samples(), 19)
+
+        PostureRetention(self.repository, hot_months=3, raw_months=12).apply(self.now)
+        self.repository.rebuild_statistics_rollups()
+        self.assertEqual(self.total(), 19)
+
+    def test_range_queries_stay_sorted_with_archived_months_in_hot_table(self):
+        PostureRetention(self.repository, hot_months=3, raw_months=0).apply(self.now)
+        self.repository.save_posture_data(PostureData(
+            shoulder_angle=2.0,
+            neck_angle=70.0,
+            camera_type='frontal',
+            timestamp=month_start(self.now, 6).replace(day=2),
+            is_poor_posture=True
+        ))
+
+        timestamps = [record.timestamp for record in self.repository.get_posture_data_by_date_range(datetime(2000, 1, 1), self.now)]
+        self.assertEqual(len(timestamps), 19)
+        self.assertEqual(timestamps, sorted(timestamps))
+        columns = self.repository.get_posture_columns(datetime(2000, 1, 1), self.now)
+        self.assertTrue((columns.timestamps[1:] >= columns.timestamps[:-1]).all())
+
+    def test_sub_hour_aggregates_of_expired_months_fall_back_to_hours(self):
+        day = month_start(self.now, 15).replace(day=10)
+        PostureRetention(self.repository, hot_months=3, raw_months=12).apply(self.now)
+
+        aggregates = self.repository.get_angle_aggregates(day + timedelta(hours=11, minutes=30), day + timedelta(hours=14), 300)
+        self.assertEqual([(aggregate.bucket_start, aggregate.samples) for aggregate in aggregates],
+                         [(day.replace(hour=12), 1)])
+
+    def test_daily_run_applies_once_per_day(self):
+        thread = PostureRetention.run_daily(self.repository)
+        self.assertIsNotNone(thread)
+        thread.join()
+        self.assertEqual(self.repository.get_setting("retention_last_run"), self.now.date().isoformat())
+        self.assertIsNone(PostureRetention.run_daily(self.repository))
+        self.assertEqual(self.total(), 18)
+
+
+if __name__ == '__main__':
+    unittest.main()